@@ -1,4 +1,7 @@
-from flask import Flask, render_template, request, jsonify, redirect, session, make_response
+from flask import Flask, render_template, request, jsonify, redirect, session, make_response, send_file, url_for
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+from werkzeug.serving import is_running_from_reloader
 from functools import wraps
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
@@ -7,10 +10,21 @@ import subprocess
 import glob
 import json
 import re
+import base64
+import hashlib
+import gzip
+import mimetypes
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 from dotenv import load_dotenv
-from threading import Thread, Lock, Event
+from threading import Thread, Lock, Event, Condition, local as threading_local, Semaphore as threading_semaphore
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+import queue
+import signal
 import time
+import asyncio
 import requests
+from urllib.parse import urlsplit
 
 # Bluetooth support
 try:
@@ -20,27 +34,274 @@ except ImportError:
     PEXPECT_AVAILABLE = False
     print("Warning: pexpect not available - Bluetooth pairing with PIN disabled")
 
+# Artwork placeholder colours
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    print("Warning: Pillow not available - artwork placeholders disabled")
+
+# Brotli variants for static assets (gzip is always available)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # mDNS/Zeroconf for local Spotify Connect discovery
-from zeroconf import ServiceBrowser, ServiceListener, Zeroconf
+from zeroconf import ServiceStateChange
+from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo, AsyncZeroconf
 
 # ZeroConf addUser flow for activating local devices
 try:
-    from spotify_zeroconf import SpotifyZeroConf
+    from spotify_zeroconf import get_activator as get_zeroconf_activator
     ZEROCONF_ACTIVATION_AVAILABLE = True
 except ImportError:
     ZEROCONF_ACTIVATION_AVAILABLE = False
     print("Warning: spotify_zeroconf not available - local device activation disabled")
 
+# In-process PulseAudio client for volume/sink control (falls back to pactl)
+from pulse_native import pulse_backend
+
+# Production WSGI server (falls back to the Flask development server)
+try:
+    from waitress import create_server as create_waitress_server
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+
+# =============================================================================
+# Configuration Snapshot
+# =============================================================================
+
+@dataclass(frozen=True)
+class AppConfig:
+    """Immutable view of the .env configuration used on hot paths.
+
+    Built once at startup and replaced as a whole by reload_config() when the
+    settings endpoints change .env, so request handlers never call os.getenv
+    or re-split SPOTIFY_DEVICE_NAME.
+    """
+
+    client_id: str
+    client_secret: str
+    redirect_uri: str
+    device_name: str             # raw SPOTIFY_DEVICE_NAME
+    allowed_device_names: tuple  # lower-cased, from the comma-separated device_name
+    settings_pin: str
+
+    @classmethod
+    def from_env(cls):
+        device_name = os.getenv('SPOTIFY_DEVICE_NAME', '').strip()
+        return cls(
+            client_id=os.getenv('SPOTIFY_CLIENT_ID', ''),
+            client_secret=os.getenv('SPOTIFY_CLIENT_SECRET', ''),
+            redirect_uri=os.getenv('SPOTIFY_REDIRECT_URI', ''),
+            device_name=device_name,
+            allowed_device_names=tuple(n.strip().lower() for n in device_name.split(',') if n.strip()),
+            settings_pin=os.getenv('SETTINGS_PIN', '123456')
+        )
+
+    @property
+    def has_credentials(self):
+        return bool(self.client_id and self.client_secret and self.redirect_uri)
+
+    @property
+    def oauth_params(self):
+        """Keyword arguments shared by every SpotifyOAuth instance"""
+        return {'client_id': self.client_id, 'client_secret': self.client_secret, 'redirect_uri': self.redirect_uri}
+
+    def is_device_name_allowed(self, name):
+        """SPOTIFY_DEVICE_NAME filter; no filter allows everything"""
+        if not self.allowed_device_names:
+            return True
+        name = (name or '').lower()
+        return any(allowed in name for allowed in self.allowed_device_names)
+
+
+_config = AppConfig.from_env()
+
+
+def get_config():
+    """Current configuration snapshot"""
+    return _config
+
+
+def reload_config():
+    """Rebuild the snapshot from os.environ and swap it in atomically"""
+    global _config
+    _config = AppConfig.from_env()
+    return _config
+
+
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
 
+
+# =============================================================================
+# Server-side Sessions
+# =============================================================================
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session data kept on the server; the cookie only carries its id"""
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class ServerSessionStore:
+    """Sessions in memory, persisted to sessions.json by a write-behind thread.
+
+    Small by design: the OAuth tokens live in the shared token store, a
+    session only holds the user id and preferences such as the language.
+    """
+
+    MAX_AGE = 30 * 24 * 3600  # idle sessions expire after 30 days
+    WRITE_DELAY = 2
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = Lock()
+        self._sessions = {}  # sid -> {'data': dict, 'accessed': timestamp}
+        self._dirty = False
+        self._write_event = Event()
+        self._writer = None
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self._path):
+                with open(self._path, 'r') as f:
+                    stored = json.load(f)
+                cutoff = time.time() - self.MAX_AGE
+                self._sessions = {sid: s for sid, s in stored.items() if s.get('accessed', 0) > cutoff}
+        except Exception as e:
+            print(f"[Session] Error loading sessions: {e}")
+
+    @staticmethod
+    def new_sid():
+        return base64.urlsafe_b64encode(os.urandom(24)).decode()
+
+    def get(self, sid):
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if not entry or time.time() - entry['accessed'] > self.MAX_AGE:
+                return None
+            # Only persisted with the next real change; losing it just shortens the expiry
+            entry['accessed'] = time.time()
+            return dict(entry['data'])
+
+    def set(self, sid, data):
+        with self._lock:
+            self._sessions[sid] = {'data': data, 'accessed': time.time()}
+        self._schedule_write()
+
+    def delete(self, sid):
+        with self._lock:
+            if self._sessions.pop(sid, None) is None:
+                return
+        self._schedule_write()
+
+    def _schedule_write(self):
+        with self._lock:
+            self._dirty = True
+            if not self._writer or not self._writer.is_alive():
+                self._writer = Thread(target=self._write_loop, daemon=True)
+                self._writer.start()
+        self._write_event.set()
+
+    def _write_loop(self):
+        while True:
+            self._write_event.wait()
+            time.sleep(self.WRITE_DELAY)
+            self._write_event.clear()
+            self.flush()
+
+    def flush(self):
+        """Write sessions atomically (expired ones are dropped)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            cutoff = time.time() - self.MAX_AGE
+            self._sessions = {sid: s for sid, s in self._sessions.items() if s['accessed'] > cutoff}
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                tmp_path = self._path + '.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._sessions, f)
+                os.chmod(tmp_path, 0o600)
+                os.replace(tmp_path, self._path)
+                self._dirty = False
+            except Exception as e:
+                print(f"[Session] Error saving sessions: {e}")
+
+
+class ServerSessionInterface(SessionInterface):
+    """Flask session interface backed by ServerSessionStore.
+
+    The cookie holds an opaque random id and is only (re)sent when a session
+    is created or changed, so the 1-5s polls carry a tiny cookie and need no
+    signature check or deserialisation.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        data = self.store.get(sid) if sid else None
+        if data is None:
+            return ServerSession(sid=self.store.new_sid(), new=True)
+        return ServerSession(data, sid=sid)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and not session.new:
+                # session.clear(): forget it on both sides
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if not session.modified:
+            return
+
+        self.store.set(session.sid, dict(session))
+        response.set_cookie(
+            name, session.sid,
+            max_age=ServerSessionStore.MAX_AGE,
+            httponly=self.get_cookie_httponly(app),
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+            domain=domain,
+            path=path
+        )
+
+
+# Global session store instance
+session_store = ServerSessionStore(os.path.expanduser('~/.config/spotify-player/sessions.json'))
+app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+app.session_interface = ServerSessionInterface(session_store)
+
 # API error cooldown - voorkomt escalatie bij tijdelijke Spotify problemen
 _last_api_error_time = 0
 _api_cooldown_seconds = 30
 _cached_current_track = None
+_cached_current_track_time = 0
+_cached_system_volume = None  # Last known actual sink volume (%)
 
 # ============================================
 # TRANSLATIONS (i18n)
@@ -102,6 +363,7 @@ TRANSLATIONS = {
 
         # Bluetooth address
         'bt.address_required': 'Bluetooth address is required',
+        'bt.pair_in_progress': 'Pairing with this device is already in progress',
 
         # Audio
         'audio.volume_failed': 'Could not adjust volume',
@@ -162,6 +424,7 @@ TRANSLATIONS = {
 
         # Bluetooth address
         'bt.address_required': 'Bluetooth adres is verplicht',
+        'bt.pair_in_progress': 'Koppelen met dit apparaat is al bezig',
 
         # Audio
         'audio.volume_failed': 'Kon volume niet aanpassen',
@@ -171,7 +434,8 @@ TRANSLATIONS = {
 
 def get_user_language():
     """Get the current user's language preference from session"""
-    return session.get('language', 'en')
+    # Background jobs carry the language of the request that started them
+    return job_manager.language or session.get('language', 'en')
 
 
 def t(key):
@@ -193,89 +457,292 @@ def set_api_error():
 
 
 # Spotify Connect mDNS discovery
-_spotify_connect_devices = {}
-_spotify_connect_lock = Lock()
-_zeroconf_instance = None
-_service_browser = None
-
-class SpotifyConnectListener(ServiceListener):
-    """Listener for Spotify Connect devices on the local network"""
-
-    def update_service(self, zc: Zeroconf, type_: str, name: str) -> None:
-        """Called when a service is updated"""
-        self._process_service(zc, type_, name, "updated")
-
-    def remove_service(self, zc: Zeroconf, type_: str, name: str) -> None:
-        """Called when a service is removed"""
-        with _spotify_connect_lock:
-            # Extract device name from service name (format: "DeviceName._spotify-connect._tcp.local.")
-            device_name = name.replace("._spotify-connect._tcp.local.", "")
-            if device_name in _spotify_connect_devices:
-                del _spotify_connect_devices[device_name]
-                print(f"[mDNS] Spotify Connect device removed: {device_name}")
-
-    def add_service(self, zc: Zeroconf, type_: str, name: str) -> None:
-        """Called when a new service is discovered"""
-        self._process_service(zc, type_, name, "discovered")
-
-    def _process_service(self, zc: Zeroconf, type_: str, name: str, action: str) -> None:
-        """Process a discovered or updated service"""
-        info = zc.get_service_info(type_, name)
-        if info:
-            # Extract device info
-            device_name = name.replace("._spotify-connect._tcp.local.", "")
-            addresses = [addr for addr in info.parsed_addresses()]
-            port = info.port
-
-            # Get CPath from TXT record (endpoint path for ZeroConf API)
-            cpath = "/"
-            if info.properties:
-                cpath_bytes = info.properties.get(b'CPath', b'/')
-                cpath = cpath_bytes.decode('utf-8') if isinstance(cpath_bytes, bytes) else cpath_bytes
-
-            device_info = {
-                'name': device_name,
-                'addresses': addresses,
-                'port': port,
-                'cpath': cpath,
-                'host': info.server
-            }
+SPOTIFY_CONNECT_SERVICE = "_spotify-connect._tcp.local."
+
+
+class SpotifyConnectDiscovery:
+    """mDNS discovery of Spotify Connect devices on the async zeroconf API.
+
+    Browsing and service-info resolution run on a dedicated asyncio loop
+    thread: state changes only enqueue the service name, and a few resolver
+    coroutines fetch the records without ever blocking the browser. Resolved
+    devices are persisted so the list is populated at boot, before the first
+    multicast round has finished.
+
+    MDNS_DISCOVERY_MODE=on-demand only browses while a lease is held (device
+    list open in a client, activation in progress) and otherwise serves the
+    last known devices with their age.
+    """
 
-            with _spotify_connect_lock:
-                _spotify_connect_devices[device_name] = device_info
+    RESOLVE_TIMEOUT_MS = 3000
+    RESOLVER_WORKERS = 3
+    PERSIST_MAX_AGE = 7 * 24 * 3600  # forget persisted devices not seen for a week
+    SAVE_INTERVAL = 600              # mDNS events are persisted at most this often (flushed on stop)
+    LEASE_SECONDS = 30               # on-demand: keep browsing this long after the last request
+
+    def __init__(self, path):
+        self._path = path
+        self._mode = 'on-demand' if os.getenv('MDNS_DISCOVERY_MODE', 'always').lower() == 'on-demand' else 'always'
+        self._lease_until = 0
+        self._lease_timer = None
+        self._lock = Lock()
+        self._devices = {}  # device name -> device dict
+        self._dirty = False
+        self._last_save = 0
+        self._loop = None
+        self._thread = None
+        self._ready = Event()
+        self._aiozc = None
+        self._browser = None
+        self._resolve_queue = None
+        self._pending = set()
+        self._tasks = []
+        self._load()
+
+    @staticmethod
+    def _device_name(service_name):
+        # Service name format: "DeviceName._spotify-connect._tcp.local."
+        return service_name.replace("." + SPOTIFY_CONNECT_SERVICE, "")
+
+    def _load(self):
+        """Restore devices seen in previous runs (marked as cached until re-resolved)"""
+        try:
+            if not os.path.exists(self._path):
+                return
+            with open(self._path, 'r') as f:
+                stored = json.load(f)
+            now = time.time()
+            for name, device in stored.items():
+                if now - device.get('last_seen', 0) < self.PERSIST_MAX_AGE:
+                    device['cached'] = True
+                    self._devices[name] = device
+            if self._devices:
+                print(f"[mDNS] Restored {len(self._devices)} Spotify Connect device(s) from cache")
+        except Exception as e:
+            print(f"[mDNS] Error loading device cache: {e}")
+
+    def _save(self):
+        """Persist atomically (caller holds lock)"""
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp_path = self._path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({name: {k: v for k, v in d.items() if k != 'cached'}
+                           for name, d in self._devices.items()}, f, indent=2)
+            os.replace(tmp_path, self._path)
+            self._dirty = False
+            self._last_save = time.time()
+        except Exception as e:
+            print(f"[mDNS] Error saving device cache: {e}")
+
+    def _mark_dirty(self):
+        """Schedule a save, writing at most every SAVE_INTERVAL to spare the SD card (caller holds lock)"""
+        self._dirty = True
+        if time.time() - self._last_save > self.SAVE_INTERVAL:
+            self._save()
+
+    def flush(self):
+        """Write pending changes to disk"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def mark_seen(self, device_name):
+        """A device answered a probe: it is online, even without new mDNS events"""
+        with self._lock:
+            device = self._devices.get(device_name)
+            if not device:
+                return
+            device['last_seen'] = time.time()
+            device.pop('cached', None)
+            self._mark_dirty()
+
+    def get_devices(self):
+        with self._lock:
+            return [dict(d) for d in self._devices.values()]
+
+    @property
+    def browsing(self):
+        return self._browser is not None
+
+    def get_status(self):
+        """Discovery mode and whether mDNS is currently browsing"""
+        return {
+            'mode': self._mode,
+            'browsing': self.browsing,
+            'lease_remaining': max(0, int(self._lease_until - time.time())) if self._mode == 'on-demand' else None
+        }
+
+    def acquire_lease(self, seconds=None):
+        """Browse for at least `seconds` more (no-op in 'always' mode)"""
+        if self._mode != 'on-demand':
+            return
+        loop = self._loop
+        if not loop or not loop.is_running():
+            return
+        with self._lock:
+            self._lease_until = max(self._lease_until, time.time() + (seconds or self.LEASE_SECONDS))
+        loop.call_soon_threadsafe(self._on_lease_changed)
+
+    def _on_lease_changed(self):
+        """Loop thread: start browsing for a fresh lease, stop once it has expired"""
+        if self._lease_timer:
+            self._lease_timer.cancel()
+            self._lease_timer = None
+        remaining = self._lease_until - time.time()
+        if remaining > 0:
+            if not self.browsing:
+                self._loop.create_task(self._async_start_browsing())
+            self._lease_timer = self._loop.call_later(remaining, self._on_lease_changed)
+        elif self.browsing:
+            self._loop.create_task(self._async_stop_browsing())
+
+    # --- Loop thread ---
+
+    def start(self):
+        """Start the discovery loop thread and browse for Spotify Connect devices"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = Thread(target=self._run_loop, daemon=True, name='mdns')
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        if self._mode == 'on-demand':
+            print("[mDNS] On-demand discovery mode: browsing only while the device list is in use")
+
+    def stop(self):
+        """Stop browsing, flush pending changes and shut down the loop thread"""
+        loop = self._loop
+        if not loop or not loop.is_running():
+            self.flush()
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._async_stop_browsing(), loop).result(timeout=5)
+        except Exception as e:
+            print(f"[mDNS] Error stopping discovery: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        self.flush()
+        print("[mDNS] Spotify Connect discovery stopped")
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        if self._mode == 'always':
+            self._loop.create_task(self._async_start_browsing())
+        self._loop.call_soon(self._ready.set)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _async_start_browsing(self):
+        if self.browsing:
+            return
+        try:
+            self._aiozc = AsyncZeroconf()
+            self._resolve_queue = asyncio.Queue()
+            self._tasks = [asyncio.create_task(self._resolver()) for _ in range(self.RESOLVER_WORKERS)]
+            self._browser = AsyncServiceBrowser(self._aiozc.zeroconf, SPOTIFY_CONNECT_SERVICE,
+                                                handlers=[self._on_state_change])
+            print("[mDNS] Spotify Connect discovery started")
+        except Exception as e:
+            print(f"[mDNS] Failed to start discovery: {e}")
+
+    async def _async_stop_browsing(self):
+        """Cancel the browser and release the multicast sockets"""
+        was_browsing = self.browsing
+        if self._browser:
+            await self._browser.async_cancel()
+            self._browser = None
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._pending.clear()
+        if self._aiozc:
+            await self._aiozc.async_close()
+            self._aiozc = None
+        if was_browsing and self._mode == 'on-demand':
+            print("[mDNS] Discovery lease expired, browsing paused")
+
+    def _on_state_change(self, zeroconf, service_type, name, state_change):
+        """Browser callback (runs on the loop): never resolve inline, only enqueue"""
+        if state_change is ServiceStateChange.Removed:
+            self._remove(self._device_name(name))
+        elif name not in self._pending:
+            action = "discovered" if state_change is ServiceStateChange.Added else "updated"
+            self._pending.add(name)
+            self._resolve_queue.put_nowait((service_type, name, action))
+
+    async def _resolver(self):
+        while True:
+            service_type, name, action = await self._resolve_queue.get()
+            self._pending.discard(name)
+            try:
+                info = AsyncServiceInfo(service_type, name)
+                if await info.async_request(self._aiozc.zeroconf, self.RESOLVE_TIMEOUT_MS):
+                    self._update(name, info, action)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[mDNS] Failed to resolve {name}: {e}")
+
+    # --- Device table ---
+
+    def _update(self, name, info, action):
+        device_name = self._device_name(name)
+        addresses = info.parsed_addresses()
+
+        # Get CPath from TXT record (endpoint path for ZeroConf API)
+        cpath = "/"
+        if info.properties:
+            cpath_bytes = info.properties.get(b'CPath', b'/')
+            cpath = cpath_bytes.decode('utf-8') if isinstance(cpath_bytes, bytes) else cpath_bytes
+
+        device_info = {
+            'name': device_name,
+            'addresses': addresses,
+            'port': info.port,
+            'cpath': cpath,
+            'host': info.server,
+            'last_seen': time.time()
+        }
+
+        with self._lock:
+            self._devices[device_name] = device_info
+            self._mark_dirty()
+        device_registry.on_mdns_change(device_name)
+        activation_waiter.notify(device_name, 'mdns')
+
+        print(f"[mDNS] Spotify Connect device {action}: {device_name} at {addresses[0] if addresses else 'unknown'}:{info.port}")
+
+    def _remove(self, device_name):
+        with self._lock:
+            if self._devices.pop(device_name, None) is None:
+                return
+            self._mark_dirty()
+        print(f"[mDNS] Spotify Connect device removed: {device_name}")
+        device_registry.on_mdns_change(device_name)
+
+
+# Global discovery instance
+spotify_connect_discovery = SpotifyConnectDiscovery(os.path.expanduser('~/.config/spotify-player/mdns_devices.json'))
 
-            print(f"[mDNS] Spotify Connect device {action}: {device_name} at {addresses[0] if addresses else 'unknown'}:{port}")
 
 def start_spotify_connect_discovery():
     """Start mDNS discovery for Spotify Connect devices"""
-    global _zeroconf_instance, _service_browser
-
-    try:
-        _zeroconf_instance = Zeroconf()
-        listener = SpotifyConnectListener()
-        _service_browser = ServiceBrowser(_zeroconf_instance, "_spotify-connect._tcp.local.", listener)
-        print("[mDNS] Spotify Connect discovery started")
-    except Exception as e:
-        print(f"[mDNS] Failed to start discovery: {e}")
+    spotify_connect_discovery.start()
 
 def stop_spotify_connect_discovery():
     """Stop mDNS discovery"""
-    global _zeroconf_instance, _service_browser
-
-    if _service_browser:
-        _service_browser.cancel()
-        _service_browser = None
-    if _zeroconf_instance:
-        _zeroconf_instance.close()
-        _zeroconf_instance = None
-    print("[mDNS] Spotify Connect discovery stopped")
+    spotify_connect_discovery.stop()
 
 def get_spotify_connect_devices():
     """Get list of discovered Spotify Connect devices"""
-    with _spotify_connect_lock:
-        return list(_spotify_connect_devices.values())
+    return spotify_connect_discovery.get_devices()
 
-def get_device_info_from_zeroconf(device):
+def get_device_info_from_zeroconf(device, http=None, timeout=3):
     """Fetch device info from the ZeroConf API endpoint"""
     if not device.get('addresses') or not device.get('port'):
         return None
@@ -289,7 +756,7 @@ def get_device_info_from_zeroconf(device):
         url = f"http://{ip}:{port}{cpath}"
         params = {'action': 'getInfo'}
 
-        response = requests.get(url, params=params, timeout=3)
+        response = (http or requests).get(url, params=params, timeout=timeout)
         if response.status_code == 200:
             return response.json()
     except Exception as e:
@@ -297,16 +764,735 @@ def get_device_info_from_zeroconf(device):
 
     return None
 
+
+class ZeroConfProber:
+    """Background getInfo prober for mDNS-discovered Spotify Connect devices.
+
+    Probes all devices concurrently over a pooled keep-alive session, so one
+    unreachable librespot never delays the others, and caches the result per
+    device (info, activeUser, latency). Readers only ever hit the cache.
+    """
+
+    PROBE_INTERVAL = 10
+    MAX_PROBE_INTERVAL = 120
+    RESULT_TTL = MAX_PROBE_INTERVAL + 30  # must outlive the slowest governed probe interval
+
+    def __init__(self, max_workers=4, timeout=2):
+        self._timeout = timeout
+        self._lock = Lock()
+        self._results = {}  # device name -> {info, active_user, latency_ms, reachable, probed_at}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='zc-probe')
+        self._http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self._http.mount('http://', adapter)
+        self._wake = Event()
+        self._stop = Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background probe loop"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        # A touch on the kiosk probes right away instead of after the idle interval
+        activity_governor.add_wake_event(self._wake)
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print("[mDNS] ZeroConf prober started")
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def request_probe(self):
+        """Probe as soon as possible (e.g. after an mDNS change)"""
+        self._wake.set()
+
+    def request_probe_if_stale(self):
+        """Probe soon when a discovered device has no result from the last PROBE_INTERVAL"""
+        now = time.time()
+        with self._lock:
+            stale = any(
+                d['name'] not in self._results or now - self._results[d['name']]['probed_at'] > self.PROBE_INTERVAL
+                for d in get_spotify_connect_devices()
+            )
+        if stale:
+            self._wake.set()
+
+    def forget(self, device_name):
+        with self._lock:
+            self._results.pop(device_name, None)
+
+    def get_result(self, device_name):
+        """Cached probe result for a device, or None if missing/expired"""
+        with self._lock:
+            result = self._results.get(device_name)
+        if result and time.time() - result['probed_at'] < self.RESULT_TTL:
+            return result
+        return None
+
+    def _probe(self, device):
+        started = time.monotonic()
+        info = get_device_info_from_zeroconf(device, http=self._http, timeout=self._timeout)
+        latency_ms = int((time.monotonic() - started) * 1000)
+        result = {
+            'info': info,
+            'active_user': info.get('activeUser', '') if info else None,
+            'latency_ms': latency_ms if info else None,
+            'reachable': info is not None,
+            'probed_at': time.time()
+        }
+        with self._lock:
+            previous = self._results.get(device['name'])
+            self._results[device['name']] = result
+        if info:
+            # Answering getInfo counts as being seen, also when mDNS stays quiet
+            spotify_connect_discovery.mark_seen(device['name'])
+            device_id_cache.note_seen(device['name'], info.get('deviceID'))
+        if previous and info and previous.get('active_user') != result['active_user']:
+            print(f"[mDNS] {device['name']} activeUser: '{previous.get('active_user') or ''}' -> '{result['active_user']}'")
+            activation_waiter.notify(device['name'], 'active_user')
+        return result
+
+    def probe_device(self, device_name):
+        """Probe one device now, without waiting for the result"""
+        device = next((d for d in get_spotify_connect_devices() if d['name'] == device_name), None)
+        if device:
+            self._executor.submit(self._probe, device)
+
+    def probe_all(self):
+        """Probe every discovered device concurrently and wait for the results"""
+        futures = [self._executor.submit(self._probe, d) for d in get_spotify_connect_devices()]
+        wait_futures(futures, timeout=self._timeout + 1)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                # On-demand discovery: nobody is looking at the devices, don't probe them either
+                if spotify_connect_discovery.browsing:
+                    self.probe_all()
+            except Exception as e:
+                print(f"[mDNS] Probe error: {e}")
+            self._wake.wait(timeout=activity_governor.interval(self.PROBE_INTERVAL, self.MAX_PROBE_INTERVAL))
+            self._wake.clear()
+
+
+# Global ZeroConf prober instance
+zeroconf_prober = ZeroConfProber()
+
+
+# =============================================================================
+# Device Registry
+# =============================================================================
+
+DEVICE_REGISTRY_API_TTL = 5       # Spotify Web API device list (seconds)
+DEVICE_ACTIVATION_STATE_TTL = 60  # How long an activation state is reported
+
+
+def names_match(a, b):
+    """Case-insensitive name match, tolerant of suffixes (same rule as find_device_by_name)"""
+    a = (a or '').lower().strip()
+    b = (b or '').lower().strip()
+    return bool(a and b) and (a == b or a in b or b in a)
+
+
+def filter_allowed_devices(devices):
+    """Apply the SPOTIFY_DEVICE_NAME filter (comma-separated) to Web API devices"""
+    config = get_config()
+    if not config.allowed_device_names:
+        return devices
+    return [d for d in devices if config.is_device_name_allowed(d.get('name'))]
+
+
+class DeviceRegistry:
+    """Single deduplicated view of all playback devices.
+
+    Merges the Spotify Web API device list, librespot instances found via
+    mDNS (enriched with ZeroConf getInfo) and local activation state. The
+    Web API list is refreshed at most every DEVICE_REGISTRY_API_TTL seconds
+    and immediately after events (transfers, activations) invalidate it.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._api_devices = {}   # user_id -> (timestamp, devices)
+        self._fetch_lock = Lock()  # one sp.devices() call at a time; waiters share its result
+        self._activation = {}    # device name -> {'state', 'since', 'error'}
+
+    def invalidate(self):
+        """Force a Web API refresh on the next read (after transfer/activation)"""
+        with self._lock:
+            self._api_devices.clear()
+
+    def on_mdns_change(self, device_name):
+        """A local device appeared, changed or left: reprobe it and refetch the API list"""
+        zeroconf_prober.forget(device_name)
+        zeroconf_prober.request_probe()
+        self.invalidate()
+
+    def set_activation_state(self, device_name, state, error=None):
+        """Record activation progress: 'activating', 'activated' or 'failed'"""
+        with self._lock:
+            self._activation[device_name] = {'state': state, 'since': time.time(), 'error': error}
+        if state != 'activating':
+            self.invalidate()
+
+    def _get_activation_state(self, device_name):
+        with self._lock:
+            entry = self._activation.get(device_name)
+        if entry and time.time() - entry['since'] < DEVICE_ACTIVATION_STATE_TTL:
+            return entry
+        return None
+
+    def get_api_devices(self, sp, max_age=DEVICE_REGISTRY_API_TTL, user_id=None):
+        """Web API devices for the current user (TTL cached, stale on errors/cooldown).
+
+        Args:
+            max_age: Accept a cached list up to this old (activation waiters use a short one)
+            user_id: Needed outside a request (jobs, bulk activation workers)
+
+        Returns:
+            Tuple of (devices, stale)
+        """
+        user_id = user_id or session.get('user_id', 'default')
+        with self._lock:
+            cached = self._api_devices.get(user_id)
+        if cached and time.time() - cached[0] < max_age:
+            return cached[1], False
+        if is_api_in_cooldown():
+            # Past its TTL: serve what we have, but flag it as old
+            return (cached[1] if cached else []), True
+
+        with self._fetch_lock:
+            # Someone else may have fetched while we waited for the lock
+            with self._lock:
+                cached = self._api_devices.get(user_id)
+            if cached and time.time() - cached[0] < max_age:
+                return cached[1], False
+
+            try:
+                devices = sp.devices().get('devices', [])
+            except spotipy.exceptions.SpotifyException as e:
+                handle_spotify_error(e)
+                return (cached[1] if cached else []), True
+
+            with self._lock:
+                self._api_devices[user_id] = (time.time(), devices)
+        device_id_cache.learn_devices(devices)
+        activation_waiter.offer_devices(devices)
+        return devices, False
+
+    def get_local_devices(self):
+        """mDNS-discovered devices in the /api/spotify-connect/local format"""
+        local_devices = []
+        for device in get_spotify_connect_devices():
+            device_data = {
+                'name': device['name'],
+                'ip': device['addresses'][0] if device.get('addresses') else None,
+                'port': device.get('port'),
+                'type': 'local',  # Mark as locally discovered
+                'is_active': False,  # Local devices need activation
+                'age': int(time.time() - device['last_seen']) if device.get('last_seen') else None,
+                'cached': device.get('cached', False)
+            }
+
+            # Enrichment comes from the background prober's cache only
+            probe = zeroconf_prober.get_result(device['name'])
+            zc_info = probe['info'] if probe else None
+            if probe:
+                device_data['reachable'] = probe['reachable']
+                device_data['latency_ms'] = probe['latency_ms']
+                device_data['active_user'] = probe['active_user']
+            if zc_info:
+                device_data['device_id'] = zc_info.get('deviceID')
+                device_data['remote_name'] = zc_info.get('remoteName', device['name'])
+                device_data['device_type'] = zc_info.get('deviceType')
+                device_data['brand'] = zc_info.get('brandDisplayName')
+                device_data['model'] = zc_info.get('modelDisplayName')
+
+            local_devices.append(device_data)
+        return local_devices
+
+    def get_all(self, sp):
+        """Merged device list: Web API devices first, then local-only devices"""
+        api_devices, stale = self.get_api_devices(sp)
+        merged = []
+        for d in filter_allowed_devices(api_devices):
+            entry = dict(d)
+            entry['source'] = 'spotify'
+            merged.append(entry)
+
+        for local in self.get_local_devices():
+            display_name = local.get('remote_name') or local['name']
+            activation = self._get_activation_state(display_name)
+            match = next((m for m in merged if m['source'] == 'spotify' and names_match(m.get('name'), display_name)), None)
+
+            if match:
+                # Same speaker, known to Spotify: keep one entry, remember how to reach it locally
+                match['local'] = {'ip': local['ip'], 'port': local['port'], 'zeroconf_id': local.get('device_id')}
+                continue
+
+            entry = dict(local)
+            entry['source'] = 'local'
+            entry['needs_activation'] = True
+            if activation:
+                entry['activation'] = activation
+            merged.append(entry)
+
+        return {'devices': merged, 'stale': stale, 'updated_at': time.time()}
+
+
+# Global device registry instance
+device_registry = DeviceRegistry()
+
+
+def is_device_not_found_error(error):
+    """True if a SpotifyException means the device id is unknown to Spotify"""
+    return error.http_status == 404 or 'device not found' in str(error).lower()
+
+
+class DeviceIdCache:
+    """Persistent librespot name / ZeroConf deviceID -> Spotify device id mapping.
+
+    Lets transfers try a known Spotify device id straight away instead of
+    listing devices and fuzzy-matching names first. Entries carry a
+    confidence (1.0 exact name seen in the Web API, lower for fuzzy or
+    ZeroConf-derived ids) that grows on successful transfers and drops on
+    failures. last_seen updates are persisted at most every few minutes to
+    spare the SD card; devices not seen for a long time are pruned on save.
+    """
+
+    SAVE_INTERVAL = 300
+    MIN_CONFIDENCE = 0.3
+    MAX_ENTRIES = 200
+    MAX_AGE = 90 * 24 * 3600  # forget devices not seen for three months
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = Lock()
+        self._entries = None  # key -> {spotify_id, name, zeroconf_id, confidence, last_seen}
+        self._dirty = False
+        self._last_save = 0
+
+    @staticmethod
+    def _name_key(name):
+        return f"name:{name.lower().strip()}"
+
+    @staticmethod
+    def _zeroconf_key(zeroconf_id):
+        return f"zc:{zeroconf_id}"
+
+    def _ensure_loaded(self):
+        """Load the mapping from disk on first use (caller holds lock)"""
+        if self._entries is not None:
+            return
+        self._entries = {}
+        try:
+            if os.path.exists(self._path):
+                with open(self._path, 'r') as f:
+                    self._entries = json.load(f)
+        except Exception as e:
+            print(f"[Devices] Error loading device id cache: {e}")
+
+    def _prune(self):
+        """Drop entries not seen for MAX_AGE, then the oldest beyond MAX_ENTRIES (caller holds lock)"""
+        cutoff = time.time() - self.MAX_AGE
+        for key in [k for k, e in self._entries.items() if e.get('last_seen', 0) < cutoff]:
+            del self._entries[key]
+        if len(self._entries) > self.MAX_ENTRIES:
+            by_age = sorted(self._entries, key=lambda k: self._entries[k].get('last_seen', 0))
+            for key in by_age[:len(self._entries) - self.MAX_ENTRIES]:
+                del self._entries[key]
+
+    def _save(self, force=False):
+        """Persist atomically (caller holds lock)"""
+        if not self._dirty or (not force and time.time() - self._last_save < self.SAVE_INTERVAL):
+            return
+        self._prune()
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp_path = self._path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self._path)
+            self._dirty = False
+            self._last_save = time.time()
+        except Exception as e:
+            print(f"[Devices] Error saving device id cache: {e}")
+
+    def _store(self, key, spotify_id, name, zeroconf_id, confidence):
+        """Insert/update an entry; returns True if the mapping itself changed (caller holds lock)"""
+        entry = self._entries.get(key)
+        changed = not entry or entry['spotify_id'] != spotify_id
+        if changed:
+            entry = {'spotify_id': spotify_id, 'name': name, 'zeroconf_id': zeroconf_id, 'confidence': confidence}
+            self._entries[key] = entry
+        else:
+            entry['confidence'] = max(entry['confidence'], confidence)
+            entry['zeroconf_id'] = zeroconf_id or entry.get('zeroconf_id')
+        entry['last_seen'] = time.time()
+        self._dirty = True
+        return changed
+
+    def learn_devices(self, devices):
+        """Record every device seen in a Web API device list (exact names)"""
+        with self._lock:
+            self._ensure_loaded()
+            changed = False
+            for d in devices:
+                if d.get('id') and d.get('name'):
+                    changed |= self._store(self._name_key(d['name']), d['id'], d['name'], None, 1.0)
+            self._save(force=changed)
+
+    def learn(self, name, spotify_id, zeroconf_id=None, confidence=1.0):
+        """Record a resolved mapping (e.g. after activation matched a device)"""
+        with self._lock:
+            self._ensure_loaded()
+            changed = False
+            if name:
+                changed |= self._store(self._name_key(name), spotify_id, name, zeroconf_id, confidence)
+            if zeroconf_id:
+                changed |= self._store(self._zeroconf_key(zeroconf_id), spotify_id, name, zeroconf_id, confidence)
+            self._save(force=changed)
+
+    def note_seen(self, name=None, zeroconf_id=None):
+        """Refresh last_seen of a device that is online (saved with the next periodic save)"""
+        with self._lock:
+            self._ensure_loaded()
+            keys = [self._zeroconf_key(zeroconf_id) if zeroconf_id else None, self._name_key(name) if name else None]
+            for entry in (self._entries.get(key) for key in keys if key):
+                if entry:
+                    entry['last_seen'] = time.time()
+                    self._dirty = True
+            self._save()
+
+    def resolve(self, name=None, zeroconf_id=None):
+        """Return the best known entry for a device, or None"""
+        with self._lock:
+            self._ensure_loaded()
+            candidates = []
+            if zeroconf_id:
+                candidates.append(self._entries.get(self._zeroconf_key(zeroconf_id)))
+            if name:
+                candidates.append(self._entries.get(self._name_key(name)))
+            candidates = [c for c in candidates if c and c['confidence'] >= self.MIN_CONFIDENCE]
+            if not candidates:
+                return None
+            return dict(max(candidates, key=lambda c: (c['confidence'], c.get('last_seen', 0))))
+
+    def record_transfer(self, spotify_id, success):
+        """Adjust confidence of every entry pointing at spotify_id after a transfer attempt"""
+        with self._lock:
+            self._ensure_loaded()
+            for key, entry in list(self._entries.items()):
+                if entry['spotify_id'] != spotify_id:
+                    continue
+                if success:
+                    entry['confidence'] = min(1.0, entry['confidence'] + 0.1)
+                    entry['last_seen'] = time.time()
+                else:
+                    entry['confidence'] = round(entry['confidence'] / 2, 3)
+                    if entry['confidence'] < self.MIN_CONFIDENCE:
+                        del self._entries[key]
+                self._dirty = True
+            self._save(force=not success)
+
+    def record_transfer_error(self, spotify_id, error):
+        """Lower confidence only when Spotify says the device id is unknown.
+
+        Rate limits (429) and server errors (5xx) say nothing about the id.
+        """
+        if is_device_not_found_error(error):
+            self.record_transfer(spotify_id, False)
+
+
+# Global device id cache instance
+device_id_cache = DeviceIdCache(os.path.expanduser('~/.config/spotify-player/device_ids.json'))
+
+
+class ActivationWaiter:
+    """Completes ZeroConf activations as soon as the device shows up.
+
+    Waiting requests sleep on a Condition that is signalled by the getInfo
+    prober (activeUser changed), mDNS (TXT update) and the device registry
+    (fresh Web API list). A Web API lookup only runs on such a signal or on
+    the slow backoff fallback, and goes through the device registry so
+    parallel waiters share one devices() call. Time-to-speaker is kept per
+    attempt.
+    """
+
+    BACKOFF_START = 1.0
+    BACKOFF_MAX = 4.0
+    LOOKUP_MAX_AGE = 0.5  # a registry list this fresh counts as a lookup of our own
+    TIMEOUT = 8
+
+    def __init__(self, history=50):
+        self._cond = Condition()
+        self._signals = {}           # device name (lower) -> (count, source)
+        self._offered = (0, [])      # latest Web API device list seen by the registry
+        self._attempts = deque(maxlen=history)
+
+    def notify(self, device_name, source):
+        """A device changed state (prober/mDNS)"""
+        with self._cond:
+            count, _ = self._signals.get(device_name.lower(), (0, None))
+            self._signals[device_name.lower()] = (count + 1, source)
+            self._cond.notify_all()
+
+    def offer_devices(self, devices):
+        """The registry fetched a fresh Web API device list"""
+        with self._cond:
+            self._offered = (time.time(), devices)
+            self._cond.notify_all()
+
+    def wait_for_device(self, device_name, sp, since, user_id, timeout=None):
+        """Wait until the device shows up in the Web API device list.
+
+        Args:
+            device_name: Local (mDNS) device name
+            sp: Spotify client used for lookups
+            since: Activation time; device lists older than this are ignored
+            user_id: Spotify user the activation runs for
+
+        Returns:
+            Tuple of (device or None, trigger)
+        """
+        deadline = time.time() + (timeout or self.TIMEOUT)
+        key = device_name.lower()
+        delay = self.BACKOFF_START
+        next_poll = time.time() + delay
+        trigger = None
+
+        with self._cond:
+            last_signal = self._signals.get(key, (0, None))[0]
+            last_offer = self._offered[0]
+
+        # Nudge the prober so an activeUser change is seen right away
+        zeroconf_prober.probe_device(device_name)
+
+        while True:
+            with self._cond:
+                while True:
+                    now = time.time()
+                    if now >= deadline:
+                        return None, trigger
+
+                    offered_at, offered = self._offered
+                    if offered_at != last_offer:
+                        last_offer = offered_at
+                        found = find_device_by_name(offered, device_name) if offered_at >= since else None
+                        if found:
+                            return found, trigger or 'registry'
+
+                    count, source = self._signals.get(key, (0, None))
+                    if count != last_signal:
+                        last_signal, trigger = count, source
+                        break
+
+                    if now >= next_poll:
+                        # Fallback; signals do not reset the backoff
+                        trigger = 'poll'
+                        delay = min(delay * 2, self.BACKOFF_MAX)
+                        next_poll = now + delay
+                        zeroconf_prober.probe_device(device_name)
+                        break
+
+                    self._cond.wait(timeout=min(next_poll, deadline) - now)
+
+            if is_api_in_cooldown():
+                continue
+            try:
+                devices, stale = device_registry.get_api_devices(sp, max_age=self.LOOKUP_MAX_AGE, user_id=user_id)
+            except Exception as e:
+                print(f"[ZeroConf] Error fetching devices: {e}")
+                continue
+            found = None if stale else find_device_by_name(devices, device_name)
+            if found:
+                return found, trigger
+
+    def record(self, device_name, started_at, activated_at, success, trigger=None, method='zeroconf'):
+        """Store one activation attempt (times in ms since the request started)"""
+        now = time.time()
+        attempt = {
+            'device': device_name,
+            'method': method,
+            'success': success,
+            'trigger': trigger,
+            'activate_ms': int((activated_at - started_at) * 1000) if activated_at else None,
+            'time_to_speaker_ms': int((now - started_at) * 1000) if success else None,
+            'at': now
+        }
+        with self._cond:
+            self._attempts.append(attempt)
+        print(f"[ZeroConf] Attempt {device_name}: success={success} trigger={trigger} "
+              f"time_to_speaker={attempt['time_to_speaker_ms']}ms")
+        return attempt
+
+    def get_stats(self):
+        with self._cond:
+            attempts = list(self._attempts)
+        times = sorted(a['time_to_speaker_ms'] for a in attempts if a['time_to_speaker_ms'] is not None)
+        return {
+            'attempts': attempts,
+            'success_rate': round(sum(1 for a in attempts if a['success']) / len(attempts), 2) if attempts else None,
+            'median_time_to_speaker_ms': times[len(times) // 2] if times else None
+        }
+
+
+# Global activation waiter instance
+activation_waiter = ActivationWaiter()
+
+
+class BulkActivator:
+    """Activates several local devices in parallel (multi-room).
+
+    Each device runs getInfo -> DH -> addUser on a worker thread, then waits
+    for it to appear in the Web API. The first ready device gets playback
+    (optional); progress and per-device latency are kept per batch.
+    """
+
+    MAX_WORKERS = 4
+    BATCH_TTL = 600
+
+    def __init__(self):
+        self._lock = Lock()
+        self._cond = Condition(self._lock)
+        self._batches = {}  # batch id -> batch dict
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix='zc-activate')
+
+    def start(self, sp, devices, credentials_path, user_id, transfer=True):
+        """Start a batch; returns its id immediately"""
+        batch_id = base64.urlsafe_b64encode(os.urandom(6)).decode()
+        now = time.time()
+        batch = {
+            'id': batch_id,
+            'started_at': now,
+            'transfer': transfer,
+            'playback_device': None,
+            'devices': {d['device_name']: {
+                'name': d['device_name'],
+                'state': 'pending',
+                'spotify_device_id': None,
+                'handshake_ms': None,
+                'ready_ms': None,
+                'error': None
+            } for d in devices}
+        }
+        with self._lock:
+            self._prune()
+            self._batches[batch_id] = batch
+
+        # One Web API call up front: devices Spotify already knows need no handshake
+        try:
+            known, _ = device_registry.get_api_devices(sp, max_age=ActivationWaiter.LOOKUP_MAX_AGE, user_id=user_id)
+        except Exception as e:
+            print(f"[ZeroConf] Bulk: error fetching devices: {e}")
+            known = []
+
+        for d in devices:
+            existing = find_device_by_name(known, d['device_name'])
+            if existing:
+                self._mark_ready(batch, d['device_name'], existing['id'], sp, skipped=True)
+                activation_waiter.record(d['device_name'], now, None, True, method='bulk-known')
+            else:
+                self._executor.submit(self._activate_one, batch, d, sp, credentials_path, user_id)
+        return batch_id
+
+    def _update(self, batch, name, **fields):
+        with self._cond:
+            batch['devices'][name].update(fields)
+            self._cond.notify_all()
+
+    def _activate_one(self, batch, device, sp, credentials_path, user_id):
+        name = device['device_name']
+        started_at = time.time()
+        self._update(batch, name, state='handshake')
+        device_registry.set_activation_state(name, 'activating')
+        try:
+            result = get_zeroconf_activator(credentials_path).activate_device(device['ip'], int(device['port']))
+        except Exception as e:
+            result = {'status': None, 'statusString': str(e)}
+        activated_at = time.time()
+        handshake_ms = int((activated_at - started_at) * 1000)
+
+        if result.get('status') != 101:
+            device_registry.set_activation_state(name, 'failed', result.get('statusString'))
+            activation_waiter.record(name, started_at, None, False, method='bulk')
+            self._update(batch, name, state='failed', handshake_ms=handshake_ms, error=result.get('statusString'))
+            return
+
+        device_registry.set_activation_state(name, 'activated')
+        self._update(batch, name, state='activated', handshake_ms=handshake_ms)
+
+        found, trigger = activation_waiter.wait_for_device(name, sp, since=activated_at, user_id=user_id)
+        activation_waiter.record(name, started_at, activated_at, bool(found), trigger, method='bulk')
+        if not found:
+            self._update(batch, name, state='failed', error='not found in Spotify')
+            return
+        device_id_cache.learn(name, found['id'], device.get('device_id'))
+        self._mark_ready(batch, name, found['id'], sp)
+
+    def _mark_ready(self, batch, name, spotify_device_id, sp, skipped=False):
+        with self._cond:
+            take_playback = batch['transfer'] and batch['playback_device'] is None
+            if take_playback:
+                batch['playback_device'] = name
+        if take_playback:
+            try:
+                sp.transfer_playback(spotify_device_id, force_play=True)
+                device_registry.invalidate()
+                print(f"[ZeroConf] Bulk: playback on {name}")
+            except Exception as e:
+                print(f"[ZeroConf] Bulk: transfer to {name} failed: {e}")
+                with self._cond:
+                    batch['playback_device'] = None
+        self._update(batch, name, state='ready', spotify_device_id=spotify_device_id,
+                     skipped_activation=skipped,
+                     ready_ms=int((time.time() - batch['started_at']) * 1000))
+
+    def wait_first_ready(self, batch_id, timeout):
+        """Block until one device is ready or all have finished"""
+        deadline = time.time() + timeout
+        with self._cond:
+            batch = self._batches.get(batch_id)
+            while batch:
+                states = [d['state'] for d in batch['devices'].values()]
+                remaining = deadline - time.time()
+                if 'ready' in states or all(s == 'failed' for s in states) or remaining <= 0:
+                    break
+                self._cond.wait(timeout=remaining)
+        return self.get(batch_id)
+
+    def get(self, batch_id):
+        """Snapshot of a batch with its overall state"""
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if not batch:
+                return None
+            devices = [dict(d) for d in batch['devices'].values()]
+            snapshot = {k: v for k, v in batch.items() if k != 'devices'}
+        snapshot['devices'] = devices
+        snapshot['done'] = all(d['state'] in ('ready', 'failed') for d in devices)
+        snapshot['ready'] = sum(1 for d in devices if d['state'] == 'ready')
+        return snapshot
+
+    def _prune(self):
+        """Drop finished batches (caller holds lock)"""
+        cutoff = time.time() - self.BATCH_TTL
+        for batch_id in [b for b, batch in self._batches.items() if batch['started_at'] < cutoff]:
+            del self._batches[batch_id]
+
+
+# Global bulk activator instance
+bulk_activator = BulkActivator()
+
+
 # Spotify OAuth configuration
 SPOTIFY_SCOPE = 'user-read-playback-state,user-modify-playback-state,playlist-read-private,user-library-read,user-follow-read,user-read-email,user-read-private'
 
 def check_credentials():
     """Check if Spotify credentials are configured"""
-    return bool(
-        os.getenv('SPOTIFY_CLIENT_ID') and
-        os.getenv('SPOTIFY_CLIENT_SECRET') and
-        os.getenv('SPOTIFY_REDIRECT_URI')
-    )
+    return get_config().has_credentials
 
 def get_cache_path(user_id='default'):
     """Get absolute cache file path"""
@@ -324,24 +1510,100 @@ def get_spotify_oauth(show_dialog=False):
         return None
 
     return SpotifyOAuth(
-        client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-        client_secret=os.getenv('SPOTIFY_CLIENT_SECRET'),
-        redirect_uri=os.getenv('SPOTIFY_REDIRECT_URI'),
+        **get_config().oauth_params,
         scope=SPOTIFY_SCOPE,
         cache_path=get_cache_path(session.get('user_id', 'default')),
         show_dialog=show_dialog
     )
 
+
+class TokenStore:
+    """
+    Spotify tokens per user, shared by every client (kiosk, phones).
+
+    Sessions only carry the user id; the tokens themselves stay on the
+    server, in memory and in spotipy's .cache-<user_id> files. A per-user
+    lock makes sure only one request refreshes an expired token while the
+    others wait for the result instead of refreshing it again.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._tokens = {}          # user_id -> token_info
+        self._refresh_locks = {}   # user_id -> Lock
+
+    def get(self, user_id):
+        """Token for user_id from memory, or from its cache file"""
+        with self._lock:
+            token_info = self._tokens.get(user_id)
+        if token_info:
+            return token_info
+
+        try:
+            with open(get_cache_path(user_id), 'r') as f:
+                token_info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not token_info or not token_info.get('refresh_token'):
+            return None
+
+        with self._lock:
+            return self._tokens.setdefault(user_id, token_info)
+
+    def set(self, user_id, token_info):
+        with self._lock:
+            self._tokens[user_id] = token_info
+
+    def discard(self, user_id=None):
+        """Forget the token of user_id, or of all users"""
+        with self._lock:
+            if user_id is None:
+                self._tokens.clear()
+            else:
+                self._tokens.pop(user_id, None)
+
+    def get_fresh(self, user_id):
+        """Token for user_id, refreshed first if it has expired.
+
+        Raises:
+            spotipy.SpotifyOauthError: If the refresh fails
+        """
+        with self._lock:
+            refresh_lock = self._refresh_locks.setdefault(user_id, Lock())
+
+        with refresh_lock:
+            token_info = self.get(user_id)
+            if not token_info:
+                return None
+
+            sp_oauth = SpotifyOAuth(
+                **get_config().oauth_params,
+                scope=SPOTIFY_SCOPE,
+                cache_path=get_cache_path(user_id)
+            )
+            if sp_oauth.is_token_expired(token_info):
+                # Also writes the new token to the user's cache file
+                token_info = sp_oauth.refresh_access_token(token_info['refresh_token'])
+                self.set(user_id, token_info)
+            return token_info
+
+
+# Global token store instance
+token_store = TokenStore()
+
+
 def restore_session_from_cache():
     """Try to restore session from existing cache files.
 
     This handles the case where Flask session is lost but Spotify tokens
-    are still valid in cache files (e.g., after browser restart).
+    are still valid in cache files (e.g., after browser restart), and lets
+    a new client (a phone) pick up the account the kiosk is logged in with.
 
     Returns:
         True if session was restored, False otherwise
     """
-    if session.get('token_info'):
+    user_id = session.get('user_id')
+    if user_id and token_store.get(user_id):
         return True  # Session already exists
 
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -350,36 +1612,21 @@ def restore_session_from_cache():
 
     for cache_file in cache_files:
         try:
-            with open(cache_file, 'r') as f:
-                token_info = json.load(f)
-
-            if not token_info.get('refresh_token'):
-                continue
-
             # Extract user_id from cache filename
             user_id = os.path.basename(cache_file).replace('.cache-', '')
             if user_id == 'default':
-                continue
-
-            # Create OAuth with this user's cache
-            sp_oauth = SpotifyOAuth(
-                client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-                client_secret=os.getenv('SPOTIFY_CLIENT_SECRET'),
-                redirect_uri=os.getenv('SPOTIFY_REDIRECT_URI'),
-                scope=SPOTIFY_SCOPE,
-                cache_path=cache_file
-            )
+                continue
 
-            # Refresh token if expired
-            if sp_oauth.is_token_expired(token_info):
-                token_info = sp_oauth.refresh_access_token(token_info['refresh_token'])
+            # Refreshed if expired
+            token_info = token_store.get_fresh(user_id)
+            if not token_info:
+                continue
 
             # Verify token works by making a test call
             sp = spotipy.Spotify(auth=token_info['access_token'])
             sp.current_user()  # This will raise if token is invalid
 
             # Token is valid - restore session
-            session['token_info'] = token_info
             session['user_id'] = user_id
             print(f"Session restored from cache for user: {user_id}")
             return True
@@ -393,20 +1640,13 @@ def restore_session_from_cache():
 
 def get_spotify_client():
     """Get authenticated Spotify client"""
-    token_info = session.get('token_info', None)
-    if not token_info:
-        # Try to restore from cache first
-        if restore_session_from_cache():
-            token_info = session.get('token_info')
-        else:
-            return None
-
-    sp_oauth = get_spotify_oauth()
+    if not restore_session_from_cache():
+        return None
 
-    # Refresh token if expired
-    if sp_oauth.is_token_expired(token_info):
-        token_info = sp_oauth.refresh_access_token(token_info['refresh_token'])
-        session['token_info'] = token_info
+    # Refreshed if expired
+    token_info = token_store.get_fresh(session['user_id'])
+    if not token_info:
+        return None
 
     # Disable spotipy retries - our cooldown system handles errors
     return spotipy.Spotify(
@@ -447,13 +1687,10 @@ def find_device_by_name(devices: list, name: str) -> dict:
 
 def is_device_allowed(sp=None):
     """Check if current active device is in allowed list"""
-    device_filter = os.getenv('SPOTIFY_DEVICE_NAME', '').strip()
-    if not device_filter:
+    config = get_config()
+    if not config.allowed_device_names:
         return True  # Geen filter = alles toegestaan
 
-    # Support meerdere devices (comma-separated)
-    allowed_devices = [d.strip().lower() for d in device_filter.split(',')]
-
     if not sp:
         sp = get_spotify_client()
     if not sp:
@@ -464,8 +1701,8 @@ def is_device_allowed(sp=None):
         if not playback or not playback.get('device'):
             return True  # Geen actief device = geen blokkade
 
-        active_device_name = playback['device']['name'].lower()
-        return any(allowed in active_device_name for allowed in allowed_devices)
+        # Support meerdere devices (comma-separated, voorberekend in de config)
+        return config.is_device_name_allowed(playback['device']['name'])
     except:
         return True  # Bij error niet blokkeren
 
@@ -533,21 +1770,333 @@ def spotify_playback_action(f):
             return jsonify({'error': t('error.unknown')}), 500
     return decorated
 
+# =============================================================================
+# Command Runner (pactl / bluetoothctl)
+# =============================================================================
+
+class CommandRunner:
+    """Single entry point for short-lived pactl/bluetoothctl calls.
+
+    - Per-binary concurrency limits, so a device panel refresh can't fork a
+      dozen processes at once
+    - Identical read-only commands (cache_ttl > 0) already in flight are
+      merged (callers share the result) and cached briefly
+    - Any other command counts as a change: changes to one binary run one at
+      a time in the order they were submitted (set-sink-volume 50%, 60%, 50%
+      ends at 50%) and clear that binary's cache
+    - Spawn counts and latency per binary for /api/system/command-stats
+
+    Long-lived sessions (scans, pexpect pairing) don't go through here.
+    """
+
+    LIMITS = {'pactl': 2, 'bluetoothctl': 2}
+    DEFAULT_LIMIT = 2
+
+    def __init__(self):
+        self._lock = Lock()
+        self._semaphores = {}
+        self._write_turns = {}  # binary -> {'cond': Condition, 'next': ticket, 'serving': ticket}
+        self._inflight = {}  # key -> {'started': Event, 'done': Event, 'result', 'error'}
+        self._cache = {}     # key -> (expires, CompletedProcess)
+        self._stats = {}     # binary -> counters
+
+    def _semaphore(self, binary):
+        with self._lock:
+            if binary not in self._semaphores:
+                self._semaphores[binary] = threading_semaphore(self.LIMITS.get(binary, self.DEFAULT_LIMIT))
+            return self._semaphores[binary]
+
+    def _write_turn(self, binary):
+        with self._lock:
+            if binary not in self._write_turns:
+                self._write_turns[binary] = {'cond': Condition(), 'next': 0, 'serving': 0}
+            return self._write_turns[binary]
+
+    def _count(self, binary, field, elapsed_ms=None):
+        """Update stats (caller holds lock)"""
+        stats = self._stats.setdefault(binary, {
+            'spawned': 0, 'merged': 0, 'cache_hits': 0, 'errors': 0, 'total_ms': 0, 'max_ms': 0
+        })
+        stats[field] += 1
+        if elapsed_ms is not None:
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+    def run(self, args, input=None, timeout=5, cache_ttl=0):
+        """Run a command like subprocess.run(capture_output=True, text=True).
+
+        Raises the same exceptions (TimeoutExpired, FileNotFoundError).
+        """
+        binary = args[0]
+        key = (tuple(args), input)
+
+        read_only = cache_ttl > 0
+        call = {'started': Event(), 'done': Event(), 'result': None, 'error': None}
+
+        with self._lock:
+            if read_only:
+                cached = self._cache.get(key)
+                if cached and cached[0] > time.time():
+                    self._count(binary, 'cache_hits')
+                    return cached[1]
+                inflight = self._inflight.get(key)
+                if inflight:
+                    self._count(binary, 'merged')
+                else:
+                    self._inflight[key] = call
+
+        if read_only and inflight:
+            # The owner's queueing for the semaphore doesn't count against our timeout
+            inflight['started'].wait()
+            inflight['done'].wait(timeout + 1)
+            if inflight['error']:
+                raise inflight['error']
+            if inflight['result'] is None:
+                raise subprocess.TimeoutExpired(args, timeout)
+            return inflight['result']
+
+        turn = None
+        if not read_only:
+            turn = self._write_turn(binary)
+            with turn['cond']:
+                ticket = turn['next']
+                turn['next'] += 1
+                turn['cond'].wait_for(lambda: turn['serving'] == ticket)
+
+        started = time.monotonic()
+        try:
+            with self._semaphore(binary):
+                call['started'].set()
+                started = time.monotonic()
+                call['result'] = subprocess.run(args, input=input, capture_output=True, text=True, timeout=timeout)
+        except Exception as e:
+            call['error'] = e
+        finally:
+            call['started'].set()
+            if turn:
+                with turn['cond']:
+                    turn['serving'] += 1
+                    turn['cond'].notify_all()
+            elapsed_ms = int((time.monotonic() - started) * 1000)
+            with self._lock:
+                if read_only:
+                    self._inflight.pop(key, None)
+                self._count(binary, 'errors' if call['error'] else 'spawned', elapsed_ms)
+                if read_only and call['result'] is not None:
+                    self._cache[key] = (time.time() + cache_ttl, call['result'])
+                elif not read_only:
+                    # A change: cached reads of this binary are no longer valid
+                    for cached_key in [k for k in self._cache if k[0][0] == binary]:
+                        del self._cache[cached_key]
+            call['done'].set()
+
+        if call['error']:
+            raise call['error']
+        return call['result']
+
+    def invalidate(self, binary=None):
+        """Drop cached results (all, or for one binary)"""
+        with self._lock:
+            for key in [k for k in self._cache if binary is None or k[0][0] == binary]:
+                del self._cache[key]
+
+    def get_stats(self):
+        with self._lock:
+            stats = {binary: dict(s) for binary, s in self._stats.items()}
+        for s in stats.values():
+            runs = s['spawned'] + s['errors']
+            s['avg_ms'] = int(s['total_ms'] / runs) if runs else 0
+        return stats
+
+
+# Global command runner instance
+command_runner = CommandRunner()
+
+
+# =============================================================================
+# Audio Sink Model (pactl subscribe)
+# =============================================================================
+
+class AudioSinkModel:
+    """In-memory sinks / default sink / volume / codec, kept current by events.
+
+    One long-lived `pactl subscribe` process reports changes; only then is the
+    model refreshed from structured `pactl -f json` output. Readers never spawn
+    anything. While the model is not ready (no pactl, or pactl without JSON
+    support) callers fall back to the old pactl parsing.
+    """
+
+    RELEVANT_FACILITIES = ('sink', 'server', 'card')
+    REFRESH_DEBOUNCE = 0.1
+
+    def __init__(self):
+        self._lock = Lock()
+        self._sinks = []
+        self._default_sink = None
+        self._ready = False
+        self._dirty = Event()
+        self._stop = Event()
+        self._process = None
+        self._threads = []
+
+    @property
+    def ready(self):
+        return self._ready
+
+    @staticmethod
+    def _json_supported():
+        """True if pactl knows --format (pactl 16+); checked once, works without a server"""
+        try:
+            result = command_runner.run(['pactl', '--help'], timeout=5, cache_ttl=60)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return False
+        return '--format' in result.stdout
+
+    def start(self):
+        """Start the subscribe listener and refresh threads"""
+        if self._threads:
+            return
+        if not self._json_supported():
+            # Every event would spawn two failing pactl calls: stay on the text parsers
+            print("[Audio] pactl without JSON output, sink model disabled")
+            return
+        self._stop.clear()
+        self._threads = [Thread(target=self._listen, daemon=True), Thread(target=self._refresh_loop, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._dirty.set()
+        if self._process:
+            self._process.terminate()
+
+    def _listen(self):
+        """Keep `pactl subscribe` running; mark the model dirty on relevant events"""
+        backoff = 5
+        while not self._stop.is_set():
+            try:
+                self._process = subprocess.Popen(['pactl', 'subscribe'], stdout=subprocess.PIPE,
+                                                 stderr=subprocess.DEVNULL, text=True, bufsize=1)
+                print("[Audio] Listening for PulseAudio events")
+                self._dirty.set()  # initial load
+                backoff = 5
+                for line in self._process.stdout:
+                    # e.g. "Event 'change' on sink #52"
+                    if any(f" on {facility} " in line for facility in self.RELEVANT_FACILITIES):
+                        self._dirty.set()
+                self._process.wait()
+            except FileNotFoundError:
+                print("[Audio] pactl not found, sink model disabled")
+                return
+            except Exception as e:
+                print(f"[Audio] pactl subscribe error: {e}")
+
+            with self._lock:
+                self._ready = False
+            if self._stop.wait(backoff):
+                return
+            backoff = min(backoff * 2, 60)
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            self._dirty.wait()
+            if self._stop.is_set():
+                return
+            time.sleep(self.REFRESH_DEBOUNCE)  # coalesce event bursts
+            self._dirty.clear()
+            self.refresh()
+
+    def refresh(self):
+        """Reload the model from `pactl -f json`"""
+        try:
+            info = command_runner.run(['pactl', '-f', 'json', 'info'], timeout=5, cache_ttl=0.05)
+            sinks = command_runner.run(['pactl', '-f', 'json', 'list', 'sinks'], timeout=5, cache_ttl=0.05)
+            if info.returncode != 0 or sinks.returncode != 0:
+                raise ValueError((info.stderr or sinks.stderr).strip())
+            default_sink = json.loads(info.stdout).get('default_sink_name')
+            parsed = [self._parse_sink(s, default_sink) for s in json.loads(sinks.stdout)]
+        except Exception as e:
+            # e.g. PulseAudio/PipeWire restarting: text parsers until the next event
+            print(f"[Audio] Sink model refresh failed: {e}")
+            with self._lock:
+                self._ready = False
+            return
+
+        with self._lock:
+            self._sinks = parsed
+            self._default_sink = default_sink
+            self._ready = True
+
+    @staticmethod
+    def _parse_sink(sink, default_sink):
+        properties = sink.get('properties') or {}
+        channels = (sink.get('volume') or {}).values()
+        percents = [int(str(c.get('value_percent', '0')).rstrip('%')) for c in channels]
+        codec = properties.get('api.bluez5.codec') or properties.get('bluetooth.codec')
+        return {
+            'id': sink.get('name'),
+            'name': sink.get('description'),
+            'is_active': sink.get('state') == 'RUNNING',
+            'is_default': sink.get('name') == default_sink,
+            'volume': round(sum(percents) / len(percents)) if percents else None,
+            'muted': sink.get('mute', False),
+            'codec': codec.upper() if codec else None,
+            'bluetooth_address': properties.get('api.bluez5.address')
+        }
+
+    def note_default_sink(self, sink_name):
+        """Apply our own set-default-sink right away (the event refresh follows)"""
+        with self._lock:
+            self._default_sink = sink_name
+            for sink in self._sinks:
+                sink['is_default'] = sink['id'] == sink_name
+
+    def note_default_volume(self, volume):
+        """Apply our own set-sink-volume right away (the event refresh follows)"""
+        with self._lock:
+            for sink in self._sinks:
+                if sink['is_default']:
+                    sink['volume'] = volume
+
+    def get_devices(self):
+        """Sinks in the get_audio_devices() format"""
+        with self._lock:
+            return [{k: s[k] for k in ('id', 'name', 'is_active', 'is_default')} for s in self._sinks]
+
+    def get_default_volume(self):
+        with self._lock:
+            sink = next((s for s in self._sinks if s['is_default']), None)
+            return sink['volume'] if sink else None
+
+    def get_codec(self, address):
+        """Active codec of the sink belonging to a Bluetooth address"""
+        address_formatted = address.replace(':', '_')
+        with self._lock:
+            for sink in self._sinks:
+                if (sink['bluetooth_address'] or '').upper() == address.upper() or \
+                        f'bluez_output.{address_formatted}' in (sink['id'] or ''):
+                    return sink['codec']
+        return None
+
+
+# Global sink model instance
+audio_sink_model = AudioSinkModel()
+
+
 # Audio Device Helper Functions
 def get_audio_devices_linux():
     """Get audio devices on Linux using pactl"""
     try:
         # Get default sink name first
-        default_result = subprocess.run(['pactl', 'info'],
-                                       capture_output=True, text=True, timeout=5)
+        default_result = command_runner.run(['pactl', 'info'], timeout=5, cache_ttl=2)
         default_sink = None
         for line in default_result.stdout.split('\n'):
             if line.strip().startswith('Default Sink:'):
                 default_sink = line.split(':', 1)[1].strip()
                 break
 
-        result = subprocess.run(['pactl', 'list', 'sinks'],
-                              capture_output=True, text=True, timeout=5)
+        result = command_runner.run(['pactl', 'list', 'sinks'], timeout=5, cache_ttl=2)
 
         if result.returncode != 0:
             return []
@@ -590,7 +2139,10 @@ def get_audio_devices_linux():
         return []
 
 def get_audio_devices():
-    """Get audio output devices using pactl"""
+    """Get audio output devices (sink model, or pactl when it isn't ready)"""
+    if audio_sink_model.ready:
+        return audio_sink_model.get_devices()
+
     start_time = time.time()
     devices = get_audio_devices_linux()
     elapsed = time.time() - start_time
@@ -598,16 +2150,70 @@ def get_audio_devices():
     return devices
 
 def set_audio_device(device_id):
-    """Set audio output device using pactl"""
+    """Set audio output device (native PulseAudio connection, pactl as fallback)"""
     try:
-        result = subprocess.run(['pactl', 'set-default-sink', device_id],
-                              capture_output=True, text=True, timeout=5)
-        return result.returncode == 0
+        try:
+            pulse_backend.set_default_sink(device_id)
+            success = True
+        except RuntimeError:
+            result = command_runner.run(['pactl', 'set-default-sink', device_id], timeout=5)
+            success = result.returncode == 0
+        if success:
+            audio_sink_model.note_default_sink(device_id)
+        return success
     except Exception as e:
         print(f"Error setting audio device: {e}")
         return False
 
 
+def move_sink_inputs(sink_name):
+    """Move every playing stream (e.g. librespot) to sink_name; returns how many moved"""
+    try:
+        return pulse_backend.move_sink_inputs(sink_name)
+    except RuntimeError:
+        pass
+
+    try:
+        result = command_runner.run(['pactl', 'list', 'short', 'sink-inputs'], timeout=5, cache_ttl=0.05)
+        # "<index>\t<sink index>\t<client>\t<driver>\t<format>"
+        indexes = [line.split('\t')[0] for line in result.stdout.splitlines() if line.strip()]
+        for index in indexes:
+            command_runner.run(['pactl', 'move-sink-input', index, sink_name], timeout=5)
+        return len(indexes)
+    except Exception as e:
+        print(f"[Audio] Error moving streams: {e}")
+        return 0
+
+
+# Bumped by every volume change: a running ramp stops as soon as it is stale
+_volume_ramp_generation = 0
+_volume_ramp_lock = Lock()
+
+
+def ramp_system_volume(sink_name, target, duration_ms, steps=8):
+    """Fade a sink from 0 to target in the background (softens the switch).
+
+    Any set_system_volume call (e.g. the user moving the slider) or a newer
+    ramp ends the fade, so it never overwrites a later volume.
+    """
+    global _volume_ramp_generation
+    with _volume_ramp_lock:
+        _volume_ramp_generation += 1
+        generation = _volume_ramp_generation
+
+    def ramp():
+        for step in range(1, steps + 1):
+            time.sleep(duration_ms / steps / 1000)
+            # Checked and applied under the lock: a concurrent change waits for
+            # this step and then wins
+            with _volume_ramp_lock:
+                if generation != _volume_ramp_generation:
+                    return
+                _apply_system_volume(round(target * step / steps), sink_name)
+
+    Thread(target=ramp, daemon=True).start()
+
+
 # =============================================================================
 # Bluetooth Device Manager
 # =============================================================================
@@ -623,17 +2229,11 @@ class BluetoothManager:
         self._lock = Lock()
         self._last_device_file = os.path.expanduser('~/.config/spotify-player/last_bt_device.json')
 
-    def _run_bluetoothctl(self, commands, timeout=10):
-        """Execute bluetoothctl commands via subprocess"""
+    def _run_bluetoothctl(self, commands, timeout=10, cache_ttl=0):
+        """Execute bluetoothctl commands via the command runner (cache_ttl > 0 for read-only commands)"""
         try:
             input_str = '\n'.join(commands) + '\nexit\n'
-            result = subprocess.run(
-                ['bluetoothctl'],
-                input=input_str,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            result = command_runner.run(['bluetoothctl'], input=input_str, timeout=timeout, cache_ttl=cache_ttl)
             return result.stdout, result.stderr, result.returncode
         except subprocess.TimeoutExpired:
             return None, "Timeout", -1
@@ -656,7 +2256,7 @@ class BluetoothManager:
 
     def _get_device_info(self, address):
         """Get detailed info for a specific device"""
-        stdout, _, _ = self._run_bluetoothctl([f'info {address}'], timeout=5)
+        stdout, _, _ = self._run_bluetoothctl([f'info {address}'], timeout=5, cache_ttl=2)
         info = {'address': address}
         if stdout:
             for line in stdout.split('\n'):
@@ -686,11 +2286,11 @@ class BluetoothManager:
 
     def get_bluetooth_codec(self, address):
         """Get the active Bluetooth audio codec for a connected device."""
+        if audio_sink_model.ready:
+            return audio_sink_model.get_codec(address)
+
         try:
-            result = subprocess.run(
-                ['pactl', 'list', 'sinks'],
-                capture_output=True, text=True, timeout=5
-            )
+            result = command_runner.run(['pactl', 'list', 'sinks'], timeout=5, cache_ttl=2)
             if result.returncode != 0:
                 return None
 
@@ -720,7 +2320,7 @@ class BluetoothManager:
 
     def get_paired_devices(self):
         """Get list of paired Bluetooth devices"""
-        stdout, stderr, rc = self._run_bluetoothctl(['devices Paired'], timeout=5)
+        stdout, stderr, rc = self._run_bluetoothctl(['devices Paired'], timeout=5, cache_ttl=2)
         if rc != 0 or not stdout:
             print(f"[BT] Error getting paired devices: {stderr}")
             return []
@@ -754,7 +2354,7 @@ class BluetoothManager:
 
     def get_discovered_devices(self):
         """Get list of discovered (not paired) devices"""
-        stdout, _, _ = self._run_bluetoothctl(['devices'], timeout=5)
+        stdout, _, _ = self._run_bluetoothctl(['devices'], timeout=5, cache_ttl=2)
         all_addrs = self._parse_devices(stdout) if stdout else {}
 
         # Get paired addresses to exclude
@@ -815,7 +2415,7 @@ class BluetoothManager:
             finally:
                 self._scanning = False
                 # Ensure scan is stopped
-                subprocess.run(['bluetoothctl', 'scan', 'off'], capture_output=True, timeout=3)
+                command_runner.run(['bluetoothctl', 'scan', 'off'], timeout=3)
 
         self._scan_thread = Thread(target=scan_thread, daemon=True)
         self._scan_thread.start()
@@ -874,7 +2474,7 @@ class BluetoothManager:
         finally:
             # Stop the scan
             scan_proc.terminate()
-            subprocess.run(['bluetoothctl', 'scan', 'off'], capture_output=True, timeout=3)
+            command_runner.run(['bluetoothctl', 'scan', 'off'], timeout=3)
 
     def _pair_device_pexpect(self, address, pin=None):
         """Pairing with pexpect for PIN handling"""
@@ -959,20 +2559,16 @@ class BluetoothManager:
         finally:
             # Stop the scan
             scan_proc.terminate()
-            subprocess.run(['bluetoothctl', 'scan', 'off'], capture_output=True, timeout=3)
+            command_runner.run(['bluetoothctl', 'scan', 'off'], timeout=3)
 
     def connect_device(self, address):
         """Connect to a paired Bluetooth device"""
         try:
             # Use direct command execution instead of stdin pipe
             # This waits for the connection to complete
-            result = subprocess.run(
-                ['bluetoothctl', 'connect', address],
-                capture_output=True,
-                text=True,
-                timeout=15
-            )
+            result = command_runner.run(['bluetoothctl', 'connect', address], timeout=15)
             stdout = result.stdout + result.stderr
+            command_runner.invalidate('pactl')  # a Bluetooth sink may have appeared
 
             if 'Connection successful' in stdout or 'Already connected' in stdout:
                 self._save_last_device(address)
@@ -1111,7 +2707,7 @@ class BluetoothManager:
     def get_power_state(self):
         """Check if Bluetooth adapter is powered on"""
         try:
-            stdout, _, rc = self._run_bluetoothctl(['show'], timeout=5)
+            stdout, _, rc = self._run_bluetoothctl(['show'], timeout=5, cache_ttl=2)
             if stdout:
                 for line in stdout.split('\n'):
                     if 'Powered:' in line:
@@ -1121,27 +2717,952 @@ class BluetoothManager:
             print(f"[BT] Error getting power state: {e}")
             return False
 
-    def set_power_state(self, state):
-        """Turn Bluetooth adapter on or off"""
-        try:
-            cmd = 'power on' if state else 'power off'
-            stdout, stderr, rc = self._run_bluetoothctl([cmd], timeout=10)
-            # Verify the change
-            return self.get_power_state() == state
-        except Exception as e:
-            print(f"[BT] Error setting power state: {e}")
-            return False
+    def set_power_state(self, state):
+        """Turn Bluetooth adapter on or off"""
+        try:
+            cmd = 'power on' if state else 'power off'
+            stdout, stderr, rc = self._run_bluetoothctl([cmd], timeout=10)
+            # Verify the change
+            return self.get_power_state() == state
+        except Exception as e:
+            print(f"[BT] Error setting power state: {e}")
+            return False
+
+
+# Global Bluetooth manager instance
+bluetooth_manager = BluetoothManager()
+
+
+def auto_reconnect_bluetooth_background():
+    """Background thread to auto-reconnect Bluetooth on startup"""
+    time.sleep(5)  # Wait for app startup
+    print("[BT] Starting auto-reconnect check...")
+    bluetooth_manager.auto_reconnect()
+
+
+# =============================================================================
+# Artwork Proxy Cache
+# =============================================================================
+
+# Only Spotify's image CDNs may be fetched through the proxy
+ARTWORK_HOST_SUFFIXES = ('.scdn.co', '.spotifycdn.com')
+ARTWORK_MAX_AGE = 365 * 24 * 60 * 60  # Spotify image URLs are content-addressed
+ARTWORK_MAX_IMAGE_BYTES = 5 * 1024 * 1024
+ARTWORK_MTIME_RESOLUTION = 3600  # LRU order on disk only needs to be roughly right
+
+
+def is_artwork_url(url):
+    """Check if a URL points to one of Spotify's image CDNs"""
+    if not url:
+        return False
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+    except ValueError:
+        return False
+    if parts.scheme != 'https' or not host:
+        return False
+    return any(host.endswith(suffix) for suffix in ARTWORK_HOST_SUFFIXES)
+
+
+def encode_artwork_key(url):
+    """Encode a CDN image URL into a URL-safe proxy key"""
+    return base64.urlsafe_b64encode(url.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_artwork_key(key):
+    """Decode a proxy key back into the CDN image URL (None if invalid)"""
+    try:
+        padded = key + '=' * (-len(key) % 4)
+        return base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+    except Exception:
+        return None
+
+
+def proxy_image_url(url):
+    """Rewrite a Spotify CDN image URL to the local /api/image proxy"""
+    if not is_artwork_url(url):
+        return url
+    return f'/api/image/{encode_artwork_key(url)}'
+
+
+def image_variants(images):
+    """Build the list of available artwork sizes, smallest first.
+
+    Spotify returns images largest first (640/300/64px for albums). Exposing
+    every size lets the frontend pick the right one per view via srcset.
+    """
+    variants = [
+        {
+            'url': proxy_image_url(image['url']),
+            'width': image.get('width'),
+            'height': image.get('height')
+        }
+        for image in (images or [])
+        if image.get('url')
+    ]
+    return sorted(variants, key=lambda v: v['width'] or 0)
+
+
+def sniff_image_mimetype(path):
+    """Detect image type from the first bytes of a cached file"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(12)
+    except OSError:
+        return 'application/octet-stream'
+    if header.startswith(b'\xff\xd8'):
+        return 'image/jpeg'
+    if header.startswith(b'\x89PNG'):
+        return 'image/png'
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'image/webp'
+    if header[:3] == b'GIF':
+        return 'image/gif'
+    return 'application/octet-stream'
+
+
+class ImageCache:
+    """Size-bounded on-disk LRU cache for Spotify artwork.
+
+    Files are named after the SHA1 of their CDN URL. Recency is tracked in
+    memory and mirrored to the file mtime, so the LRU order survives restarts.
+    The mtime is only rewritten once per ARTWORK_MTIME_RESOLUTION, so viewing
+    artwork does not cost an SD card write per image.
+
+    Listeners (see add_listener) hear about downloaded and evicted images,
+    outside the cache lock.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        self._lock = Lock()
+        self._entries = OrderedDict()  # filename -> size, oldest first
+        self._mtimes = {}  # filename -> mtime last written to disk
+        self._total_bytes = 0
+        self._loaded = False
+        self._inflight = {}  # filename -> Event for downloads in progress
+        self._listeners = []
+        self._session = requests.Session()
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir
+
+    def filename_for(self, url):
+        """Cache file name of an image URL"""
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def add_listener(self, listener):
+        """Register an object with image_stored(url, path) and images_evicted(filenames)"""
+        self._listeners.append(listener)
+
+    def _notify_evicted(self, filenames):
+        if not filenames:
+            return
+        for listener in self._listeners:
+            try:
+                listener.images_evicted(filenames)
+            except Exception as e:
+                print(f"[Artwork] Eviction listener failed: {e}")
+
+    def _path(self, filename):
+        return os.path.join(self._cache_dir, filename)
+
+    def _ensure_loaded(self):
+        """Build the LRU index from disk on first use (caller holds lock)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            files = []
+            for entry in os.scandir(self._cache_dir):
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name, stat.st_size))
+            for mtime, name, size in sorted(files):
+                self._entries[name] = size
+                self._mtimes[name] = mtime
+                self._total_bytes += size
+            print(f"[Artwork] Cache loaded: {len(self._entries)} images, {self._total_bytes // 1024} KB")
+        except Exception as e:
+            print(f"[Artwork] Error loading cache index: {e}")
+
+    def _touch(self, filename):
+        """Mark an entry as most recently used (caller holds lock)"""
+        self._entries.move_to_end(filename)
+        now = time.time()
+        if now - self._mtimes.get(filename, 0) < ARTWORK_MTIME_RESOLUTION:
+            return
+        self._mtimes[filename] = now
+        try:
+            os.utime(self._path(filename), (now, now))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Remove least recently used images until under the size limit (caller holds lock).
+
+        Returns the evicted file names.
+        """
+        evicted = []
+        while self._total_bytes > self._max_bytes and len(self._entries) > 1:
+            filename, size = self._entries.popitem(last=False)
+            self._mtimes.pop(filename, None)
+            self._total_bytes -= size
+            evicted.append(filename)
+            try:
+                os.remove(self._path(filename))
+            except OSError:
+                pass
+        return evicted
+
+    def get_cached_path(self, url):
+        """Return the local path for a cached image, or None"""
+        filename = self.filename_for(url)
+        with self._lock:
+            self._ensure_loaded()
+            if filename not in self._entries:
+                return None
+            missing = not os.path.exists(self._path(filename))
+            if missing:
+                self._total_bytes -= self._entries.pop(filename)
+                self._mtimes.pop(filename, None)
+            else:
+                self._touch(filename)
+                return self._path(filename)
+        self._notify_evicted([filename])
+        return None
+
+    def _download(self, url, filename):
+        """Fetch an image from the CDN and store it atomically"""
+        path = self._path(filename)
+        tmp_path = path + '.tmp'
+        size = 0
+        with self._session.get(url, timeout=10, stream=True, allow_redirects=False) as response:
+            if response.status_code != 200:
+                print(f"[Artwork] CDN returned {response.status_code} for {url}")
+                return None
+            try:
+                with open(tmp_path, 'wb') as f:
+                    # Stop reading as soon as the image is too large
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        size += len(chunk)
+                        if size > ARTWORK_MAX_IMAGE_BYTES:
+                            break
+                        f.write(chunk)
+                if not size or size > ARTWORK_MAX_IMAGE_BYTES:
+                    os.remove(tmp_path)
+                    return None
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+        with self._lock:
+            if filename in self._entries:
+                self._total_bytes -= self._entries[filename]
+            self._entries[filename] = size
+            self._mtimes[filename] = time.time()  # just written
+            self._total_bytes += size
+            self._touch(filename)
+            evicted = self._evict()
+
+        self._notify_evicted(evicted)
+        for listener in self._listeners:
+            try:
+                listener.image_stored(url, path)
+            except Exception as e:
+                print(f"[Artwork] Store listener failed: {e}")
+        return path
+
+    def get_or_fetch(self, url):
+        """Return the local path for an image, downloading it on a cache miss.
+
+        Concurrent requests for the same image share a single download.
+        """
+        path = self.get_cached_path(url)
+        if path:
+            return path
+
+        filename = self.filename_for(url)
+        with self._lock:
+            pending = self._inflight.get(filename)
+            if pending is None:
+                self._inflight[filename] = Event()
+
+        if pending is not None:
+            pending.wait(timeout=15)
+            return self.get_cached_path(url)
+
+        try:
+            return self._download(url, filename)
+        except Exception as e:
+            print(f"[Artwork] Failed to fetch {url}: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._inflight.pop(filename).set()
+
+
+# Global artwork cache instance
+image_cache = ImageCache(
+    os.path.expanduser(os.getenv('IMAGE_CACHE_DIR', '~/.cache/spotify-player/artwork')),
+    int(os.getenv('IMAGE_CACHE_MAX_MB', '200')) * 1024 * 1024
+)
+
+
+class PlaceholderStore:
+    """Dominant-colour placeholders for artwork, computed in the background.
+
+    Colours are keyed by CDN URL and persisted to disk, so the first paint
+    after a reboot can show coloured tiles before any image bytes arrive.
+    Only images already in the artwork cache are read: a colour for an image
+    that is not cached yet is computed once something downloads it, and is
+    dropped again when the cache evicts the file.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = Lock()
+        self._colors = None  # url -> '#rrggbb', loaded lazily
+        self._queued = set()  # queued or being computed
+        self._waiting = set()  # not cached yet, computed once downloaded
+        self._queue = queue.Queue()
+        self._worker = None
+        self._dirty = False
+
+    def _ensure_loaded(self):
+        """Load persisted placeholders on first use (caller holds lock)"""
+        if self._colors is not None:
+            return
+        self._colors = {}
+        try:
+            if os.path.exists(self._path):
+                with open(self._path, 'r') as f:
+                    self._colors = json.load(f)
+        except Exception as e:
+            print(f"[Artwork] Error loading placeholders: {e}")
+
+    def get(self, url):
+        """Return the placeholder colour for an image, scheduling it if unknown"""
+        if not PIL_AVAILABLE or not is_artwork_url(url):
+            return None
+        with self._lock:
+            self._ensure_loaded()
+            color = self._colors.get(url)
+            if color or url in self._queued or url in self._waiting:
+                return color
+            self._schedule(url)
+        return None
+
+    def image_stored(self, url, path):
+        """ImageCache listener: an image was downloaded, compute its colour now"""
+        if not PIL_AVAILABLE or not is_artwork_url(url):
+            return
+        with self._lock:
+            self._ensure_loaded()
+            if url in self._colors or url in self._queued:
+                return
+            self._waiting.discard(url)
+            self._schedule(url)
+
+    def images_evicted(self, filenames):
+        """ImageCache listener: forget the colours of evicted images"""
+        filenames = set(filenames)
+        with self._lock:
+            self._ensure_loaded()
+            evicted = [url for url in self._colors if image_cache.filename_for(url) in filenames]
+            for url in evicted:
+                del self._colors[url]
+            if evicted:
+                self._dirty = True
+        if evicted:
+            self._save()
+
+    def _schedule(self, url):
+        """Queue a URL for the worker (caller holds lock)"""
+        self._queued.add(url)
+        # Queued under the lock: the worker decides to exit under it too
+        self._queue.put(url)
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = Thread(target=self._run, daemon=True)
+            self._worker.start()
+
+    def _compute(self, path):
+        """Average a cached artwork file down to a single colour"""
+        with Image.open(path) as img:
+            r, g, b = img.convert('RGB').resize((1, 1), Image.BOX).getpixel((0, 0))
+        return f'#{r:02x}{g:02x}{b:02x}'
+
+    def _save(self):
+        """Persist placeholders atomically"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self._colors)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp_path = self._path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._path)
+        except Exception as e:
+            print(f"[Artwork] Error saving placeholders: {e}")
+
+    def _run(self):
+        """Worker: compute queued placeholders, save once the queue drains"""
+        while True:
+            try:
+                url = self._queue.get(timeout=30)
+            except queue.Empty:
+                with self._lock:
+                    if not self._queue.empty():
+                        continue  # get() queued a URL just now
+                    self._worker = None
+                return
+            with self._lock:
+                # Checked under the lock, so image_stored either sees the URL
+                # waiting or the worker sees the image cached
+                path = image_cache.get_cached_path(url)
+                if not path:
+                    self._queued.discard(url)
+                    self._waiting.add(url)
+            if not path:
+                if self._queue.empty():
+                    self._save()
+                continue
+            try:
+                color = self._compute(path)
+            except Exception as e:
+                print(f"[Artwork] Placeholder failed for {url}: {e}")
+                color = None
+            with self._lock:
+                self._queued.discard(url)
+                if color:
+                    self._colors[url] = color
+                    self._dirty = True
+            if self._queue.empty():
+                self._save()
+
+
+def artwork_placeholder(images):
+    """Placeholder colour for an artwork list, based on its smallest rendition"""
+    if not images:
+        return None
+    smallest = min(images, key=lambda image: image.get('width') or 0)
+    return placeholder_store.get(smallest.get('url'))
+
+
+# Global placeholder store, kept next to the artwork cache
+placeholder_store = PlaceholderStore(
+    os.path.join(os.path.dirname(image_cache.cache_dir), 'placeholders.json')
+)
+image_cache.add_listener(placeholder_store)
+
+
+# =============================================================================
+# Static Asset Pipeline
+# =============================================================================
+
+# Static files (relative to static/) that are fingerprinted and precompressed
+FINGERPRINTED_ASSETS = ['css/styles.css', 'js/i18n.js', 'js/app.js']
+ASSET_DIST_DIR = os.path.join(app.static_folder, 'dist')
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+
+_asset_manifest = None  # 'js/app.js' -> 'js/app.<hash>.js'
+_asset_lock = Lock()
+
+
+def _write_if_missing(path, data):
+    """Write a build output atomically, skipping files that already exist"""
+    if os.path.exists(path):
+        return
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_assets():
+    """Content-hash static assets into static/dist with .gz/.br variants.
+
+    Outputs are keyed by content hash, so unchanged files are not rebuilt and
+    outputs of older versions are removed.
+    """
+    global _asset_manifest
+    with _asset_lock:
+        manifest = {}
+        outputs = set()
+        for rel_path in FINGERPRINTED_ASSETS:
+            src_path = os.path.join(app.static_folder, rel_path)
+            try:
+                with open(src_path, 'rb') as f:
+                    content = f.read()
+            except OSError as e:
+                print(f"[Assets] Skipping {rel_path}: {e}")
+                continue
+
+            base, ext = os.path.splitext(rel_path)
+            hashed = f"{base}.{hashlib.sha1(content).hexdigest()[:10]}{ext}"
+            out_path = os.path.join(ASSET_DIST_DIR, hashed)
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+
+            _write_if_missing(out_path, content)
+            _write_if_missing(out_path + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+            outputs.update({hashed, hashed + '.gz'})
+            if BROTLI_AVAILABLE:
+                _write_if_missing(out_path + '.br', brotli.compress(content))
+                outputs.add(hashed + '.br')
+
+            manifest[rel_path] = hashed
+
+        # Remove outputs of previous builds
+        for root, _, files in os.walk(ASSET_DIST_DIR):
+            for name in files:
+                rel = os.path.relpath(os.path.join(root, name), ASSET_DIST_DIR).replace(os.sep, '/')
+                if rel not in outputs:
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        pass
+
+        _asset_manifest = manifest
+        print(f"[Assets] Built {len(manifest)} assets (brotli: {BROTLI_AVAILABLE})")
+        return manifest
+
+
+def get_asset_manifest():
+    """Return the asset manifest, building it on first use"""
+    if _asset_manifest is None:
+        try:
+            build_assets()
+        except Exception as e:
+            print(f"[Assets] Build failed, serving plain static files: {e}")
+            return {}
+    return _asset_manifest
+
+
+@app.template_global()
+def asset_url(filename):
+    """Fingerprinted URL for a static asset (falls back to /static)"""
+    hashed = get_asset_manifest().get(filename)
+    if hashed:
+        return f'/assets/{hashed}'
+    return url_for('static', filename=filename)
+
+
+# =============================================================================
+# Activity Governor
+# =============================================================================
+
+class ActivityGovernor:
+    """Scales background poll intervals by the activity the UI clients report.
+
+    Every client (kiosk, phones) posts its level (active, idle, deep-idle,
+    hidden) to /api/activity. Reports are kept per client and expire after
+    CLIENT_TTL; the most active live client decides, so a phone in a pocket
+    cannot slow down the kiosk that is being used. Background pollers call
+    interval()/wait() instead of a fixed time.sleep(), so they slow down
+    overnight and wake up on touch.
+    """
+
+    # Shared with the frontend poll governor (sent along in the initial state)
+    LEVEL_FACTORS = {'active': 1, 'idle': 6, 'idle-playing': 3, 'deep-idle': 60, 'hidden': 60}
+    LEVELS = ('active', 'idle', 'deep-idle', 'hidden')  # most active first
+    CLIENT_TTL = 300  # clients re-report every 2 minutes
+    DEFAULT_MAX_INTERVAL = 300
+
+    def __init__(self):
+        self._cond = Condition()
+        self._clients = {}  # client id -> {'level', 'playing', 'updated'}
+        self._level = 'active'  # no (live) clients yet: don't throttle
+        self._playing = False
+        self._wake_generation = 0
+        self._wake_events = []  # Events of pollers that wait on their own Event
+
+    def _recompute(self):
+        """Effective level/playing from the live clients (caller holds lock)"""
+        cutoff = time.time() - self.CLIENT_TTL
+        for client in [c for c, r in self._clients.items() if r['updated'] < cutoff]:
+            del self._clients[client]
+
+        previous = self._level
+        live = list(self._clients.values())
+        self._level = min((r['level'] for r in live), key=self.LEVELS.index) if live else 'active'
+        self._playing = any(r['playing'] for r in live)
+        if self._level == 'active' and previous != 'active':
+            self._wake_generation += 1
+            self._cond.notify_all()
+            for event in self._wake_events:
+                event.set()
+        return previous
+
+    def report(self, client, level, playing):
+        """Record a client's UI level; waiting pollers wake up when the result becomes active"""
+        with self._cond:
+            self._clients[client] = {'level': level, 'playing': playing, 'updated': time.time()}
+            previous = self._recompute()
+            level = self._level
+        if level != previous:
+            print(f"[Activity] UI level: {previous} -> {level} (playing: {playing})")
+
+    def add_wake_event(self, event):
+        """Also set `event` when the UI becomes active (for pollers that wait on it)"""
+        with self._cond:
+            if event not in self._wake_events:
+                self._wake_events.append(event)
+
+    def get_status(self):
+        with self._cond:
+            self._recompute()
+            return {'level': self._level, 'playing': self._playing, 'clients': len(self._clients)}
+
+    def interval(self, base, max_interval=DEFAULT_MAX_INTERVAL):
+        """Governed interval (seconds) for a poller with the given base interval"""
+        with self._cond:
+            self._recompute()
+            level = self._level
+            # Keep now-playing related polling reasonably fresh while music plays
+            if self._playing and level == 'idle':
+                level = 'idle-playing'
+        return min(base * self.LEVEL_FACTORS.get(level, 1), max(max_interval, base))
+
+    def wait(self, base, max_interval=DEFAULT_MAX_INTERVAL):
+        """Sleep for the governed interval; returns early when the UI becomes active.
+
+        Returns:
+            True if woken by UI activity, False on timeout
+        """
+        timeout = self.interval(base, max_interval)
+        with self._cond:
+            generation = self._wake_generation
+            return self._cond.wait_for(lambda: self._wake_generation != generation, timeout=timeout)
+
+
+# Global activity governor instance
+activity_governor = ActivityGovernor()
+
+
+# =============================================================================
+# Initial State (index.html hydration)
+# =============================================================================
+
+LIBRARY_SNAPSHOT_MAX_ENTRIES = 20  # playlists + artists + recent track lists, per process
+CURRENT_TRACK_SNAPSHOT_MAX_AGE = 60
+
+_library_snapshots = OrderedDict()  # (user_id, key) -> data, oldest first
+_library_snapshots_lock = Lock()
+
+
+def remember_library(key, data):
+    """Keep the last library response in memory for embedding into index.html"""
+    cache_key = (session.get('user_id', 'default'), key)
+    with _library_snapshots_lock:
+        _library_snapshots[cache_key] = data
+        _library_snapshots.move_to_end(cache_key)
+        while len(_library_snapshots) > LIBRARY_SNAPSHOT_MAX_ENTRIES:
+            _library_snapshots.popitem(last=False)
+
+
+def get_library_snapshot(key):
+    """Return the remembered library response for the current user, or None"""
+    with _library_snapshots_lock:
+        return _library_snapshots.get((session.get('user_id', 'default'), key))
+
+
+def build_initial_state():
+    """Snapshot of the in-memory caches, embedded into index.html.
+
+    Lets app.js render the library, now-playing and volume on first paint
+    without follow-up API calls. Only already-cached data is used, so
+    rendering the page never waits on Spotify or pactl.
+    """
+    # The service worker may serve this page from cache: the client uses
+    # generated_at to ignore now-playing and volume once they are old
+    state = {
+        'language': get_user_language(),
+        'generated_at': int(time.time() * 1000),
+        'poll_factors': ActivityGovernor.LEVEL_FACTORS
+    }
+
+    playlists = get_library_snapshot('playlists')
+    if playlists is not None:
+        state['playlists'] = playlists
+    artists = get_library_snapshot('artists')
+    if artists is not None:
+        state['artists'] = artists
+
+    # Tracks for the playlist that will be shown first (from the URL, else the first one)
+    playlist_id = request.args.get('playlist') or (playlists[0]['id'] if playlists else None)
+    if playlist_id:
+        tracks = get_library_snapshot(('tracks', playlist_id))
+        if tracks is not None:
+            state['tracks'] = {playlist_id: tracks}
+
+    age = time.time() - _cached_current_track_time
+    if _cached_current_track is not None and age < CURRENT_TRACK_SNAPSHOT_MAX_AGE:
+        current = json.loads(json.dumps(_cached_current_track))
+        track = current.get('track')
+        if track and current.get('playing'):
+            # Advance progress to "now" so the progress bar doesn't jump back
+            progress = track.get('progress_ms', 0) + int(age * 1000)
+            track['progress_ms'] = min(progress, track.get('duration_ms') or progress)
+        state['current'] = current
+
+    volume_settings = get_volume_settings()
+    state['volume_settings'] = volume_settings
+    if _cached_system_volume is not None:
+        state['volume'] = volume_to_slider(_cached_system_volume, volume_settings['max_volume'])
+
+    return state
+
+
+# =============================================================================
+# Settings Store
+# =============================================================================
+
+class SettingsStore:
+    """settings.json kept in memory.
+
+    Loaded once; reads only stat() the file every CHECK_INTERVAL seconds to
+    pick up edits from outside the app (mtime change). Updates apply in memory
+    immediately and are written atomically by a write-behind thread.
+    """
+
+    CHECK_INTERVAL = 2
+    WRITE_DELAY = 0.5  # coalesce slider drags into one write
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = Lock()
+        self._data = {}
+        self._mtime = None
+        self._last_check = 0
+        self._dirty = False
+        self._write_event = Event()
+        self._writer = None
+        self._reload()
+
+    def _reload(self):
+        """(Re)load from disk (caller holds lock or is __init__)"""
+        try:
+            mtime = os.path.getmtime(self._path)
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            try:
+                if mtime is not None:
+                    with open(self._path, 'r') as f:
+                        self._data = json.load(f)
+                else:
+                    self._data = {}
+            except Exception as e:
+                print(f"[Settings] Error reading settings: {e}")
+            self._mtime = mtime
+        self._last_check = time.time()
+
+    def _check(self):
+        """Pick up external edits (caller holds lock)"""
+        if not self._dirty and time.time() - self._last_check > self.CHECK_INTERVAL:
+            self._reload()
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._check()
+            return self._data.get(key, default)
+
+    def update(self, **values):
+        """Apply values now; persisted shortly after by the writer thread"""
+        with self._lock:
+            self._check()
+            self._data.update(values)
+            self._dirty = True
+            if not self._writer or not self._writer.is_alive():
+                self._writer = Thread(target=self._write_loop, daemon=True)
+                self._writer.start()
+        self._write_event.set()
+
+    def _write_loop(self):
+        while True:
+            self._write_event.wait()
+            time.sleep(self.WRITE_DELAY)
+            self._write_event.clear()
+            self.flush()
+
+    def flush(self):
+        """Write pending changes atomically"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                tmp_path = self._path + '.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._data, f)
+                os.replace(tmp_path, self._path)
+                self._mtime = os.path.getmtime(self._path)
+                self._dirty = False
+            except Exception as e:
+                print(f"[Settings] Error saving settings: {e}")
+
+
+# Global settings store instance
+settings_store = SettingsStore(os.path.expanduser('~/.config/spotify-player/settings.json'))
+
+
+# =============================================================================
+# Background Jobs
+# =============================================================================
+
+class JobManager:
+    """Runs slow operations (activation, pairing, updates) on a bounded pool.
 
+    Endpoints return a job id straight away; progress and the final result
+    (payload + HTTP status) are available via /api/jobs/<id> or its event
+    stream, so these operations never hold a Flask request thread.
+    """
 
-# Global Bluetooth manager instance
-bluetooth_manager = BluetoothManager()
+    MAX_WORKERS = 3
+    JOB_TTL = 900  # keep finished jobs this long (seconds)
 
+    def __init__(self):
+        self._lock = Lock()
+        self._cond = Condition(self._lock)
+        self._jobs = {}   # job id -> job dict
+        self._active = {}  # dedupe key -> job id
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix='job')
+        self._local = threading_local()
+
+    @property
+    def language(self):
+        """Language of the request that submitted the running job (None outside jobs)"""
+        return getattr(self._local, 'language', None)
+
+    def submit(self, kind, fn, *args, dedupe_key=None):
+        """Queue fn(report, *args), which returns (payload, http_status).
+
+        report(progress, message, **data) updates the progress, the status
+        text and named fields in the job's `data`. A job with the same
+        dedupe_key that is still queued/running is reused.
+        """
+        language = get_user_language()
+        with self._lock:
+            self._prune()
+            if dedupe_key and dedupe_key in self._active:
+                return self._snapshot(self._jobs[self._active[dedupe_key]])
+
+            job_id = base64.urlsafe_b64encode(os.urandom(9)).decode()
+            job = {
+                'id': job_id,
+                'kind': kind,
+                'state': 'queued',
+                'progress': 0,
+                'message': None,
+                'data': {},
+                'result': None,
+                'http_status': None,
+                'created_at': time.time(),
+                'finished_at': None,
+                'version': 0,
+                'dedupe_key': dedupe_key
+            }
+            self._jobs[job_id] = job
+            if dedupe_key:
+                self._active[dedupe_key] = job_id
+            snapshot = self._snapshot(job)
+
+        self._executor.submit(self._run, job_id, fn, args, language)
+        return snapshot
+
+    def _run(self, job_id, fn, args, language):
+        self._local.language = language
+        self._update(job_id, state='running')
+
+        def report(progress=None, message=None, **data):
+            fields = {}
+            if progress is not None:
+                fields['progress'] = progress
+            if message is not None:
+                fields['message'] = message
+            if data:
+                fields['data'] = data
+            self._update(job_id, **fields)
 
-def auto_reconnect_bluetooth_background():
-    """Background thread to auto-reconnect Bluetooth on startup"""
-    time.sleep(5)  # Wait for app startup
-    print("[BT] Starting auto-reconnect check...")
-    bluetooth_manager.auto_reconnect()
+        try:
+            with app.app_context():
+                payload, http_status = fn(report, *args)
+            state = 'done' if http_status < 400 else 'failed'
+        except Exception as e:
+            print(f"[Jobs] {job_id} failed: {e}")
+            payload, http_status, state = {'error': str(e)}, 500, 'failed'
+        finally:
+            self._local.language = None
+
+        self._update(job_id, state=state, progress=100, result=payload,
+                     http_status=http_status, finished_at=time.time())
+
+    def _update(self, job_id, **fields):
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if not job:
+                return
+            if 'data' in fields:
+                fields['data'] = {**job['data'], **fields['data']}
+            job.update(fields)
+            job['version'] += 1
+            if job['state'] in ('done', 'failed') and job['dedupe_key']:
+                self._active.pop(job['dedupe_key'], None)
+            self._cond.notify_all()
+
+    @staticmethod
+    def _snapshot(job):
+        return {k: v for k, v in job.items() if k != 'dedupe_key'}
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def find_active(self, key_prefix):
+        """{dedupe_key: snapshot} of queued/running jobs whose dedupe key starts with key_prefix"""
+        with self._lock:
+            return {key: self._snapshot(self._jobs[job_id])
+                    for key, job_id in self._active.items() if key.startswith(key_prefix)}
+
+    def wait_for_change(self, job_id, version, timeout):
+        """Block until the job's version moves past `version` (for the event stream)"""
+        with self._cond:
+            self._cond.wait_for(lambda: job_id not in self._jobs or self._jobs[job_id]['version'] != version,
+                                timeout=timeout)
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def _prune(self):
+        """Drop finished jobs after JOB_TTL (caller holds lock)"""
+        cutoff = time.time() - self.JOB_TTL
+        for job_id in [j for j, job in self._jobs.items() if job['finished_at'] and job['finished_at'] < cutoff]:
+            del self._jobs[job_id]
+
+
+# Global job manager instance
+job_manager = JobManager()
+
+
+def job_accepted(job):
+    """202 response pointing the client at a submitted job"""
+    return jsonify({
+        'job_id': job['id'],
+        'state': job['state'],
+        'status_url': f"/api/jobs/{job['id']}",
+        'events_url': f"/api/jobs/{job['id']}/events"
+    }), 202
 
 
 # Routes
@@ -1152,16 +3673,17 @@ def index():
         return render_template('setup.html')
 
     # Try to restore session from cache if needed
-    if not session.get('token_info'):
-        if not restore_session_from_cache():
-            # Show friendly login page instead of redirecting to external Spotify
-            return render_template('login_required.html')
-
-    # Create response with no-cache headers to prevent browser caching
-    response = make_response(render_template('index.html'))
-    response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
+    if not restore_session_from_cache():
+        # Show friendly login page instead of redirecting to external Spotify
+        return render_template('login_required.html')
+
+    # Always revalidate the page itself; the fingerprinted assets it references are immutable
+    response = make_response(render_template('index.html', initial_state=build_initial_state()))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.add_etag()
+    response.make_conditional(request)
+    # Tells the service worker this is the player itself (not setup/login) and may be cached
+    response.headers['X-App-Shell'] = '1'
 
     return response
 
@@ -1185,7 +3707,6 @@ def callback():
 
     if code:
         token_info = sp_oauth.get_access_token(code)
-        session['token_info'] = token_info
 
         # Get user ID for cache
         sp = spotipy.Spotify(auth=token_info['access_token'])
@@ -1206,6 +3727,9 @@ def callback():
             except Exception as e:
                 print(f"Error moving cache file: {e}")
 
+        # Shared with every other client that logs in to this player
+        token_store.set(user_id, token_info)
+
         return redirect('/')
 
     return "Error: No code provided", 400
@@ -1224,6 +3748,7 @@ def logout():
             print(f"Deleted cache file: {cache_file}")
         except Exception as e:
             print(f"Error deleting cache file {cache_file}: {e}")
+    token_store.discard()
 
     # Optional: invalidate Spotipy in-memory cache
     try:
@@ -1254,6 +3779,8 @@ def logout():
     response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
     response.headers['Pragma'] = 'no-cache'
     response.headers['Expires'] = '0'
+    # Drop the service worker and its cached app shell/library data of the old account
+    response.headers['Clear-Site-Data'] = '"cache", "storage"'
 
     return response
 
@@ -1271,6 +3798,156 @@ def health_check():
     return response
 
 
+# App shell files; a change to any of them produces a new service worker version
+APP_SHELL_FILES = [
+    'templates/index.html',
+    'static/css/styles.css',
+    'static/js/i18n.js',
+    'static/js/app.js',
+    'static/img/placeholder.svg',
+    'static/js/sw.js',
+]
+_app_shell_version = None
+
+
+def get_app_shell_version():
+    """Short content hash of the app shell, computed once per process"""
+    global _app_shell_version
+    if _app_shell_version is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        digest = hashlib.sha1()
+        for rel_path in APP_SHELL_FILES:
+            try:
+                with open(os.path.join(base_dir, rel_path), 'rb') as f:
+                    digest.update(f.read())
+            except OSError:
+                pass
+        _app_shell_version = digest.hexdigest()[:12]
+    return _app_shell_version
+
+
+@app.route('/api/activity', methods=['GET', 'POST'])
+def ui_activity():
+    """Get or report the UI activity level used to throttle background polling"""
+    if request.method == 'GET':
+        return jsonify(activity_governor.get_status())
+
+    data = request.get_json(silent=True) or {}
+    level = data.get('level')
+    if level not in ActivityGovernor.LEVELS:
+        return jsonify({'error': 'Invalid level'}), 400
+    playing = data.get('playing', False)
+    if not isinstance(playing, bool):
+        return jsonify({'error': 'Invalid playing'}), 400
+
+    # Per device: each kiosk/phone browser has its own address on the LAN
+    activity_governor.report(request.remote_addr, level, playing)
+    return jsonify({'success': True})
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """State, progress and (when finished) result of a background job"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+
+# A stream holds a server worker thread: close it after this window and let
+# the client reconnect (EventSource does so automatically) or poll instead
+JOB_EVENTS_WINDOW = 20
+
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-sent events with job updates for up to JOB_EVENTS_WINDOW seconds"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def stream(job):
+        deadline = time.time() + JOB_EVENTS_WINDOW
+        yield f"retry: 1000\ndata: {json.dumps(job)}\n\n"
+        while job['state'] not in ('done', 'failed'):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            updated = job_manager.wait_for_change(job_id, job['version'], timeout=remaining)
+            if not updated or updated['version'] == job['version']:
+                return
+            job = updated
+            yield f"data: {json.dumps(job)}\n\n"
+
+    response = app.response_class(stream(job), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@app.route('/sw.js')
+def service_worker():
+    """Serve the service worker from the root so its scope covers the whole app"""
+    with open(os.path.join(app.static_folder, 'js', 'sw.js'), 'r') as f:
+        script = f.read()
+
+    shell_assets = [asset_url(filename) for filename in FINGERPRINTED_ASSETS]
+    shell_assets.append(url_for('static', filename='img/placeholder.svg'))
+    script = script.replace('__APP_SHELL_VERSION__', get_app_shell_version())
+    script = script.replace('__APP_SHELL_ASSETS__', json.dumps(shell_assets))
+
+    response = make_response(script)
+    response.headers['Content-Type'] = 'application/javascript; charset=utf-8'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/assets/<path:filename>')
+def serve_asset(filename):
+    """Serve a fingerprinted asset, precompressed when the client accepts it"""
+    if filename not in get_asset_manifest().values():
+        return jsonify({'error': 'Not found'}), 404
+
+    path = os.path.join(ASSET_DIST_DIR, filename)
+    # Parsed codings with q-values: "br;q=0" or "*;q=0" rules a coding out;
+    # the highest q wins, br before gzip on a tie
+    accepted = request.accept_encodings
+    encoding, encoded_suffix, best_quality = None, '', 0
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        quality = accepted.quality(candidate)
+        if quality > best_quality and os.path.exists(path + suffix):
+            encoding, encoded_suffix, best_quality = candidate, suffix, quality
+    path += encoded_suffix
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=True)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response
+
+
+@app.route('/api/image/<key>')
+def get_artwork(key):
+    """Serve Spotify artwork from the local disk cache.
+
+    The key is the URL-safe encoded CDN URL (see proxy_image_url). Images are
+    fetched once and then served locally with long-lived immutable headers.
+    """
+    url = decode_artwork_key(key)
+    if not is_artwork_url(url):
+        return jsonify({'error': 'Invalid image'}), 400
+
+    path = image_cache.get_or_fetch(url)
+    if not path:
+        return jsonify({'error': 'Image unavailable'}), 502
+
+    response = send_file(path, mimetype=sniff_image_mimetype(path), conditional=True)
+    response.headers['Cache-Control'] = f'public, max-age={ARTWORK_MAX_AGE}, immutable'
+    return response
+
+
 # API Endpoints
 @app.route('/api/playlists')
 def get_playlists():
@@ -1295,7 +3972,9 @@ def get_playlists():
             {
                 'id': p['id'],
                 'name': p['name'],
-                'image': p['images'][0]['url'] if p['images'] else None,
+                'image': proxy_image_url(p['images'][0]['url']) if p['images'] else None,
+                'images': image_variants(p['images']),
+                'placeholder': artwork_placeholder(p['images']),
                 'tracks_total': p['tracks']['total']
             }
             for p in all_playlists
@@ -1317,6 +3996,7 @@ def get_playlists():
         except Exception as e:
             print(f"Debug logging error: {e}")
 
+        remember_library('playlists', items)
         return jsonify(items)
     except Exception as e:
         import traceback
@@ -1352,12 +4032,15 @@ def get_artists():
             {
                 'id': a['id'],
                 'name': a['name'],
-                'image': a['images'][0]['url'] if a['images'] else None
+                'image': proxy_image_url(a['images'][0]['url']) if a['images'] else None,
+                'images': image_variants(a['images']),
+                'placeholder': artwork_placeholder(a['images'])
             }
             for a in all_artists
         ]
 
         print(f"Fetched {len(items)} followed artists")
+        remember_library('artists', items)
         return jsonify(items)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1381,7 +4064,8 @@ def get_artist_top_tracks(artist_id):
                 'artist': ', '.join([artist['name'] for artist in track['artists']]),
                 'album': track['album']['name'],
                 'duration_ms': track['duration_ms'],
-                'image': track['album']['images'][0]['url'] if track['album']['images'] else None
+                'image': proxy_image_url(track['album']['images'][0]['url']) if track['album']['images'] else None,
+                'images': image_variants(track['album']['images'])
             }
             for track in results['tracks']
         ]
@@ -1405,7 +4089,9 @@ def get_artist_albums(artist_id):
                 'id': album['id'],
                 'uri': album['uri'],
                 'name': album['name'],
-                'image': album['images'][0]['url'] if album['images'] else None,
+                'image': proxy_image_url(album['images'][0]['url']) if album['images'] else None,
+                'images': image_variants(album['images']),
+                'placeholder': artwork_placeholder(album['images']),
                 'release_date': album['release_date'],
                 'total_tracks': album['total_tracks']
             }
@@ -1427,7 +4113,9 @@ def get_album_tracks(album_id):
     try:
         # Get album info for artwork
         album_info = sp.album(album_id)
-        album_image = album_info['images'][0]['url'] if album_info['images'] else None
+        album_image = proxy_image_url(album_info['images'][0]['url']) if album_info['images'] else None
+        album_images = image_variants(album_info['images'])
+        album_placeholder = artwork_placeholder(album_info['images'])
         album_uri = album_info['uri']
 
         # Get album tracks
@@ -1443,6 +4131,8 @@ def get_album_tracks(album_id):
                 'album_uri': album_uri,
                 'duration_ms': track['duration_ms'],
                 'image': album_image,
+                'images': album_images,
+                'placeholder': album_placeholder,
                 'track_number': track['track_number'],
                 'release_date': album_info.get('release_date', '')
             }
@@ -1455,13 +4145,22 @@ def get_album_tracks(album_id):
 
 @app.route('/api/playlist/<playlist_id>')
 def get_playlist_tracks(playlist_id):
-    """Get tracks from a specific playlist"""
+    """Get tracks from a specific playlist.
+
+    Without query parameters the first page is returned as a plain list.
+    With ?offset=&limit= a page is returned as {items, total, next_offset},
+    so the frontend can stream long playlists into its virtual list.
+    """
     sp = get_spotify_client()
     if not sp:
         return jsonify({'error': 'Not authenticated'}), 401
 
+    paginated = 'offset' in request.args or 'limit' in request.args
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 100)
+
     try:
-        results = sp.playlist_items(playlist_id)
+        results = sp.playlist_items(playlist_id, limit=limit, offset=offset)
         tracks = [
             {
                 'id': item['track']['id'],
@@ -1470,19 +4169,31 @@ def get_playlist_tracks(playlist_id):
                 'artist': ', '.join([artist['name'] for artist in item['track']['artists']]),
                 'album': item['track']['album']['name'],
                 'duration_ms': item['track']['duration_ms'],
-                'image': item['track']['album']['images'][0]['url'] if item['track']['album']['images'] else None
+                'image': proxy_image_url(item['track']['album']['images'][0]['url']) if item['track']['album']['images'] else None,
+                'images': image_variants(item['track']['album']['images'])
             }
             for item in results['items']
             if item['track']  # Skip None tracks
         ]
-        return jsonify(tracks)
+        # Only complete track lists are embedded into index.html
+        if offset == 0 and not results['next']:
+            remember_library(('tracks', playlist_id), tracks)
+
+        if not paginated:
+            return jsonify(tracks)
+
+        return jsonify({
+            'items': tracks,
+            'total': results['total'],
+            'next_offset': offset + len(results['items']) if results['next'] else None
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/current')
 def get_current_track():
     """Get currently playing track"""
-    global _cached_current_track
+    global _cached_current_track, _cached_current_track_time
 
     # Bij cooldown: return cached data om API niet te overbelasten
     if is_api_in_cooldown() and _cached_current_track is not None:
@@ -1497,6 +4208,7 @@ def get_current_track():
         if not current or not current.get('item'):
             response_data = {'playing': False}
             _cached_current_track = response_data
+            _cached_current_track_time = time.time()
             return jsonify(response_data)
 
         track = current['item']
@@ -1519,12 +4231,14 @@ def get_current_track():
                 'name': track['name'],
                 'artist': ', '.join([artist['name'] for artist in track['artists']]),
                 'album': track['album']['name'],
-                'image': track['album']['images'][0]['url'] if track['album']['images'] else None,
+                'image': proxy_image_url(track['album']['images'][0]['url']) if track['album']['images'] else None,
+                'images': image_variants(track['album']['images']),
                 'duration_ms': duration_ms,
                 'progress_ms': progress_ms
             }
         }
         _cached_current_track = response_data
+        _cached_current_track_time = time.time()
         return jsonify(response_data)
     except spotipy.exceptions.SpotifyException as e:
         msg, status = handle_spotify_error(e)
@@ -1645,13 +4359,7 @@ def get_devices():
         devices_response = sp.devices()
 
         # Filter devices based on SPOTIFY_DEVICE_NAME if set
-        device_name_filter = os.getenv('SPOTIFY_DEVICE_NAME', '').strip()
-        if device_name_filter:
-            filtered_devices = [
-                d for d in devices_response.get('devices', [])
-                if device_name_filter.lower() in d['name'].lower()
-            ]
-            devices_response['devices'] = filtered_devices
+        devices_response['devices'] = filter_allowed_devices(devices_response.get('devices', []))
 
         return jsonify(devices_response)
     except spotipy.exceptions.SpotifyException as e:
@@ -1661,6 +4369,23 @@ def get_devices():
         print(f"[Unexpected Error] /api/devices: {e}")
         return jsonify({'error': t('error.unknown')}), 500
 
+@app.route('/api/devices/all')
+def get_all_devices():
+    """Get all playback devices (Spotify Connect + local mDNS) from the device registry"""
+    sp = get_spotify_client()
+    if not sp:
+        return jsonify({'error': t('error.not_logged_in')}), 401
+
+    try:
+        spotify_connect_discovery.acquire_lease()
+        zeroconf_prober.request_probe_if_stale()
+        result = device_registry.get_all(sp)
+        result['discovery'] = spotify_connect_discovery.get_status()
+        return jsonify(result)
+    except Exception as e:
+        print(f"[Unexpected Error] /api/devices/all: {e}")
+        return jsonify({'error': t('error.unknown')}), 500
+
 @app.route('/api/transfer-playback', methods=['POST'])
 def transfer_playback():
     """Transfer playback to a device"""
@@ -1676,8 +4401,11 @@ def transfer_playback():
 
     try:
         sp.transfer_playback(device_id, force_play=True)
+        device_registry.invalidate()
+        device_id_cache.record_transfer(device_id, True)
         return jsonify({'success': True})
     except spotipy.exceptions.SpotifyException as e:
+        device_id_cache.record_transfer_error(device_id, e)
         msg, status = handle_spotify_error(e)
         return jsonify({'error': msg}), status
     except Exception as e:
@@ -1698,17 +4426,36 @@ def transfer_playback_local():
 
     data = request.get_json()
     device_id = data.get('device_id')
+    device_name = data.get('device_name')
 
     if not device_id:
         return jsonify({'error': 'No device ID provided'}), 400
 
+    # Prefer a Spotify device id learned earlier for this device
+    cached = device_id_cache.resolve(device_name, device_id)
+    target_id = cached['spotify_id'] if cached else device_id
+
     try:
-        # Try direct transfer with the mDNS device_id
+        # Try direct transfer with the cached id first
+        if cached:
+            try:
+                sp.transfer_playback(target_id, force_play=True)
+                device_registry.invalidate()
+                device_id_cache.record_transfer(target_id, True)
+                return jsonify({'success': True, 'method': 'cached_id'})
+            except spotipy.exceptions.SpotifyException as e:
+                device_id_cache.record_transfer_error(target_id, e)
+                if target_id == device_id or not is_device_not_found_error(e):
+                    raise
+                print(f"[Devices] Cached id for '{device_name}' not found, trying the mDNS device_id")
+
+        # Fall back to the mDNS device_id
         sp.transfer_playback(device_id, force_play=True)
+        device_registry.invalidate()
+        device_id_cache.learn(device_name, device_id, device_id, confidence=0.9)
         return jsonify({'success': True, 'method': 'direct_transfer'})
     except spotipy.exceptions.SpotifyException as e:
-        error_str = str(e).lower()
-        if 'device not found' in error_str or 'not found' in error_str:
+        if is_device_not_found_error(e):
             # Device not recognized by Spotify - needs ZeroConf activation
             return jsonify({
                 'success': False,
@@ -1724,13 +4471,16 @@ def transfer_playback_local():
 def activate_local_device():
     """Activate a local Spotify Connect device via ZeroConf addUser flow.
 
+    Runs as a background job (see run_local_activation); returns the job id.
+
     Improved flow:
+    0. Bekend Spotify device_id (device id cache) → direct transfer, één API call
     1. Check Spotify API voor device (op naam)
        - Gevonden + actief → Direct return (geen actie nodig)
        - Gevonden + inactief → Direct transfer (geen activatie nodig)
        - Niet gevonden → Stap 2
     2. ZeroConf activatie
-    3. Poll API (5x met 1s interval)
+    3. Wacht tot het device in de API staat (event-driven, max 8s)
     4. Transfer playback met Spotify device_id
     """
     sp = get_spotify_client()
@@ -1741,6 +4491,7 @@ def activate_local_device():
     ip = data.get('ip')
     port = data.get('port')
     device_name = data.get('device_name')  # Voor matching
+    zeroconf_id = data.get('device_id')  # ZeroConf deviceID (optioneel)
 
     if not ip or not port:
         return jsonify({'error': 'IP en poort zijn verplicht'}), 400
@@ -1748,122 +4499,225 @@ def activate_local_device():
     if not device_name:
         return jsonify({'error': 'device_name is verplicht'}), 400
 
+    job = job_manager.submit('activate', run_local_activation, sp, ip, port, device_name, zeroconf_id,
+                             session.get('user_id', 'default'),
+                             dedupe_key=f"activate:{device_name.lower()}")
+    return job_accepted(job)
+
+
+def run_local_activation(report, sp, ip, port, device_name, zeroconf_id, user_id):
+    """Job body of activate_local_device; returns (payload, http status)"""
+    started_at = time.time()
     try:
+        # STAP 0: Snelle route via bekende device id
+        cached = device_id_cache.resolve(device_name, zeroconf_id)
+        if cached:
+            print(f"[ZeroConf] Step 0: Trying cached device id for '{device_name}' (confidence {cached['confidence']})")
+            try:
+                sp.transfer_playback(cached['spotify_id'], force_play=True)
+                device_id_cache.record_transfer(cached['spotify_id'], True)
+                device_registry.invalidate()
+                activation_waiter.record(device_name, started_at, None, True, method='cached_id')
+                print(f"[ZeroConf] Transfer successful to {device_name} via cached id")
+                return {
+                    'success': True,
+                    'message': f'Playback overgedragen naar {device_name}',
+                    'spotify_device_id': cached['spotify_id'],
+                    'skipped_activation': True,
+                    'method': 'cached_id'
+                }, 200
+            except spotipy.exceptions.SpotifyException as e:
+                # Device niet (meer) bekend bij Spotify onder dit id → opnieuw zoeken
+                print(f"[ZeroConf] Cached device id failed ({e.http_status}), rediscovering...")
+                device_id_cache.record_transfer_error(cached['spotify_id'], e)
+
         # STAP 1: Check of device al in Spotify API staat
+        report(10, 'checking')
         print(f"[ZeroConf] Step 1: Checking if '{device_name}' already in Spotify API...")
-        devices_response = sp.devices()
-        existing_device = find_device_by_name(devices_response.get('devices', []), device_name)
+        api_devices, _ = device_registry.get_api_devices(sp, max_age=ActivationWaiter.LOOKUP_MAX_AGE, user_id=user_id)
+        existing_device = find_device_by_name(api_devices, device_name)
 
         if existing_device:
             spotify_device_id = existing_device.get('id')
             is_active = existing_device.get('is_active', False)
+            device_id_cache.learn(device_name, spotify_device_id, zeroconf_id,
+                                  confidence=1.0 if names_match(existing_device.get('name'), device_name) else 0.6)
 
             if is_active:
                 # Device gevonden en al actief - geen actie nodig
                 print(f"[ZeroConf] Device '{device_name}' already active, nothing to do")
-                return jsonify({
+                activation_waiter.record(device_name, started_at, None, True, method='already_active')
+                return {
                     'success': True,
                     'message': f'{device_name} is al actief',
                     'spotify_device_id': spotify_device_id,
                     'skipped_activation': True
-                })
+                }, 200
             else:
                 # Device gevonden maar inactief - direct transfer (skip activatie)
                 print(f"[ZeroConf] Device '{device_name}' found but inactive, transferring...")
                 try:
                     sp.transfer_playback(spotify_device_id, force_play=True)
+                    device_registry.invalidate()
+                    activation_waiter.record(device_name, started_at, None, True, method='direct_transfer')
                     print(f"[ZeroConf] Transfer successful to {device_name}")
-                    return jsonify({
+                    return {
                         'success': True,
                         'message': f'Playback overgedragen naar {device_name}',
                         'spotify_device_id': spotify_device_id,
                         'skipped_activation': True
-                    })
+                    }, 200
                 except Exception as e:
                     print(f"[ZeroConf] Transfer failed, will try activation: {e}")
                     # Ga door naar activatie als transfer faalt
 
         # STAP 2: ZeroConf activatie nodig
         if not ZEROCONF_ACTIVATION_AVAILABLE:
-            return jsonify({
+            return {
                 'error': 'ZeroConf activatie niet beschikbaar (cryptography niet geinstalleerd)'
-            }), 500
+            }, 500
 
         credentials_path = os.path.expanduser("~/.cache/librespot/credentials.json")
         if not os.path.exists(credentials_path):
-            return jsonify({
+            return {
                 'error': 'Geen librespot credentials gevonden. Start librespot eerst handmatig.'
-            }), 400
+            }, 400
 
+        report(30, 'activating')
         print(f"[ZeroConf] Step 2: Activating device via ZeroConf...")
-        client = SpotifyZeroConf(credentials_path=credentials_path)
+        spotify_connect_discovery.acquire_lease(60)  # see the device's mDNS update after addUser
+        device_registry.set_activation_state(device_name, 'activating')
+        client = get_zeroconf_activator(credentials_path)
         result = client.activate_device(ip, int(port))
 
         if result.get('status') != 101:
-            return jsonify({
+            device_registry.set_activation_state(device_name, 'failed', result.get('statusString'))
+            return {
                 'success': False,
                 'error': f"Activatie mislukt: {result.get('statusString')}"
-            }), 400
+            }, 400
 
         print(f"[ZeroConf] Activation successful (status 101)")
+        activated_at = time.time()
+        device_registry.set_activation_state(device_name, 'activated')
 
-        # STAP 3: Poll API (3x met 2s interval, cooldown aware)
-        print(f"[ZeroConf] Step 3: Polling Spotify API for device...")
-        spotify_device_id = None
+        # STAP 3: Wacht op het device (prober activeUser / mDNS / registry, backoff als fallback)
+        report(60, 'waiting')
+        print(f"[ZeroConf] Step 3: Waiting for device in Spotify API...")
 
-        for attempt in range(3):
-            time.sleep(2)
-
-            # Skip API call als we in cooldown zitten
-            if is_api_in_cooldown():
-                print(f"[ZeroConf] API in cooldown, skipping poll {attempt + 1}/3")
-                continue
-
-            print(f"[ZeroConf] Poll attempt {attempt + 1}/3...")
-
-            try:
-                devices_response = sp.devices()
-                found_device = find_device_by_name(devices_response.get('devices', []), device_name)
-
-                if found_device:
-                    spotify_device_id = found_device.get('id')
-                    print(f"[ZeroConf] Found device: {device_name} -> {spotify_device_id}")
-                    break
-            except Exception as e:
-                print(f"[ZeroConf] Error fetching devices: {e}")
+        found_device, trigger = activation_waiter.wait_for_device(device_name, sp, since=activated_at, user_id=user_id)
+        spotify_device_id = found_device.get('id') if found_device else None
+        if spotify_device_id:
+            device_id_cache.learn(device_name, spotify_device_id, zeroconf_id)
+            print(f"[ZeroConf] Found device: {device_name} -> {spotify_device_id} (via {trigger})")
 
         # STAP 4: Transfer playback
         if spotify_device_id:
             try:
                 sp.transfer_playback(spotify_device_id, force_play=True)
+                device_registry.invalidate()
+                attempt = activation_waiter.record(device_name, started_at, activated_at, True, trigger)
                 print(f"[ZeroConf] Step 4: Transfer successful to {device_name}")
-                return jsonify({
+                return {
                     'success': True,
                     'message': f'Device geactiveerd en playback overgedragen naar {device_name}',
-                    'spotify_device_id': spotify_device_id
-                })
+                    'spotify_device_id': spotify_device_id,
+                    'time_to_speaker_ms': attempt['time_to_speaker_ms']
+                }, 200
             except Exception as e:
                 print(f"[ZeroConf] Transfer failed: {e}")
-                return jsonify({
+                activation_waiter.record(device_name, started_at, activated_at, False, trigger)
+                return {
                     'success': True,
                     'message': 'Device geactiveerd, maar transfer mislukt',
                     'error': str(e),
                     'spotify_device_id': spotify_device_id
-                })
+                }, 200
         else:
-            return jsonify({
+            activation_waiter.record(device_name, started_at, activated_at, False, trigger)
+            return {
                 'success': True,
-                'message': 'Device geactiveerd, maar niet gevonden in Spotify na 3 pogingen',
+                'message': f'Device geactiveerd, maar niet gevonden in Spotify na {ActivationWaiter.TIMEOUT}s',
                 'warning': 'Probeer handmatig te transferen'
-            })
+            }, 200
 
     except ValueError as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
+        device_registry.set_activation_state(device_name, 'failed', str(e))
+        return {'success': False, 'error': str(e)}, 400
     except Exception as e:
+        device_registry.set_activation_state(device_name, 'failed', str(e))
         print(f"[ZeroConf] Activation error: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return {'success': False, 'error': str(e)}, 500
+
+
+@app.route('/api/devices/local/activate-many', methods=['POST'])
+def activate_local_devices():
+    """Activate several local devices in parallel (background job).
+
+    Body: {"devices": [{"ip", "port", "device_name", "device_id"?}], "transfer": true}
+    The job finishes once the first device is ready; the remaining devices
+    keep activating, follow them via the batch endpoint.
+    """
+    sp = get_spotify_client()
+    if not sp:
+        return jsonify({'error': 'Niet ingelogd bij Spotify'}), 401
+
+    if not ZEROCONF_ACTIVATION_AVAILABLE:
+        return jsonify({
+            'error': 'ZeroConf activatie niet beschikbaar (cryptography niet geinstalleerd)'
+        }), 500
+
+    data = request.get_json() or {}
+    devices = data.get('devices') or []
+    if not devices or any(not d.get('ip') or not d.get('port') or not d.get('device_name') for d in devices):
+        return jsonify({'error': 'Elk device heeft ip, port en device_name nodig'}), 400
+
+    credentials_path = os.path.expanduser("~/.cache/librespot/credentials.json")
+    if not os.path.exists(credentials_path):
+        return jsonify({
+            'error': 'Geen librespot credentials gevonden. Start librespot eerst handmatig.'
+        }), 400
+
+    spotify_connect_discovery.acquire_lease(60)
+    names = sorted(d['device_name'].lower() for d in devices)
+    job = job_manager.submit('activate-many', run_bulk_activation, sp, devices, credentials_path,
+                             session.get('user_id', 'default'),
+                             data.get('transfer', True), dedupe_key=f"activate-many:{','.join(names)}")
+    return job_accepted(job)
+
+
+def run_bulk_activation(report, sp, devices, credentials_path, user_id, transfer):
+    """Job body of activate_local_devices; returns (payload, http status)"""
+    batch_id = bulk_activator.start(sp, devices, credentials_path, user_id, transfer=transfer)
+    report(progress=10, message='activating', batch_id=batch_id)
+    batch = bulk_activator.wait_first_ready(batch_id, timeout=ActivationWaiter.TIMEOUT + 12)
+    if batch['ready']:
+        return batch, 200
+    # 202: nothing ready yet but still running (poll the batch endpoint)
+    return batch, (400 if batch['done'] else 202)
+
+
+@app.route('/api/devices/local/activate-many/<batch_id>')
+def get_local_activation_batch(batch_id):
+    """Progress of a multi-device activation"""
+    batch = bulk_activator.get(batch_id)
+    if not batch:
+        return jsonify({'error': 'Onbekende batch'}), 404
+    return jsonify(batch)
+
+
+@app.route('/api/devices/local/activation-stats')
+def get_activation_stats():
+    """Recent ZeroConf activation attempts with time-to-speaker"""
+    return jsonify(activation_waiter.get_stats())
+
+
+@app.route('/api/system/command-stats')
+def get_command_stats():
+    """Spawn counts, merges, cache hits and latency per pactl/bluetoothctl binary"""
+    return jsonify(command_runner.get_stats())
 
 
 # System control endpoints
@@ -1898,7 +4752,9 @@ def get_audio_devices_endpoint():
 def refresh_audio_devices_endpoint():
     """Manually refresh audio devices cache"""
     try:
-        # Audio devices will refresh automatically
+        # Normally kept current by pactl events; an explicit refresh reloads the model
+        if audio_sink_model.ready:
+            audio_sink_model.refresh()
         devices = get_audio_devices()
         return jsonify({'devices': devices, 'refreshed': True})
     except Exception as e:
@@ -1906,26 +4762,47 @@ def refresh_audio_devices_endpoint():
 
 @app.route('/api/audio/output', methods=['POST'])
 def set_audio_output():
-    """Switch audio output"""
-    data = request.get_json()
+    """Switch audio output, moving the playing stream along with it.
+
+    Optional "ramp_ms" (max 1000) fades the new output in from silence.
+    """
+    data = request.get_json() or {}
     device_id = data.get('device_id')
 
     if not device_id:
         return jsonify({'error': 'No device_id provided'}), 400
 
     try:
+        ramp_ms = max(0, min(1000, int(data.get('ramp_ms') or 0)))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid ramp_ms'}), 400
+
+    try:
+        started = time.monotonic()
         success = set_audio_device(device_id)
 
         if success:
-            # Wait for system to update the default device
-            time.sleep(0.15)
-
-            # Reset volume to safe default when switching devices
+            # Reset volume to safe default when switching devices; the sink is
+            # addressed by name, so no need to wait for the default to settle
             safe_volume = get_default_volume_setting()
-            set_system_volume(safe_volume)
-            print(f"[Audio] Switched to {device_id}, volume reset to {safe_volume}%")
+            set_system_volume(0 if ramp_ms else safe_volume, device_id)
+
+            # librespot keeps its stream on the old sink until it reopens the
+            # device: move it now instead
+            moved = move_sink_inputs(device_id)
+            if ramp_ms:
+                ramp_system_volume(device_id, safe_volume, ramp_ms)
 
-            return jsonify({'success': True, 'device_id': device_id, 'volume': safe_volume})
+            elapsed_ms = int((time.monotonic() - started) * 1000)
+            print(f"[Audio] Switched to {device_id} in {elapsed_ms}ms ({moved} stream(s) moved), volume reset to {safe_volume}%")
+
+            return jsonify({
+                'success': True,
+                'device_id': device_id,
+                'volume': safe_volume,
+                'moved_streams': moved,
+                'elapsed_ms': elapsed_ms
+            })
         else:
             return jsonify({'error': 'Failed to set audio device. Is AudioDeviceCmdlets installed?'}), 500
     except Exception as e:
@@ -1935,20 +4812,11 @@ def set_audio_output():
 # ============ System Audio Volume ============
 
 def get_volume_settings():
-    """Get the configured volume settings from settings file."""
-    config_file = os.path.expanduser('~/.config/spotify-player/settings.json')
-    defaults = {'default_volume': 50, 'max_volume': 80}
-    try:
-        if os.path.exists(config_file):
-            with open(config_file, 'r') as f:
-                settings = json.load(f)
-                return {
-                    'default_volume': settings.get('default_volume', 50),
-                    'max_volume': settings.get('max_volume', 80)
-                }
-    except Exception as e:
-        print(f"[Audio] Error reading settings: {e}")
-    return defaults
+    """Get the configured volume settings (in-memory settings store)."""
+    return {
+        'default_volume': int(settings_store.get('default_volume', 50)),
+        'max_volume': int(settings_store.get('max_volume', 80))
+    }
 
 
 def get_default_volume_setting():
@@ -1961,12 +4829,28 @@ def get_max_volume_setting():
     return get_volume_settings()['max_volume']
 
 
-def set_system_volume(volume_percent):
-    """Set system audio volume for default sink."""
+def set_system_volume(volume_percent, sink_name=None):
+    """Set system audio volume for the default sink (or an explicit sink).
+
+    Cancels a volume ramp in progress.
+    """
+    global _volume_ramp_generation
+    with _volume_ramp_lock:
+        _volume_ramp_generation += 1
+    return _apply_system_volume(volume_percent, sink_name)
+
+
+def _apply_system_volume(volume_percent, sink_name=None):
+    """Write a sink volume without touching ramps"""
+    global _cached_system_volume
     try:
         volume = max(0, min(100, int(volume_percent)))
-        subprocess.run(['pactl', 'set-sink-volume', '@DEFAULT_SINK@', f'{volume}%'],
-                      capture_output=True, timeout=5)
+        try:
+            pulse_backend.set_volume(volume, sink_name)
+        except RuntimeError:
+            command_runner.run(['pactl', 'set-sink-volume', sink_name or '@DEFAULT_SINK@', f'{volume}%'], timeout=5)
+        audio_sink_model.note_default_volume(volume)
+        _cached_system_volume = volume
         return True
     except Exception as e:
         print(f"[Audio] Error setting volume: {e}")
@@ -1975,18 +4859,37 @@ def set_system_volume(volume_percent):
 
 def get_system_volume():
     """Get current system audio volume for default sink."""
+    global _cached_system_volume
+    if audio_sink_model.ready:
+        volume = audio_sink_model.get_default_volume()
+        if volume is not None:
+            _cached_system_volume = volume
+            return volume
+
     try:
-        result = subprocess.run(['pactl', 'get-sink-volume', '@DEFAULT_SINK@'],
-                               capture_output=True, text=True, timeout=5)
+        _cached_system_volume = pulse_backend.get_volume()
+        return _cached_system_volume
+    except RuntimeError:
+        pass
+
+    try:
+        result = command_runner.run(['pactl', 'get-sink-volume', '@DEFAULT_SINK@'], timeout=5, cache_ttl=1)
         # Parse "Volume: front-left: 32768 /  50% / ..."
         match = re.search(r'(\d+)%', result.stdout)
         if match:
-            return int(match.group(1))
+            _cached_system_volume = int(match.group(1))
+            return _cached_system_volume
     except Exception as e:
         print(f"[Audio] Error getting volume: {e}")
     return 50  # Default fallback
 
 
+def volume_to_slider(actual_volume, max_vol):
+    """Scale actual sink volume to the 0-100 slider value (slider 100% = max_volume)."""
+    slider_value = int((actual_volume / max_vol) * 100) if max_vol > 0 else 0
+    return min(100, slider_value)  # Cap at 100
+
+
 @app.route('/api/audio/volume', methods=['GET', 'POST'])
 def audio_volume():
     """Get or set system audio volume for default sink.
@@ -1997,11 +4900,7 @@ def audio_volume():
     max_vol = get_max_volume_setting()
 
     if request.method == 'GET':
-        actual_volume = get_system_volume()
-        # Scale actual volume to slider value (0-100)
-        slider_value = int((actual_volume / max_vol) * 100) if max_vol > 0 else 0
-        slider_value = min(100, slider_value)  # Cap at 100
-        return jsonify({'volume': slider_value})
+        return jsonify({'volume': volume_to_slider(get_system_volume(), max_vol)})
 
     # POST: Set volume - scale slider value (0-100) to actual volume (0-max_vol)
     data = request.get_json()
@@ -2017,9 +4916,6 @@ def audio_volume():
 @app.route('/api/settings/volume', methods=['GET', 'POST'])
 def volume_settings():
     """Get or set volume settings (default and max)."""
-    config_dir = os.path.expanduser('~/.config/spotify-player')
-    config_file = os.path.join(config_dir, 'settings.json')
-
     if request.method == 'GET':
         settings = get_volume_settings()
         return jsonify(settings)
@@ -2028,14 +4924,7 @@ def volume_settings():
     data = request.get_json()
 
     try:
-        # Ensure config directory exists
-        os.makedirs(config_dir, exist_ok=True)
-
-        # Read existing settings or create new
-        settings = {}
-        if os.path.exists(config_file):
-            with open(config_file, 'r') as f:
-                settings = json.load(f)
+        settings = get_volume_settings()
 
         # Update default_volume if provided
         if 'default_volume' in data:
@@ -2049,8 +4938,7 @@ def volume_settings():
         if settings.get('default_volume', 50) > settings.get('max_volume', 80):
             settings['default_volume'] = settings['max_volume']
 
-        with open(config_file, 'w') as f:
-            json.dump(settings, f)
+        settings_store.update(**settings)
 
         return jsonify({
             'success': True,
@@ -2091,31 +4979,13 @@ def language_settings():
 def get_local_spotify_devices():
     """Get Spotify Connect devices discovered via mDNS on local network"""
     try:
-        devices = get_spotify_connect_devices()
-
-        # Enrich with device info from ZeroConf API if available
-        enriched_devices = []
-        for device in devices:
-            device_data = {
-                'name': device['name'],
-                'ip': device['addresses'][0] if device.get('addresses') else None,
-                'port': device.get('port'),
-                'type': 'local',  # Mark as locally discovered
-                'is_active': False  # Local devices need activation
-            }
-
-            # Try to get additional info from device's ZeroConf endpoint
-            zc_info = get_device_info_from_zeroconf(device)
-            if zc_info:
-                device_data['device_id'] = zc_info.get('deviceID')
-                device_data['remote_name'] = zc_info.get('remoteName', device['name'])
-                device_data['device_type'] = zc_info.get('deviceType')
-                device_data['brand'] = zc_info.get('brandDisplayName')
-                device_data['model'] = zc_info.get('modelDisplayName')
-
-            enriched_devices.append(device_data)
-
-        return jsonify({'devices': enriched_devices})
+        # Enriched from the background ZeroConf prober's cache (never blocks on a device)
+        spotify_connect_discovery.acquire_lease()
+        zeroconf_prober.request_probe_if_stale()
+        return jsonify({
+            'devices': device_registry.get_local_devices(),
+            'discovery': spotify_connect_discovery.get_status()
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -2129,7 +4999,7 @@ def verify_pin():
     """Verify PIN for protected settings tabs"""
     data = request.get_json()
     pin = data.get('pin', '')
-    correct_pin = os.getenv('SETTINGS_PIN', '123456')
+    correct_pin = get_config().settings_pin
 
     if pin == correct_pin:
         return jsonify({'success': True})
@@ -2193,28 +5063,45 @@ def bluetooth_pair_endpoint():
     address = data['address']
     pin = data.get('pin')
 
+    # The same request joins the running job; a pairing with another PIN
+    # (e.g. a retry after a typo) must not be swallowed by it
+    dedupe_key = f"bluetooth:{address}:{pin or ''}"
+    running = job_manager.find_active(f"bluetooth:{address}:")
+    running.pop(dedupe_key, None)
+    if running:
+        job = next(iter(running.values()))
+        return jsonify({'error': t('bt.pair_in_progress'), 'job_id': job['id']}), 409
+
+    # Pairing scans and waits on bluetoothctl for up to ~50s: run it as a job
+    job = job_manager.submit('bluetooth-pair', run_bluetooth_pair, address, pin, dedupe_key=dedupe_key)
+    return job_accepted(job)
+
+
+def run_bluetooth_pair(report, address, pin):
+    """Job body of bluetooth_pair_endpoint; returns (payload, http status)"""
     try:
+        report(10, 'pairing')
         success, result = bluetooth_manager.pair_device(address, pin)
 
         if success:
-            return jsonify({
+            return {
                 'success': True,
                 'message': t('bt.pair_success')
-            })
+            }, 200
         elif isinstance(result, dict) and result.get('needs_pin'):
-            return jsonify({
+            return {
                 'success': False,
                 'needs_pin': True,
                 'pin_type': result.get('type', 'numeric')
-            }), 202
+            }, 202
         else:
-            return jsonify({
+            return {
                 'success': False,
                 'error': result or t('bt.pair_failed')
-            }), 400
+            }, 400
     except Exception as e:
         print(f"[BT] Pair error: {e}")
-        return jsonify({'error': str(e)}), 500
+        return {'error': str(e)}, 500
 
 
 @app.route('/api/bluetooth/connect', methods=['POST'])
@@ -2583,13 +5470,20 @@ def check_update_by_commits(current_version):
 
 @app.route('/api/system/update', methods=['POST'])
 def system_update():
-    """Perform system update: git pull, pip install, restart service"""
+    """Perform system update: git pull, pip install, restart service (background job)"""
     app_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Get target version from request (optional)
     data = request.get_json() or {}
     target_version = data.get('version')
 
+    job = job_manager.submit('system-update', run_system_update, app_dir, target_version,
+                             dedupe_key='system-update')
+    return job_accepted(job)
+
+
+def run_system_update(report, app_dir, target_version):
+    """Job body of system_update; returns (payload, http status)"""
     try:
         # Save current commit for rollback
         current_commit_result = subprocess.run(
@@ -2597,22 +5491,24 @@ def system_update():
             capture_output=True, text=True, timeout=10, cwd=app_dir
         )
         if current_commit_result.returncode != 0:
-            return jsonify({'error': 'Kon huidige versie niet bepalen'}), 500
+            return {'error': 'Kon huidige versie niet bepalen'}, 500
 
         rollback_commit = current_commit_result.stdout.strip()
 
         # Fetch all tags and updates
+        report(10, 'fetching')
         fetch_result = subprocess.run(
             ['git', 'fetch', '--tags', 'origin', 'main'],
             capture_output=True, text=True, timeout=60, cwd=app_dir
         )
         if fetch_result.returncode != 0:
-            return jsonify({
+            return {
                 'error': 'Git fetch mislukt',
                 'details': fetch_result.stderr
-            }), 500
+            }, 500
 
         # Checkout specific version or pull latest
+        report(30, 'checkout')
         if target_version and target_version.startswith('v'):
             # Checkout specific tag
             checkout_result = subprocess.run(
@@ -2620,10 +5516,10 @@ def system_update():
                 capture_output=True, text=True, timeout=30, cwd=app_dir
             )
             if checkout_result.returncode != 0:
-                return jsonify({
+                return {
                     'error': f'Git checkout naar {target_version} mislukt',
                     'details': checkout_result.stderr
-                }), 500
+                }, 500
         else:
             # Reset to origin/main
             reset_result = subprocess.run(
@@ -2631,12 +5527,13 @@ def system_update():
                 capture_output=True, text=True, timeout=30, cwd=app_dir
             )
             if reset_result.returncode != 0:
-                return jsonify({
+                return {
                     'error': 'Git reset mislukt',
                     'details': reset_result.stderr
-                }), 500
+                }, 500
 
         # Install Python dependencies
+        report(50, 'installing')
         pip_result = subprocess.run(
             ['pip', 'install', '-r', 'requirements.txt', '--break-system-packages'],
             capture_output=True, text=True, timeout=300, cwd=app_dir
@@ -2648,10 +5545,10 @@ def system_update():
                 ['git', 'reset', '--hard', rollback_commit],
                 capture_output=True, timeout=30, cwd=app_dir
             )
-            return jsonify({
+            return {
                 'error': 'Pip install mislukt - wijzigingen teruggedraaid',
                 'details': pip_result.stderr
-            }), 500
+            }, 500
 
         # Get version from git after checkout (ignore cached version.txt)
         if target_version:
@@ -2664,25 +5561,26 @@ def system_update():
             new_version = result.stdout.strip() if result.returncode == 0 else 'unknown'
         save_version(new_version)
 
-        # Schedule service restart (give time for response to be sent)
+        # Schedule service restart (give time for the job result to be fetched)
+        report(95, 'restarting')
         def restart_service():
-            time.sleep(1)
+            time.sleep(3)
             subprocess.run(['systemctl', '--user', 'restart', 'spotify-player'])
 
         restart_thread = Thread(target=restart_service, daemon=True)
         restart_thread.start()
 
-        return jsonify({
+        return {
             'success': True,
             'message': 'Update geïnstalleerd, app wordt herstart...',
             'version': new_version
-        })
+        }, 200
 
     except subprocess.TimeoutExpired:
-        return jsonify({'error': 'Update timeout - probeer opnieuw'}), 500
+        return {'error': 'Update timeout - probeer opnieuw'}, 500
     except Exception as e:
         print(f"[Update] Error: {e}")
-        return jsonify({'error': str(e)}), 500
+        return {'error': str(e)}, 500
 
 
 @app.route('/api/system/power-saving', methods=['GET'])
@@ -2767,7 +5665,7 @@ def get_device_info():
     import socket
     return jsonify({
         'hostname': socket.gethostname(),
-        'player_name': os.getenv('SPOTIFY_DEVICE_NAME', '')
+        'player_name': get_config().device_name
     })
 
 
@@ -2779,7 +5677,7 @@ def set_hostname():
 
     # PIN verification
     pin = data.get('pin', '')
-    expected_pin = os.getenv('SETTINGS_PIN', '123456')
+    expected_pin = get_config().settings_pin
     if pin != expected_pin:
         return jsonify({'error': t('pin.incorrect')}), 403
 
@@ -2812,12 +5710,11 @@ def set_hostname():
 @app.route('/api/system/player-name', methods=['POST'])
 def set_player_name():
     """Set Spotify player name (requires PIN, restarts librespot)"""
-    import re
     data = request.json
 
     # PIN verification
     pin = data.get('pin', '')
-    expected_pin = os.getenv('SETTINGS_PIN', '123456')
+    expected_pin = get_config().settings_pin
     if pin != expected_pin:
         return jsonify({'error': t('pin.incorrect')}), 403
 
@@ -2826,6 +5723,14 @@ def set_player_name():
     if not new_name:
         return jsonify({'error': 'Player name cannot be empty'}), 400
 
+    # Restarting librespot can take a while: run it as a job
+    job = job_manager.submit('player-name', run_set_player_name, new_name, dedupe_key='player-name')
+    return job_accepted(job)
+
+
+def run_set_player_name(report, new_name):
+    """Job body of set_player_name; returns (payload, http status)"""
+    import re
     try:
         # 1. Update .env file
         env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
@@ -2850,29 +5755,33 @@ def set_player_name():
             print(f"[Device] Updated librespot.service with new name")
 
             # 3. Reload systemd and restart librespot
+            report(50, 'restarting')
             subprocess.run(['systemctl', '--user', 'daemon-reload'], timeout=10)
             subprocess.run(['systemctl', '--user', 'restart', 'librespot'], timeout=30)
             print(f"[Device] Restarted librespot service")
 
-        # Reload environment variables
-        load_dotenv(override=True)
-
-        return jsonify({'success': True, 'player_name': new_name})
+        return {'success': True, 'player_name': new_name}, 200
     except Exception as e:
         print(f"[Device Error] Failed to set player name: {e}")
-        return jsonify({'error': str(e)}), 500
+        return {'error': str(e)}, 500
 
 
 @app.route('/api/system/restart-librespot', methods=['POST'])
 def restart_librespot():
-    """Restart librespot service"""
+    """Restart librespot service (background job)"""
+    job = job_manager.submit('restart-librespot', run_restart_librespot, dedupe_key='restart-librespot')
+    return job_accepted(job)
+
+
+def run_restart_librespot(report):
+    """Job body of restart_librespot; returns (payload, http status)"""
     try:
         subprocess.run(['systemctl', '--user', 'restart', 'librespot'], timeout=30)
         print("[System] Librespot service restarted")
-        return jsonify({'success': True})
+        return {'success': True}, 200
     except Exception as e:
         print(f"[System Error] Failed to restart librespot: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return {'success': False, 'error': str(e)}, 500
 
 
 # ============================================
@@ -2880,7 +5789,11 @@ def restart_librespot():
 # ============================================
 
 def update_env_file(path, updates):
-    """Update .env file with new values, preserving existing content"""
+    """Update .env file with new values, preserving existing content.
+
+    Written atomically; the new values are applied to os.environ directly
+    and a new configuration snapshot is swapped in (no load_dotenv() re-read).
+    """
     lines = []
     if os.path.exists(path):
         with open(path, 'r') as f:
@@ -2898,8 +5811,14 @@ def update_env_file(path, updates):
         if key not in updated_keys:
             lines.append(f'{key}={value}\n')
 
-    with open(path, 'w') as f:
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
         f.writelines(lines)
+    os.replace(tmp_path, path)
+
+    for key, value in updates.items():
+        os.environ[key] = value
+    reload_config()
 
 
 def clear_all_spotify_caches():
@@ -2914,6 +5833,7 @@ def clear_all_spotify_caches():
             print(f"Deleted cache file: {cache_file}")
         except Exception as e:
             print(f"Error deleting cache file {cache_file}: {e}")
+    token_store.discard()
 
 
 @app.route('/api/account/info')
@@ -2925,12 +5845,13 @@ def get_account_info():
 
     try:
         user = sp.current_user()
-        client_id = os.getenv('SPOTIFY_CLIENT_ID', '')
-        client_secret = os.getenv('SPOTIFY_CLIENT_SECRET', '')
+        config = get_config()
+        client_id = config.client_id
+        client_secret = config.client_secret
         return jsonify({
             'display_name': user.get('display_name', '-'),
             'email': user.get('email', '-'),
-            'avatar_url': user['images'][0]['url'] if user.get('images') else None,
+            'avatar_url': proxy_image_url(user['images'][0]['url']) if user.get('images') else None,
             'country': user.get('country', '-'),
             'product': user.get('product', '-'),  # 'premium', 'free', 'open', etc.
             'client_id': client_id if client_id else '-',
@@ -2948,7 +5869,7 @@ def update_credentials():
 
     # PIN verification
     pin = data.get('pin', '')
-    expected_pin = os.getenv('SETTINGS_PIN', '123456')
+    expected_pin = get_config().settings_pin
     if pin != expected_pin:
         return jsonify({'error': t('pin.incorrect')}), 403
 
@@ -2970,9 +5891,6 @@ def update_credentials():
         print(f"[Credentials Error] Failed to update .env: {e}")
         return jsonify({'error': f'Failed to save credentials: {str(e)}'}), 500
 
-    # Reload environment variables
-    load_dotenv(override=True)
-
     # Clear session and all caches
     session.clear()
     clear_all_spotify_caches()
@@ -2980,12 +5898,24 @@ def update_credentials():
     return jsonify({'success': True, 'message': 'Credentials updated. Please log in again.'})
 
 
-if __name__ == '__main__':
-    # Check if credentials are set
-    if not os.getenv('SPOTIFY_CLIENT_ID') or not os.getenv('SPOTIFY_CLIENT_SECRET'):
-        print("WARNING: Spotify credentials not found!")
-        print("Please copy .env.example to .env and add your credentials")
-        print("Get credentials from: https://developer.spotify.com/dashboard")
+# =============================================================================
+# Serving
+# =============================================================================
+
+_background_services_lock = Lock()
+_background_services_started = False
+
+
+def start_background_services():
+    """Start the startup tasks and background threads, exactly once per process.
+
+    Safe to call again (e.g. from a WSGI server hook): later calls are no-ops.
+    """
+    global _background_services_started
+    with _background_services_lock:
+        if _background_services_started:
+            return
+        _background_services_started = True
 
     # Start Bluetooth auto-reconnect thread (Linux only)
     if bluetooth_manager:
@@ -3000,11 +5930,110 @@ if __name__ == '__main__':
     else:
         print("[Audio] Warning: Could not set startup volume")
 
-    # Start Spotify Connect mDNS discovery
+    # Fingerprint and precompress static assets
+    build_assets()
+
+    # Start Spotify Connect mDNS discovery and the getInfo prober
     start_spotify_connect_discovery()
+    zeroconf_prober.start()
+
+    # Keep the audio sink model current from PulseAudio/PipeWire events
+    audio_sink_model.start()
+
+    # Warm up the ZeroConf activator's DH keypair pool
+    if ZEROCONF_ACTIVATION_AVAILABLE:
+        get_zeroconf_activator()
+
+
+def stop_background_services():
+    """Flush pending writes and stop the background threads"""
+    with _background_services_lock:
+        if not _background_services_started:
+            return
+
+    settings_store.flush()
+    session_store.flush()
+    audio_sink_model.stop()
+    pulse_backend.close()
+    zeroconf_prober.stop()
+    stop_spotify_connect_discovery()
+
+
+def serve_production(host, port):
+    """Serve the app with waitress: a fixed worker thread pool, no reloader.
+
+    SIGTERM (systemctl stop) stops accepting connections and lets requests
+    in flight finish before the background services are stopped. waitress's
+    own run() has no such drain, so its event loop is driven here; that uses
+    server internals (_map, asyncore, task_dispatcher), hence the pinned
+    waitress minor version in requirements.txt.
+    """
+    threads = int(os.getenv('WSGI_THREADS', '8'))
+    server = create_waitress_server(
+        app,
+        host=host,
+        port=port,
+        threads=threads,
+        # Idle keep-alive connections (kiosk and phones polling) are closed after this
+        channel_timeout=int(os.getenv('WSGI_KEEPALIVE_TIMEOUT', '120')),
+        ident='kids-spotify-player'
+    )
+
+    stopping = Event()
+
+    def handle_sigterm(signum, frame):
+        stopping.set()
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    def poll():
+        server.asyncore.loop(timeout=0.5, map=server._map, use_poll=server.adj.asyncore_use_poll, count=1)
+
+    def requests_in_flight():
+        return any(getattr(channel, 'requests', None) or getattr(channel, 'total_outbufs_len', 0)
+                   for channel in list(server._map.values()))
+
+    print(f"[Server] Serving on http://{host}:{port} with {threads} threads (waitress)")
+    try:
+        while not stopping.is_set():
+            poll()
+    except KeyboardInterrupt:
+        pass
+
+    # Stop accepting, then keep the loop running until responses in flight are sent
+    print("[Server] Shutting down...")
+    server.accepting = False
+    deadline = time.time() + int(os.getenv('WSGI_SHUTDOWN_TIMEOUT', '5'))
+    while requests_in_flight() and time.time() < deadline:
+        poll()
+
+    # Open SSE streams that outlived the grace period are dropped here
+    server.task_dispatcher.shutdown(cancel_pending=True, timeout=1)
+    server.close()
+
+if __name__ == '__main__':
+    # Check if credentials are set
+    if not get_config().client_id or not get_config().client_secret:
+        print("WARNING: Spotify credentials not found!")
+        print("Please copy .env.example to .env and add your credentials")
+        print("Get credentials from: https://developer.spotify.com/dashboard")
+
+    server_mode = os.getenv('SERVER_MODE', 'production').strip().lower()
+    host = os.getenv('SERVER_HOST', '0.0.0.0')
+    port = int(os.getenv('SERVER_PORT', '5000'))
+
+    if server_mode == 'production' and not WAITRESS_AVAILABLE:
+        print("[Server] Warning: waitress not installed - falling back to the Flask server without debug")
+
+    # With the debug reloader the parent process only watches files; the app runs in its child
+    if server_mode != 'development' or is_running_from_reloader():
+        start_background_services()
 
     try:
-        app.run(host='0.0.0.0', port=5000, debug=True)
+        if server_mode == 'development':
+            app.run(host=host, port=port, debug=True)
+        elif WAITRESS_AVAILABLE:
+            serve_production(host, port)
+        else:
+            app.run(host=host, port=port, debug=False, threaded=True)
     finally:
-        # Clean up mDNS discovery on shutdown
-        stop_spotify_connect_discovery()
+        stop_background_services()
@@ -0,0 +1,141 @@
+"""
+In-process PulseAudio / pipewire-pulse client voor volume en sink besturing.
+
+Houdt één persistente verbinding met de native PulseAudio socket open (via
+libpulse, pulsectl), zodat een volume slider tick of sink switch geen pactl
+proces hoeft te starten. Is libpulse of de server niet beschikbaar, dan is
+`available` False en valt app.py terug op pactl.
+"""
+
+import threading
+import time
+
+try:
+    import pulsectl
+    PULSECTL_AVAILABLE = True
+except (ImportError, OSError):
+    # OSError: pulsectl geinstalleerd maar libpulse.so ontbreekt
+    PULSECTL_AVAILABLE = False
+
+
+class PulseNativeBackend:
+    """
+    Persistente PulseAudio verbinding met automatische reconnect.
+
+    libpulse is niet thread-safe, dus alle calls lopen via één lock. Na een
+    mislukte verbinding wordt RETRY_INTERVAL seconden niet opnieuw geprobeerd,
+    zodat de fallback naar pactl niet bij elke call een connect-timeout kost.
+    """
+
+    CLIENT_NAME = 'kids-spotify-player'
+    RETRY_INTERVAL = 30
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pulse = None
+        self._last_failure = 0
+
+    @property
+    def available(self):
+        """True als er een verbinding is of (opnieuw) geprobeerd mag worden."""
+        if not PULSECTL_AVAILABLE:
+            return False
+        return self._pulse is not None or time.time() - self._last_failure > self.RETRY_INTERVAL
+
+    def _connect(self):
+        """Verbinding openen indien nodig (caller houdt lock)."""
+        if self._pulse is None:
+            self._pulse = pulsectl.Pulse(self.CLIENT_NAME, connect=True)
+        return self._pulse
+
+    def _call(self, fn):
+        """
+        Voer fn(pulse) uit; bij een verbroken verbinding één keer reconnecten.
+
+        Raises:
+            RuntimeError: Als PulseAudio niet bereikbaar is (caller valt terug op pactl)
+        """
+        if not self.available:
+            raise RuntimeError("PulseAudio native backend niet beschikbaar")
+
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    pulse = self._connect()
+                except Exception as e:
+                    # Server niet bereikbaar: RETRY_INTERVAL wachten voor een nieuwe poging
+                    self._close()
+                    self._last_failure = time.time()
+                    raise RuntimeError(f"PulseAudio niet bereikbaar: {e}")
+
+                try:
+                    return fn(pulse)
+                except pulsectl.PulseDisconnected as e:
+                    # Server herstart (bv. pipewire na bluetooth wissel): opnieuw verbinden
+                    self._close()
+                    if attempt == 1:
+                        self._last_failure = time.time()
+                        raise RuntimeError(f"PulseAudio verbinding verbroken: {e}")
+                except pulsectl.PulseError as e:
+                    # Onbekende sink of geweigerde operatie: verbinding is nog goed
+                    raise RuntimeError(f"PulseAudio call mislukt: {e}")
+                except Exception as e:
+                    self._close()
+                    self._last_failure = time.time()
+                    raise RuntimeError(f"PulseAudio niet bereikbaar: {e}")
+
+    def _close(self):
+        if self._pulse is not None:
+            try:
+                self._pulse.close()
+            except Exception:
+                pass
+            self._pulse = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    @staticmethod
+    def _default_sink(pulse):
+        return pulse.get_sink_by_name(pulse.server_info().default_sink_name)
+
+    def get_volume(self) -> int:
+        """Volume van de default sink in procent (gemiddelde van de kanalen)."""
+        return self._call(lambda pulse: round(pulse.volume_get_all_chans(self._default_sink(pulse)) * 100))
+
+    def set_volume(self, percent: int, sink_name: str = None):
+        """Zet het volume van de default sink, of van sink_name (0-100%)."""
+        level = max(0, min(100, int(percent))) / 100
+
+        def apply(pulse):
+            sink = pulse.get_sink_by_name(sink_name) if sink_name else self._default_sink(pulse)
+            pulse.volume_set_all_chans(sink, level)
+        self._call(apply)
+
+    def set_default_sink(self, sink_name: str):
+        """Maak sink_name de default sink."""
+        def switch(pulse):
+            pulse.sink_default_set(pulse.get_sink_by_name(sink_name))
+        self._call(switch)
+
+    def move_sink_inputs(self, sink_name: str) -> int:
+        """
+        Verplaats alle lopende streams (sink-inputs) naar sink_name.
+
+        Returns:
+            Aantal verplaatste streams
+        """
+        def move(pulse):
+            sink = pulse.get_sink_by_name(sink_name)
+            moved = 0
+            for stream in pulse.sink_input_list():
+                if stream.sink != sink.index:
+                    pulse.sink_input_move(stream.index, sink.index)
+                    moved += 1
+            return moved
+        return self._call(move)
+
+
+# Gedeelde backend voor de hele app
+pulse_backend = PulseNativeBackend()
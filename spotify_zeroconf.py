@@ -12,6 +12,8 @@ import json
 import os
 import struct
 import sys
+import threading
+from collections import deque
 import requests
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import hashes
@@ -45,6 +47,72 @@ DH_GENERATOR = 2
 DH_KEY_SIZE = 96  # 768 bits = 96 bytes
 
 
+def _to_bytes_padded(n: int, length: int) -> bytes:
+    """Converteer int naar bytes met zero-padding links."""
+    if n == 0:
+        return bytes(length)
+    raw = n.to_bytes((n.bit_length() + 7) // 8, 'big')
+    if len(raw) > length:
+        return raw[-length:]  # Truncate van links
+    return raw.rjust(length, b'\x00')  # Pad met zeros
+
+
+def generate_dh_keypair():
+    """Genereer DH keypair: (private_key, public_key, client_key_b64)."""
+    private_key = int.from_bytes(os.urandom(95), 'big') % DH_PRIME
+    public_key = pow(DH_GENERATOR, private_key, DH_PRIME)
+    client_key_b64 = base64.b64encode(_to_bytes_padded(public_key, DH_KEY_SIZE)).decode()
+    return private_key, public_key, client_key_b64
+
+
+class DHKeyPool:
+    """
+    Kleine voorraad vooraf gegenereerde DH keypairs.
+
+    Elk keypair wordt maar één keer gebruikt; een achtergrond thread vult de
+    pool weer aan, zodat de modexp niet op de request thread gebeurt.
+    """
+
+    def __init__(self, size: int = 4):
+        self.size = size
+        self._keys = deque()
+        self._lock = threading.Lock()
+        self._refill = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start de refill thread (idempotent)."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True, name='dh-pool')
+            self._thread.start()
+        self._refill.set()
+
+    def get(self):
+        """Pak een vers keypair; genereer synchroon als de pool leeg is."""
+        with self._lock:
+            keypair = self._keys.popleft() if self._keys else None
+        self._refill.set()
+        return keypair or generate_dh_keypair()
+
+    def _run(self):
+        while True:
+            self._refill.wait()
+            self._refill.clear()
+            while True:
+                with self._lock:
+                    if len(self._keys) >= self.size:
+                        break
+                keypair = generate_dh_keypair()
+                with self._lock:
+                    self._keys.append(keypair)
+
+
+# Gedeelde DH pool voor alle activaties
+dh_key_pool = DHKeyPool()
+
+
 class SpotifyZeroConf:
     """
     Spotify Connect ZeroConf client voor het activeren van librespot devices.
@@ -65,34 +133,59 @@ class SpotifyZeroConf:
         """
         self.credentials_path = credentials_path
         self._credentials_loaded = False
+        self._credentials_mtime = None
+        self._uses_access_token = False
         self.username = username
         self.auth_type = None
         self.auth_data = None
+        self._lock = threading.Lock()
+        self._inner_blobs = {}  # deviceID -> base64 inner blob (geldig voor huidige credentials)
+        self._http = requests.Session()
 
-        # Als access_token is meegegeven, gebruik die
+        # Als access_token is meegegeven, gebruik die (gaat voor op credentials_path)
         if access_token and username:
+            self.set_access_token(access_token, username)
+        elif credentials_path is None and not access_token:
+            self.credentials_path = os.path.expanduser("~/.cache/librespot/credentials.json")
+
+    def set_access_token(self, access_token: str, username: str):
+        """
+        Gebruik een OAuth access token in plaats van het credentials bestand.
+
+        Een nieuw token maakt de onthouden inner blobs ongeldig.
+        """
+        auth_data = access_token.encode('utf-8')
+        with self._lock:
+            if self._uses_access_token and self.auth_data == auth_data and self.username == username:
+                return
             self.username = username
             self.auth_type = self.AUTH_ACCESS_TOKEN
-            self.auth_data = access_token.encode('utf-8')
+            self.auth_data = auth_data
+            self._uses_access_token = True
             self._credentials_loaded = True
-        elif credentials_path is None and not access_token:
-            self.credentials_path = os.path.expanduser("~/.cache/librespot/credentials.json")
+            self._inner_blobs.clear()
 
     def _load_credentials(self):
-        """Laad stored credentials van disk."""
-        if self._credentials_loaded:
-            return
+        """Laad stored credentials van disk (opnieuw als het bestand gewijzigd is)."""
+        if self._uses_access_token:
+            return  # expliciet access token, credentials bestand wordt niet gebruikt
 
         if not self.credentials_path:
             raise ValueError("Geen credentials_path of access_token gegeven")
 
+        mtime = os.path.getmtime(self.credentials_path)
+        if self._credentials_loaded and mtime == self._credentials_mtime:
+            return
+
         with open(self.credentials_path, 'r') as f:
             creds = json.load(f)
 
         self.username = creds['username']
         self.auth_type = creds['auth_type']
         self.auth_data = base64.b64decode(creds['auth_data'])
+        self._credentials_mtime = mtime
         self._credentials_loaded = True
+        self._inner_blobs.clear()
 
     def get_device_info(self, ip: str, port: int) -> dict:
         """
@@ -106,7 +199,7 @@ class SpotifyZeroConf:
             dict met device info (publicKey, deviceID, etc.)
         """
         url = f"http://{ip}:{port}/?action=getInfo"
-        response = requests.get(url, timeout=5)
+        response = self._http.get(url, timeout=5)
         response.raise_for_status()
         return response.json()
 
@@ -184,18 +277,31 @@ class SpotifyZeroConf:
 
     def _to_bytes_padded(self, n: int, length: int) -> bytes:
         """Converteer int naar bytes met zero-padding links."""
-        if n == 0:
-            return bytes(length)
-        raw = n.to_bytes((n.bit_length() + 7) // 8, 'big')
-        if len(raw) > length:
-            return raw[-length:]  # Truncate van links
-        return raw.rjust(length, b'\x00')  # Pad met zeros
+        return _to_bytes_padded(n, length)
 
     def _generate_dh_keys(self):
-        """Genereer DH keypair."""
-        private_key = int.from_bytes(os.urandom(95), 'big') % DH_PRIME
-        public_key = pow(DH_GENERATOR, private_key, DH_PRIME)
-        return private_key, public_key
+        """Pak een DH keypair uit de gedeelde pool."""
+        return dh_key_pool.get()
+
+    def _get_inner_blob(self, device_id: str) -> bytes:
+        """
+        Base64 inner blob (AES-192-ECB, PBKDF2 key) voor dit device.
+
+        Hangt alleen af van de credentials en het deviceID, dus wordt per
+        deviceID onthouden tot de credentials veranderen.
+        """
+        with self._lock:
+            cached = self._inner_blobs.get(device_id)
+        if cached:
+            debug_log(f"[ZeroConf] Inner blob from cache")
+            return cached
+
+        credentials_blob = self._build_credentials_blob()
+        debug_log(f"[ZeroConf] Credentials blob size: {len(credentials_blob)} bytes")
+        inner_blob_b64 = base64.b64encode(self._encrypt_credentials_blob(credentials_blob, device_id))
+        with self._lock:
+            self._inner_blobs[device_id] = inner_blob_b64
+        return inner_blob_b64
 
     def _compute_shared_secret(self, device_public_key_b64: str, private_key: int) -> bytes:
         """Bereken DH shared secret."""
@@ -249,9 +355,10 @@ class SpotifyZeroConf:
             ValueError: Bij ongeldige response
             FileNotFoundError: Als credentials niet gevonden worden
         """
-        # Load credentials if not already loaded
+        # Load credentials if not already loaded (or changed on disk)
         debug_log(f"[ZeroConf] Step 1: Loading credentials...")
-        self._load_credentials()
+        with self._lock:
+            self._load_credentials()
         debug_log(f"[ZeroConf] Credentials loaded - username: {self.username}, auth_type: {self.auth_type}, auth_data_len: {len(self.auth_data)}")
 
         # 1. Haal device info op
@@ -270,23 +377,15 @@ class SpotifyZeroConf:
 
         # 2. DH key exchange
         debug_log(f"[ZeroConf] Step 3: DH key exchange...")
-        private_key, public_key = self._generate_dh_keys()
+        private_key, public_key, client_key_b64 = self._generate_dh_keys()
         shared_secret = self._compute_shared_secret(device_public_key, private_key)
         debug_log(f"[ZeroConf] Shared secret computed, length: {len(shared_secret)} bytes")
 
         # 3. Encrypt de credentials blob (dubbele encryptie)
-        # Stap 3a: Bouw credentials structuur
-        debug_log(f"[ZeroConf] Step 4: Building credentials blob...")
-        credentials_blob = self._build_credentials_blob()
-        debug_log(f"[ZeroConf] Credentials blob size: {len(credentials_blob)} bytes, hex: {credentials_blob[:20].hex()}...")
-
-        # Stap 3b: AES-192-ECB encrypt met device_id derived key (inner layer)
-        debug_log(f"[ZeroConf] Step 5: Inner encryption (AES-192-ECB)...")
-        inner_encrypted = self._encrypt_credentials_blob(credentials_blob, device_id)
-        debug_log(f"[ZeroConf] Inner encrypted size: {len(inner_encrypted)} bytes")
-
-        # Stap 3c: Base64 encode voor de outer layer
-        inner_blob_b64 = base64.b64encode(inner_encrypted)
+        # Stap 3a-c: credentials structuur, AES-192-ECB met device_id derived key
+        # (inner layer) en base64 - per deviceID gememoized
+        debug_log(f"[ZeroConf] Step 4-5: Inner blob (AES-192-ECB)...")
+        inner_blob_b64 = self._get_inner_blob(device_id)
         debug_log(f"[ZeroConf] Inner blob b64 length: {len(inner_blob_b64)} bytes")
 
         # Stap 3d: AES-128-CTR encrypt met DH shared secret (outer layer)
@@ -296,15 +395,12 @@ class SpotifyZeroConf:
 
         # 4. Encode voor transport
         blob_b64 = base64.b64encode(encrypted_blob).decode()
-        client_key_b64 = base64.b64encode(
-            self._to_bytes_padded(public_key, DH_KEY_SIZE)
-        ).decode()
         debug_log(f"[ZeroConf] Client key b64 length: {len(client_key_b64)}")
 
         # 5. Stuur addUser request
         debug_log(f"[ZeroConf] Step 7: Sending addUser request to {ip}:{port}...")
         url = f"http://{ip}:{port}/"
-        response = requests.post(
+        response = self._http.post(
             url,
             data={
                 'action': 'addUser',
@@ -332,6 +428,37 @@ class SpotifyZeroConf:
         return bool(info.get('activeUser'))
 
 
+_activators = {}
+_activators_lock = threading.Lock()
+
+
+def get_activator(credentials_path: str = None, access_token: str = None,
+                  username: str = None) -> SpotifyZeroConf:
+    """
+    Gedeelde SpotifyZeroConf client per credentials bestand (of per user bij een access token).
+
+    Houdt credentials en inner blobs in geheugen en start de DH pool, zodat
+    herhaalde activaties alleen nog de netwerk round-trips kosten. Net als bij
+    SpotifyZeroConf gaat een expliciet access_token voor; het credentials
+    bestand wordt alleen gebruikt als er geen token is.
+    """
+    if access_token and username:
+        with _activators_lock:
+            activator = _activators.get(('token', username))
+            if activator is None:
+                activator = _activators[('token', username)] = SpotifyZeroConf(
+                    access_token=access_token, username=username)
+        activator.set_access_token(access_token, username)
+    else:
+        path = credentials_path or os.path.expanduser("~/.cache/librespot/credentials.json")
+        with _activators_lock:
+            activator = _activators.get(path)
+            if activator is None:
+                activator = _activators[path] = SpotifyZeroConf(credentials_path=path)
+    dh_key_pool.start()
+    return activator
+
+
 def activate_librespot(ip: str, port: int, credentials_path: str = None) -> dict:
     """
     Activeer een librespot device.
@@ -344,5 +471,4 @@ def activate_librespot(ip: str, port: int, credentials_path: str = None) -> dict
     Returns:
         Response dict van het device
     """
-    client = SpotifyZeroConf(credentials_path)
-    return client.activate_device(ip, port)
+    return get_activator(credentials_path).activate_device(ip, port)
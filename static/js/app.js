@@ -105,6 +105,15 @@ if (document.readyState === 'loading') {
 // MAIN APPLICATION
 // ============================================
 
+// Initial state embedded by Flask in index.html
+const INITIAL_STATE = (() => {
+    try {
+        return JSON.parse(document.getElementById('initial-state')?.textContent || '{}');
+    } catch (e) {
+        return {};
+    }
+})();
+
 // State management
 let isPlaying = false;
 let currentPlaylistId = null;
@@ -114,7 +123,6 @@ let currentViewMode = 'playlists'; // 'playlists' or 'artists'
 let currentArtistSubView = 'tracks'; // 'tracks' or 'albums' (only used in artists view)
 let isShuffleOn = false;
 let currentTrackId = null;
-let devicePollingInterval = null;
 
 // Bluetooth state
 let bluetoothState = {
@@ -127,7 +135,6 @@ let bluetoothState = {
     pendingPinDevice: null,
     lastKnownCodec: {} // Track previous codec state per device address for disconnecting detection
 };
-let bluetoothPollingInterval = null;
 
 // Theme state
 let currentTheme = 'light';
@@ -184,6 +191,36 @@ function setCache(key, data) {
     }
 }
 
+// Service worker cache holding library API responses (see static/js/sw.js)
+const SW_LIBRARY_CACHE = 'library-api';
+
+async function clearLibraryResponseCache() {
+    if (!('caches' in window)) return;
+    try {
+        await caches.delete(SW_LIBRARY_CACHE);
+    } catch (e) {
+        console.warn('Service worker cache clear failed:', e);
+    }
+}
+
+function registerServiceWorker() {
+    if (!('serviceWorker' in navigator)) return;
+
+    // A new version took over (e.g. after a system update): reload once to pick up the new shell
+    if (navigator.serviceWorker.controller) {
+        let reloading = false;
+        navigator.serviceWorker.addEventListener('controllerchange', () => {
+            if (reloading) return;
+            reloading = true;
+            window.location.reload();
+        });
+    }
+
+    navigator.serviceWorker.register('/sw.js').catch(error => {
+        console.warn('Service worker registration failed:', error);
+    });
+}
+
 function clearPlaylistCache() {
     localStorage.removeItem(CACHE_KEYS.PLAYLISTS);
     Object.keys(localStorage)
@@ -202,6 +239,393 @@ function clearArtistCache() {
         .forEach(k => localStorage.removeItem(k));
 }
 
+// Artwork loading
+const PLACEHOLDER_IMAGE = '/static/img/placeholder.svg';
+// Transparent pixel shown while lazy artwork is pending, so the placeholder colour shows through
+const BLANK_IMAGE = 'data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7';
+
+// Rendered width per view, so the browser can pick the smallest sufficient rendition
+const IMAGE_SIZES = {
+    playlist: '240px',
+    artist: '240px',
+    album: '(max-width: 900px) 45vw, 240px',
+    albumHeader: '175px',
+    track: '140px',
+    nowPlaying: '320px'
+};
+
+// Build a srcset string from the images list returned by the API (smallest first)
+function buildSrcset(images) {
+    if (!images || images.length === 0) return '';
+    return images
+        .filter(img => img.url && img.width)
+        .map(img => `${img.url} ${img.width}w`)
+        .join(', ');
+}
+
+// Lazy loader: only fetch artwork when the tile scrolls into (or near) view
+const lazyImageObserver = 'IntersectionObserver' in window
+    ? new IntersectionObserver((entries, observer) => {
+        entries.forEach(entry => {
+            if (!entry.isIntersecting) return;
+            observer.unobserve(entry.target);
+            loadLazyImage(entry.target);
+        });
+    }, { rootMargin: '300px 0px' })
+    : null;
+
+function loadLazyImage(img) {
+    if (img.dataset.srcset) {
+        img.srcset = img.dataset.srcset;
+        delete img.dataset.srcset;
+    }
+    if (img.dataset.src) {
+        img.src = img.dataset.src;
+        delete img.dataset.src;
+    }
+}
+
+// Configure an <img> for an artwork item: srcset/sizes, async decode, lazy loading and fallback
+function setArtwork(img, item, view, lazy = true) {
+    const src = item?.image || PLACEHOLDER_IMAGE;
+    const srcset = buildSrcset(item?.images);
+
+    img.decoding = 'async';
+    img.style.backgroundColor = item?.placeholder || '';
+    img.onerror = () => {
+        img.onerror = null;
+        img.removeAttribute('srcset');
+        img.src = PLACEHOLDER_IMAGE;
+    };
+    if (srcset) img.sizes = IMAGE_SIZES[view] || '100vw';
+
+    if (lazy && lazyImageObserver && src !== PLACEHOLDER_IMAGE) {
+        img.src = item.placeholder ? BLANK_IMAGE : PLACEHOLDER_IMAGE;
+        img.dataset.src = src;
+        if (srcset) img.dataset.srcset = srcset;
+        lazyImageObserver.observe(img);
+    } else {
+        if (srcset) {
+            img.srcset = srcset;
+        } else {
+            img.removeAttribute('srcset');
+        }
+        img.src = src;
+    }
+}
+
+// ============================================
+// VIRTUAL LIST
+// Windowed rendering with node recycling: only rows in (or near) the
+// viewport exist in the DOM, however long the list is
+// ============================================
+
+class VirtualList {
+    constructor(container, scrollEl, { createRow, updateRow, rowGap = 0, overscan = 4, onNearEnd = null, nearEndRows = 20 }) {
+        this.scrollEl = scrollEl;
+        this.createRow = createRow;
+        this.updateRow = updateRow;
+        this.rowGap = rowGap;
+        this.overscan = overscan;
+        this.onNearEnd = onNearEnd;     // called when the window gets within nearEndRows of the end
+        this.nearEndRows = nearEndRows;
+        this.items = [];
+        this.rowHeight = 0;
+        this.visible = new Map(); // index -> row element
+        this.pool = [];           // detached-from-data rows ready for reuse
+        this.frame = null;
+
+        this.el = document.createElement('div');
+        this.el.className = 'virtual-list';
+        container.appendChild(this.el);
+
+        this.onScroll = () => {
+            if (this.frame) return;
+            this.frame = requestAnimationFrame(() => {
+                this.frame = null;
+                this.render();
+            });
+        };
+        scrollEl.addEventListener('scroll', this.onScroll, { passive: true });
+
+        // Row height follows the panel width (square artwork), so re-measure on resize
+        this.resizeObserver = 'ResizeObserver' in window ? new ResizeObserver(() => this.measure()) : null;
+        if (this.resizeObserver) this.resizeObserver.observe(scrollEl);
+    }
+
+    setItems(items) {
+        this.items = items;
+        // New data: every row has to be filled again
+        this.visible.forEach(row => this.releaseRow(row));
+        this.visible.clear();
+        this.measure();
+    }
+
+    appendItems(items) {
+        this.items = this.items.concat(items);
+        this.el.style.height = `${this.items.length * this.rowHeight}px`;
+        this.render();
+    }
+
+    // Re-apply row state (active/playing) without re-creating any nodes
+    refresh() {
+        this.visible.forEach((row, index) => this.updateRow(row, this.items[index], index));
+    }
+
+    // Re-measure the row height and re-position the existing rows (keeps their artwork)
+    measure() {
+        if (this.items.length > 0) {
+            let height;
+            const [existing] = this.visible.values();
+            if (existing) {
+                height = existing.offsetHeight;
+            } else {
+                const sample = this.acquireRow();
+                sample.style.transform = '';
+                this.updateRow(sample, this.items[0], 0);
+                height = sample.offsetHeight;
+                this.releaseRow(sample);
+            }
+            // Hidden panels measure as 0; keep the last known height until visible again
+            if (height > 0) this.rowHeight = height + this.rowGap;
+        }
+
+        this.visible.forEach((row, index) => {
+            row.style.transform = `translateY(${index * this.rowHeight}px)`;
+        });
+        this.el.style.height = `${this.items.length * this.rowHeight}px`;
+        this.render();
+    }
+
+    render() {
+        if (!this.el.isConnected) {
+            this.destroy();
+            return;
+        }
+        if (!this.rowHeight) return;
+
+        const listTop = this.el.getBoundingClientRect().top;
+        const viewRect = this.scrollEl.getBoundingClientRect();
+        const start = Math.max(0, Math.floor((viewRect.top - listTop) / this.rowHeight) - this.overscan);
+        const end = Math.min(this.items.length, Math.ceil((viewRect.bottom - listTop) / this.rowHeight) + this.overscan);
+
+        // Release rows that left the window
+        this.visible.forEach((row, index) => {
+            if (index < start || index >= end) {
+                this.releaseRow(row);
+                this.visible.delete(index);
+            }
+        });
+
+        // Fill the window, reusing released rows
+        for (let i = start; i < end; i++) {
+            if (this.visible.has(i)) continue;
+            const row = this.acquireRow();
+            this.updateRow(row, this.items[i], i);
+            row.style.transform = `translateY(${i * this.rowHeight}px)`;
+            this.visible.set(i, row);
+        }
+
+        if (this.onNearEnd && end >= this.items.length - this.nearEndRows) this.onNearEnd();
+    }
+
+    acquireRow() {
+        let row = this.pool.pop();
+        if (!row) {
+            row = this.createRow();
+            row.classList.add('virtual-row');
+            this.el.appendChild(row);
+        }
+        row.style.display = '';
+        return row;
+    }
+
+    releaseRow(row) {
+        row.style.display = 'none';
+        this.pool.push(row);
+    }
+
+    destroy() {
+        this.scrollEl.removeEventListener('scroll', this.onScroll);
+        if (this.resizeObserver) this.resizeObserver.disconnect();
+        if (this.frame) cancelAnimationFrame(this.frame);
+        this.el.remove();
+    }
+}
+
+// ============================================
+// POLL GOVERNOR
+// All periodic polling goes through here. Intervals stretch when nothing
+// is playing, the screen hasn't been touched for a while or the page is
+// hidden, and snap back on the next touch.
+// ============================================
+
+const POLL_IDLE_AFTER = 2 * 60 * 1000;        // no touch for 2 minutes
+const POLL_DEEP_IDLE_AFTER = 15 * 60 * 1000;  // no touch for 15 minutes (screen likely off)
+const POLL_MAX_INTERVAL = 5 * 60 * 1000;
+// Interval factors per level, shared with the backend (ActivityGovernor.LEVEL_FACTORS)
+const POLL_LEVEL_FACTORS = INITIAL_STATE.poll_factors || {};
+// The backend forgets clients that stay silent for 5 minutes
+const ACTIVITY_REPORT_INTERVAL = 2 * 60 * 1000;
+
+const pollGovernor = {
+    polls: {},
+    level: 'active', // 'active', 'idle', 'deep-idle' or 'hidden'
+    playing: false,  // isPlaying as last reported to the backend
+    lastInteraction: Date.now(),
+
+    computeLevel() {
+        if (document.hidden) return 'hidden';
+        const idleFor = Date.now() - this.lastInteraction;
+        if (idleFor < POLL_IDLE_AFTER) return 'active';
+        if (idleFor < POLL_DEEP_IDLE_AFTER || isPlaying) return 'idle';
+        return 'deep-idle';
+    },
+
+    interval(poll) {
+        const level = this.level === 'idle' && isPlaying ? 'idle-playing' : this.level;
+        const factor = POLL_LEVEL_FACTORS[level] || 1;
+        return Math.min(poll.baseMs * factor, Math.max(poll.maxMs, poll.baseMs));
+    },
+
+    isPaused(poll) {
+        if (this.level === 'hidden') return poll.pauseWhenHidden || poll.pauseWhenIdle;
+        return this.level === 'deep-idle' && poll.pauseWhenIdle;
+    },
+
+    // Register a poll: fn runs every baseMs while active, governed otherwise
+    start(name, fn, baseMs, { maxMs = POLL_MAX_INTERVAL, pauseWhenHidden = false, pauseWhenIdle = false, immediate = true } = {}) {
+        this.stop(name);
+        const poll = { fn, baseMs, maxMs, pauseWhenHidden, pauseWhenIdle, timer: null, running: false, lastRun: Date.now() };
+        this.polls[name] = poll;
+        if (immediate) {
+            this.run(name);
+        } else {
+            this.schedule(name);
+        }
+    },
+
+    stop(name) {
+        const poll = this.polls[name];
+        if (!poll) return;
+        clearTimeout(poll.timer);
+        delete this.polls[name];
+    },
+
+    stopAll() {
+        Object.keys(this.polls).forEach(name => this.stop(name));
+    },
+
+    schedule(name) {
+        const poll = this.polls[name];
+        if (!poll || poll.running) return;
+        clearTimeout(poll.timer);
+        poll.timer = null;
+        if (this.isPaused(poll)) return;
+
+        // Relative to the last run, so a poll that is overdue after waking up runs right away
+        const delay = Math.max(0, poll.lastRun + this.interval(poll) - Date.now());
+        poll.timer = setTimeout(() => this.run(name), delay);
+    },
+
+    async run(name) {
+        const poll = this.polls[name];
+        if (!poll) return;
+        poll.running = true;
+        poll.lastRun = Date.now();
+        try {
+            await poll.fn();
+        } catch (error) {
+            console.error(`Poll '${name}' failed:`, error);
+        }
+        poll.running = false;
+        this.updateLevel();
+        if (this.polls[name] === poll) this.schedule(name);
+    },
+
+    updateLevel() {
+        const level = this.computeLevel();
+        // Playback starting/stopping changes the intervals too, also at the same level
+        if (level === this.level && isPlaying === this.playing) return;
+        this.level = level;
+        this.playing = isPlaying;
+        Object.keys(this.polls).forEach(name => this.schedule(name));
+        reportActivityLevel(level);
+    },
+
+    noteInteraction() {
+        this.lastInteraction = Date.now();
+        if (this.level !== 'active') this.updateLevel();
+    }
+};
+
+// Let the backend throttle its own background work the same way
+function reportActivityLevel(level) {
+    fetch('/api/activity', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ level, playing: isPlaying }),
+        keepalive: true
+    }).catch(() => {});
+}
+
+['pointerdown', 'mousedown', 'touchstart', 'keydown', 'wheel'].forEach(eventName => {
+    document.addEventListener(eventName, () => pollGovernor.noteInteraction(), { capture: true, passive: true });
+});
+document.addEventListener('visibilitychange', () => pollGovernor.updateLevel());
+reportActivityLevel(pollGovernor.level);
+setInterval(() => reportActivityLevel(pollGovernor.level), ACTIVITY_REPORT_INTERVAL);
+
+// ============================================
+// BACKGROUND JOBS
+// Slow operations (activation, pairing, updates) answer 202 with a job id;
+// runJob polls the job's status until it finishes (short requests, so
+// waiting clients never tie up the server's worker threads)
+// ============================================
+
+const JOB_POLL_INTERVAL = 1000;
+
+function waitForJob(job, onProgress = null) {
+    return new Promise((resolve, reject) => {
+        const poll = async () => {
+            try {
+                const response = await fetch(job.status_url);
+                if (!response.ok) throw new Error(`Job status ${response.status}`);
+                const data = await response.json();
+                if (onProgress) onProgress(data);
+                if (data.state === 'done' || data.state === 'failed') {
+                    resolve(data);
+                } else {
+                    setTimeout(poll, JOB_POLL_INTERVAL);
+                }
+            } catch (error) {
+                reject(error);
+            }
+        };
+        poll();
+    });
+}
+
+// fetch() for job endpoints: resolves to { ok, status, data } of the job's result
+async function runJob(url, options = {}, onProgress = null) {
+    const response = await fetch(url, options);
+    const data = await response.json();
+    if (response.status !== 202 || !data.job_id) {
+        return { ok: response.ok, status: response.status, data };
+    }
+
+    const job = await waitForJob(data, onProgress);
+    const status = job.http_status || 500;
+    return { ok: status < 400, status, data: job.result || {} };
+}
+
+// Virtual lists for the sidebar (playlists/artists) and the tracks panel
+let sidebarList = null;
+let trackList = null;
+const TRACK_PAGE_SIZE = 100;
+let trackLoadGeneration = 0;
+let trackPaging = null;  // { playlistId, tracks, nextOffset, loading } of a partly loaded playlist
+
 // URL State Persistence
 function updateURL() {
     const params = new URLSearchParams();
@@ -287,34 +711,16 @@ async function restoreFromURL() {
     }
 }
 
-// Helper to highlight playlist item by ID
+// Helper to highlight playlist item by ID (active state is derived from currentPlaylistId)
 function highlightPlaylistItem(playlistId) {
-    // Get cached playlists to find the index
-    const cached = getCache(CACHE_KEYS.PLAYLISTS);
-    if (!cached) return;
-
-    const index = cached.findIndex(p => p.id === playlistId);
-    if (index === -1) return;
-
-    const playlistItems = document.querySelectorAll('.playlist-item');
-    playlistItems.forEach((btn, i) => {
-        btn.classList.toggle('active', i === index);
-    });
+    currentPlaylistId = playlistId;
+    if (sidebarList) sidebarList.refresh();
 }
 
-// Helper to highlight artist item by ID
+// Helper to highlight artist item by ID (active state is derived from currentArtistId)
 function highlightArtistItem(artistId) {
-    // Get cached artists to find the index
-    const cached = getCache(CACHE_KEYS.ARTISTS);
-    if (!cached) return;
-
-    const index = cached.findIndex(a => a.id === artistId);
-    if (index === -1) return;
-
-    const artistItems = document.querySelectorAll('.artist-item');
-    artistItems.forEach((btn, i) => {
-        btn.classList.toggle('active', i === index);
-    });
+    currentArtistId = artistId;
+    if (sidebarList) sidebarList.refresh();
 }
 
 // Helper to load tracks by ID (without button reference)
@@ -322,8 +728,7 @@ async function loadTracksById(playlistId) {
     currentPlaylistId = playlistId;
     currentArtistId = null;
 
-    const cacheKey = CACHE_KEYS.TRACKS_PREFIX + playlistId;
-    const cached = getCache(cacheKey);
+    const cached = getCache(CACHE_KEYS.TRACKS_PREFIX + playlistId);
     if (cached) {
         renderTracks(cached);
         return;
@@ -332,16 +737,61 @@ async function loadTracksById(playlistId) {
     tracksContainer.innerHTML = `<div class="loading">${t('loading.tracks')}</div>`;
 
     try {
-        const response = await fetch(`/api/playlist/${playlistId}`);
-        const tracks = await response.json();
-        setCache(cacheKey, tracks);
-        renderTracks(tracks);
+        await fetchPlaylistTracks(playlistId);
     } catch (error) {
         console.error('Error loading tracks:', error);
         tracksContainer.innerHTML = `<div class="empty-state">${t('error.loadTracks')}</div>`;
     }
 }
 
+async function fetchTrackPage(playlistId, offset) {
+    const response = await fetch(`/api/playlist/${playlistId}?offset=${offset}&limit=${TRACK_PAGE_SIZE}`);
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    return response.json();
+}
+
+// Fetch the first page of a playlist; later pages are only fetched when the
+// user scrolls near the end of the list (see loadNextTrackPage)
+async function fetchPlaylistTracks(playlistId) {
+    // Each load gets its own token: on restore the same playlist can be
+    // requested twice, and only the latest load may render
+    const generation = ++trackLoadGeneration;
+    const page = await fetchTrackPage(playlistId, 0);
+    if (generation !== trackLoadGeneration || currentPlaylistId !== playlistId) return;
+
+    if (page.next_offset === null) {
+        setCache(CACHE_KEYS.TRACKS_PREFIX + playlistId, page.items);
+        renderTracks(page.items);
+        return;
+    }
+
+    renderTracks(page.items, { playlistId, tracks: page.items, nextOffset: page.next_offset, loading: false });
+}
+
+async function loadNextTrackPage(paging) {
+    if (paging.loading || paging.nextOffset === null) return;
+
+    paging.loading = true;
+    let page;
+    try {
+        page = await fetchTrackPage(paging.playlistId, paging.nextOffset);
+    } catch (error) {
+        console.error('Error loading more tracks:', error);
+        return;  // Retried on the next scroll
+    } finally {
+        paging.loading = false;
+    }
+
+    // The list was replaced meanwhile
+    if (trackPaging !== paging || !trackList) return;
+
+    paging.tracks = paging.tracks.concat(page.items);
+    paging.nextOffset = page.next_offset;
+    // Only complete lists are cached
+    if (paging.nextOffset === null) setCache(CACHE_KEYS.TRACKS_PREFIX + paging.playlistId, paging.tracks);
+    trackList.appendItems(page.items);
+}
+
 // Helper to load artist tracks by ID (without button reference)
 async function loadArtistTracksById(artistId) {
     currentArtistId = artistId;
@@ -416,6 +866,7 @@ async function loadAlbumTracksById(albumId) {
 let isAudioSwitching = false;
 let lastSwitchTime = 0;
 const COOLDOWN_MS = 2000; // 2 seconds cooldown after successful switch
+const AUDIO_SWITCH_RAMP_MS = 250;
 
 // DOM Elements
 const playlistsContainer = document.getElementById('playlists-container');
@@ -460,7 +911,6 @@ const albumBackBtn = document.getElementById('album-back-btn');
 let trackDuration = 0;
 let trackProgress = 0;
 let lastProgressUpdate = Date.now();
-let progressInterpolationInterval = null;
 
 // Volume slider state
 let isVolumeAdjusting = false;
@@ -528,28 +978,72 @@ function renderAudioDevices(container, data, errorMessage = null) {
 }
 
 // Perform logout with cleanup
-function performLogout() {
-    // Stop all polling intervals
-    if (progressInterpolationInterval) {
-        clearInterval(progressInterpolationInterval);
-    }
-    stopDevicePolling();
+async function performLogout() {
+    // Stop all polling
+    pollGovernor.stopAll();
 
     // Clear all browser storage
     localStorage.clear();
     sessionStorage.clear();
+    if ('caches' in window) {
+        try {
+            const keys = await caches.keys();
+            await Promise.all(keys.map(key => caches.delete(key)));
+        } catch (e) {
+            console.warn('Cache clear failed:', e);
+        }
+    }
 
     // Hard redirect to prevent back-button issues
     window.location.replace('/logout');
 }
 
+// Now-playing and volume in the embedded state are only trusted this long; a page
+// served from the service worker cache can be hours old
+const INITIAL_STATE_MAX_AGE = 10000;
+
+// Apply the state Flask embedded in index.html (see build_initial_state in app.py).
+// Library data is seeded into the localStorage cache so the loaders render without fetching.
+function hydrateInitialState() {
+    const state = INITIAL_STATE;
+    const fresh = !!state.generated_at && Math.abs(Date.now() - state.generated_at) < INITIAL_STATE_MAX_AGE;
+
+    if (state.playlists && !getCache(CACHE_KEYS.PLAYLISTS)) {
+        setCache(CACHE_KEYS.PLAYLISTS, state.playlists);
+    }
+    if (state.artists && !getCache(CACHE_KEYS.ARTISTS)) {
+        setCache(CACHE_KEYS.ARTISTS, state.artists);
+    }
+    Object.entries(state.tracks || {}).forEach(([playlistId, tracks]) => {
+        if (!getCache(CACHE_KEYS.TRACKS_PREFIX + playlistId)) {
+            setCache(CACHE_KEYS.TRACKS_PREFIX + playlistId, tracks);
+        }
+    });
+
+    if (state.volume_settings) applyVolumeSettings(state.volume_settings);
+    if (!fresh) {
+        // Stale page: let the regular loaders fetch now-playing and volume right away
+        return { current: false, volume: false };
+    }
+
+    if (state.current) applyCurrentTrack(state.current);
+    if (state.volume !== undefined) applySystemVolume(state.volume);
+
+    return {
+        current: !!state.current,
+        volume: state.volume !== undefined
+    };
+}
+
 // Initialize app
 document.addEventListener('DOMContentLoaded', () => {
+    registerServiceWorker();
     loadSavedTheme();
+    const hydrated = hydrateInitialState();
     restoreFromURL(); // Restore state from URL or load defaults
     preloadAudioDevices(); // Preload audio devices in background
-    loadSystemVolume(); // Sync volume slider with system audio
-    startCurrentTrackPolling();
+    if (!hydrated.volume) loadSystemVolume(); // Sync volume slider with system audio
+    startCurrentTrackPolling(hydrated.current);
     startProgressInterpolation();
     setupEventListeners();
     setupThemeListeners();
@@ -611,8 +1105,7 @@ function setupEventListeners() {
         restartLibrespotBtn.addEventListener('click', async () => {
             restartLibrespotBtn.disabled = true;
             try {
-                const response = await fetch('/api/system/restart-librespot', { method: 'POST' });
-                const data = await response.json();
+                const { data } = await runJob('/api/system/restart-librespot', { method: 'POST' });
                 if (data.success) {
                     showToast(t('settings.librespotRestarted'), 'info');
                 } else {
@@ -731,6 +1224,8 @@ async function loadPlaylists() {
 
 // Render playlists to DOM
 function renderPlaylists(playlists) {
+    if (sidebarList) sidebarList.destroy();
+    sidebarList = null;
     playlistsContainer.innerHTML = '';
 
     if (playlists.length === 0) {
@@ -738,34 +1233,38 @@ function renderPlaylists(playlists) {
         return;
     }
 
-    playlists.forEach(playlist => {
-        const btn = document.createElement('button');
-        btn.className = 'playlist-item';
-
-        // Always create image element with fallback to prevent layout shift
-        const img = document.createElement('img');
-        img.src = playlist.image || '/static/img/placeholder.svg';
-        img.alt = playlist.name;
-        img.className = 'playlist-image';
-        btn.appendChild(img);
-
-        // Create text element
-        const nameSpan = document.createElement('span');
-        nameSpan.className = 'playlist-name';
-        nameSpan.textContent = playlist.name;
-        btn.appendChild(nameSpan);
-
-        btn.onclick = () => loadTracks(playlist.id, btn);
-        playlistsContainer.appendChild(btn);
+    sidebarList = new VirtualList(playlistsContainer, playlistsContainer, {
+        rowGap: 10,
+        createRow: () => {
+            const btn = document.createElement('button');
+            btn.className = 'playlist-item';
+
+            // Always create image element with fallback to prevent layout shift
+            const img = document.createElement('img');
+            img.className = 'playlist-image';
+            btn.appendChild(img);
+
+            // Create text element
+            const nameSpan = document.createElement('span');
+            nameSpan.className = 'playlist-name';
+            btn.appendChild(nameSpan);
+
+            btn.onclick = () => loadTracks(btn.dataset.id);
+            return btn;
+        },
+        updateRow: (btn, playlist) => {
+            btn.dataset.id = playlist.id;
+            btn.classList.toggle('active', playlist.id === currentPlaylistId);
+            const img = btn.firstChild;
+            setArtwork(img, playlist, 'playlist');
+            img.alt = playlist.name;
+            btn.lastChild.textContent = playlist.name;
+        }
     });
+    sidebarList.setItems(playlists);
 
     // Automatically load first playlist
-    if (playlists.length > 0) {
-        const firstBtn = playlistsContainer.querySelector('.playlist-item');
-        if (firstBtn) {
-            loadTracks(playlists[0].id, firstBtn);
-        }
-    }
+    loadTracks(playlists[0].id);
 }
 
 // Switch between playlists and artists view
@@ -851,7 +1350,7 @@ function switchArtistSubView(subview) {
 
     // Load appropriate content
     if (subview === 'tracks') {
-        loadArtistTracks(currentArtistId, document.querySelector('.artist-item.active'));
+        loadArtistTracks(currentArtistId);
     } else {
         loadArtistAlbums(currentArtistId);
     }
@@ -883,6 +1382,8 @@ async function loadArtists() {
 
 // Render artists to DOM
 function renderArtists(artists) {
+    if (sidebarList) sidebarList.destroy();
+    sidebarList = null;
     playlistsContainer.innerHTML = '';
 
     if (artists.length === 0) {
@@ -890,48 +1391,49 @@ function renderArtists(artists) {
         return;
     }
 
-    artists.forEach(artist => {
-        const btn = document.createElement('button');
-        btn.className = 'artist-item';
-
-        // Create circular image
-        const img = document.createElement('img');
-        img.src = artist.image || '/static/img/placeholder.svg';
-        img.alt = artist.name;
-        img.className = 'artist-image';
-        btn.appendChild(img);
-
-        // Create name element
-        const nameSpan = document.createElement('span');
-        nameSpan.className = 'artist-name';
-        nameSpan.textContent = artist.name;
-        btn.appendChild(nameSpan);
-
-        btn.onclick = () => loadArtistTracks(artist.id, btn);
-        playlistsContainer.appendChild(btn);
+    sidebarList = new VirtualList(playlistsContainer, playlistsContainer, {
+        rowGap: 10,
+        createRow: () => {
+            const btn = document.createElement('button');
+            btn.className = 'artist-item';
+
+            // Create circular image
+            const img = document.createElement('img');
+            img.className = 'artist-image';
+            btn.appendChild(img);
+
+            // Create name element
+            const nameSpan = document.createElement('span');
+            nameSpan.className = 'artist-name';
+            btn.appendChild(nameSpan);
+
+            btn.onclick = () => loadArtistTracks(btn.dataset.id);
+            return btn;
+        },
+        updateRow: (btn, artist) => {
+            btn.dataset.id = artist.id;
+            btn.classList.toggle('active', artist.id === currentArtistId);
+            const img = btn.firstChild;
+            setArtwork(img, artist, 'artist');
+            img.alt = artist.name;
+            btn.lastChild.textContent = artist.name;
+        }
     });
+    sidebarList.setItems(artists);
 
     // Automatically load first artist
-    if (artists.length > 0) {
-        const firstBtn = playlistsContainer.querySelector('.artist-item');
-        if (firstBtn) {
-            loadArtistTracks(artists[0].id, firstBtn);
-        }
-    }
+    loadArtistTracks(artists[0].id);
 }
 
 // Load top tracks from artist
-async function loadArtistTracks(artistId, artistBtn) {
+async function loadArtistTracks(artistId) {
     // Store current artist ID (no playlist context for artist tracks)
     currentArtistId = artistId;
     currentPlaylistId = null; // Clear playlist context
     currentAlbumId = null; // Clear album context
 
     // Update active state
-    document.querySelectorAll('.artist-item').forEach(btn => {
-        btn.classList.remove('active');
-    });
-    if (artistBtn) artistBtn.classList.add('active');
+    if (sidebarList) sidebarList.refresh();
 
     // Reset sub-toggle to tracks when selecting a new artist
     currentArtistSubView = 'tracks';
@@ -1013,7 +1515,7 @@ function renderAlbums(albums) {
 
         // Album image
         const img = document.createElement('img');
-        img.src = album.image || '/static/img/placeholder.svg';
+        setArtwork(img, album, 'album');
         img.alt = album.name;
         img.className = 'album-image';
         albumDiv.appendChild(img);
@@ -1108,7 +1610,6 @@ function renderAlbumTracks(tracks) {
     }
 
     // Album header
-    const albumImage = tracks[0]?.image || '/static/img/placeholder.svg';
     const albumName = tracks[0]?.album || '';
     const artistName = tracks[0]?.artist || '';
     const releaseYear = tracks[0]?.release_date?.split('-')[0] || '';
@@ -1133,7 +1634,7 @@ function renderAlbumTracks(tracks) {
 
     const img = document.createElement('img');
     img.className = 'album-header-image';
-    img.src = albumImage;
+    setArtwork(img, tracks[0], 'albumHeader', false);
     img.alt = escapeHtml(albumName);
     imageContainer.appendChild(img);
 
@@ -1218,16 +1719,13 @@ function formatTotalDuration(ms) {
 }
 
 // Load tracks from playlist
-async function loadTracks(playlistId, playlistBtn) {
+async function loadTracks(playlistId) {
     // Store current playlist ID for playback context
     currentPlaylistId = playlistId;
     currentArtistId = null; // Clear artist context
 
     // Update active state
-    document.querySelectorAll('.playlist-item').forEach(btn => {
-        btn.classList.remove('active');
-    });
-    playlistBtn.classList.add('active');
+    if (sidebarList) sidebarList.refresh();
 
     const cacheKey = CACHE_KEYS.TRACKS_PREFIX + playlistId;
 
@@ -1242,21 +1740,19 @@ async function loadTracks(playlistId, playlistBtn) {
     tracksContainer.innerHTML = '<div class="loading">Nummers laden...</div>';
 
     try {
-        const response = await fetch(`/api/playlist/${playlistId}`);
-        const tracks = await response.json();
-
-        // Cache the result
-        setCache(cacheKey, tracks);
-        renderTracks(tracks);
         updateURL();
+        await fetchPlaylistTracks(playlistId);
     } catch (error) {
         console.error('Error loading tracks:', error);
         tracksContainer.innerHTML = `<div class="empty-state">${t('error.loadTracks')}</div>`;
     }
 }
 
-// Render tracks to DOM
-function renderTracks(tracks) {
+// Render tracks to DOM (paging: state of a playlist that has more pages to load)
+function renderTracks(tracks, paging = null) {
+    if (trackList) trackList.destroy();
+    trackList = null;
+    trackPaging = paging;
     tracksContainer.innerHTML = '';
 
     if (tracks.length === 0) {
@@ -1264,55 +1760,57 @@ function renderTracks(tracks) {
         return;
     }
 
-    // Compact list layout for all tracks
-    const listContainer = document.createElement('div');
-    listContainer.className = 'top-tracks-list';
-
-    tracks.forEach(track => {
-        const trackDiv = document.createElement('div');
-        trackDiv.className = 'top-track-item';
-        trackDiv.setAttribute('data-track-id', track.id);
-        trackDiv.setAttribute('data-uri', track.uri);
-
-        // Thumbnail
-        const img = document.createElement('img');
-        img.src = track.image || '/static/img/placeholder.svg';
-        img.alt = track.name;
-        img.className = 'top-track-image';
-        trackDiv.appendChild(img);
-
-        // Info container (artist + title)
-        const infoDiv = document.createElement('div');
-        infoDiv.className = 'top-track-info';
-
-        // Artist (above title)
-        const artist = document.createElement('span');
-        artist.className = 'top-track-artist';
-        artist.textContent = track.artist;
-        infoDiv.appendChild(artist);
-
-        // Title
-        const title = document.createElement('span');
-        title.className = 'top-track-title';
-        title.textContent = track.name;
-        infoDiv.appendChild(title);
-
-        trackDiv.appendChild(infoDiv);
-
-        // Duration
-        const duration = document.createElement('span');
-        duration.className = 'top-track-duration';
-        duration.textContent = formatDuration(track.duration_ms);
-        trackDiv.appendChild(duration);
-
-        trackDiv.onclick = () => playTrack(track.uri);
-        listContainer.appendChild(trackDiv);
+    // Compact list layout, only the visible rows are in the DOM
+    trackList = new VirtualList(tracksContainer, tracksContainer.parentElement, {
+        rowGap: 4,
+        onNearEnd: paging ? () => loadNextTrackPage(paging) : null,
+        createRow: () => {
+            const trackDiv = document.createElement('div');
+            trackDiv.className = 'top-track-item';
+
+            // Thumbnail
+            const img = document.createElement('img');
+            img.className = 'top-track-image';
+            trackDiv.appendChild(img);
+
+            // Info container (artist + title)
+            const infoDiv = document.createElement('div');
+            infoDiv.className = 'top-track-info';
+
+            // Artist (above title)
+            const artist = document.createElement('span');
+            artist.className = 'top-track-artist';
+            infoDiv.appendChild(artist);
+
+            // Title
+            const title = document.createElement('span');
+            title.className = 'top-track-title';
+            infoDiv.appendChild(title);
+
+            trackDiv.appendChild(infoDiv);
+
+            // Duration
+            const duration = document.createElement('span');
+            duration.className = 'top-track-duration';
+            trackDiv.appendChild(duration);
+
+            trackDiv.onclick = () => playTrack(trackDiv.getAttribute('data-uri'));
+            return trackDiv;
+        },
+        updateRow: (trackDiv, track) => {
+            trackDiv.setAttribute('data-track-id', track.id);
+            trackDiv.setAttribute('data-uri', track.uri);
+            trackDiv.classList.toggle('playing', !!currentTrackId && track.id === currentTrackId);
+
+            const [img, infoDiv, duration] = trackDiv.children;
+            setArtwork(img, track, 'track');
+            img.alt = track.name;
+            infoDiv.children[0].textContent = track.artist;
+            infoDiv.children[1].textContent = track.name;
+            duration.textContent = formatDuration(track.duration_ms);
+        }
     });
-
-    tracksContainer.appendChild(listContainer);
-
-    // Highlight currently playing track if any
-    highlightCurrentTrack();
+    trackList.setItems(tracks);
 }
 
 // Play specific track
@@ -1320,9 +1818,8 @@ async function playTrack(uri) {
     try {
         // Collect track URIs for artist top tracks (no playlist/album context)
         let trackUris = null;
-        if (currentArtistId && !currentPlaylistId && !currentAlbumId) {
-            const trackItems = document.querySelectorAll('.top-track-item[data-uri]');
-            const allUris = Array.from(trackItems).map(item => item.getAttribute('data-uri'));
+        if (currentArtistId && !currentPlaylistId && !currentAlbumId && trackList) {
+            const allUris = trackList.items.map(track => track.uri);
             const startIndex = allUris.indexOf(uri);
             if (startIndex !== -1) {
                 trackUris = allUris.slice(startIndex);
@@ -1466,41 +1963,47 @@ async function loadSystemVolume() {
     try {
         const response = await fetch('/api/audio/volume');
         const data = await response.json();
-        if (data.volume !== undefined) {
-            volumeSlider.value = data.volume;
-            updateVolumeIcon(data.volume);
-        }
+        applySystemVolume(data.volume);
         // Note: volumeSlider.max stays at 100 - backend handles scaling to actual max_volume
     } catch (error) {
         console.error('Error loading system volume:', error);
     }
 }
 
+function applySystemVolume(volume) {
+    if (volume !== undefined) {
+        volumeSlider.value = volume;
+        updateVolumeIcon(volume);
+    }
+}
+
 // Load volume settings (default and max) and sync sliders
 async function loadVolumeSettings() {
     try {
         const response = await fetch('/api/settings/volume');
-        const data = await response.json();
+        applyVolumeSettings(await response.json());
+    } catch (error) {
+        console.error('Error loading volume settings:', error);
+    }
+}
 
-        // Update default volume slider
-        if (data.default_volume !== undefined && defaultVolumeSlider && defaultVolumeValue) {
-            defaultVolumeSlider.value = data.default_volume;
-            defaultVolumeValue.textContent = data.default_volume + '%';
-        }
+function applyVolumeSettings(data) {
+    // Update default volume slider
+    if (data.default_volume !== undefined && defaultVolumeSlider && defaultVolumeValue) {
+        defaultVolumeSlider.value = data.default_volume;
+        defaultVolumeValue.textContent = data.default_volume + '%';
+    }
 
-        // Update max volume slider
-        if (data.max_volume !== undefined && maxVolumeSlider && maxVolumeValueEl) {
-            maxVolumeSlider.value = data.max_volume;
-            maxVolumeValueEl.textContent = data.max_volume + '%';
-            currentMaxVolume = data.max_volume;
+    // Update max volume slider
+    if (data.max_volume !== undefined && maxVolumeSlider && maxVolumeValueEl) {
+        maxVolumeSlider.value = data.max_volume;
+        maxVolumeValueEl.textContent = data.max_volume + '%';
+        currentMaxVolume = data.max_volume;
 
-            // Update default slider max to not exceed max volume
-            if (defaultVolumeSlider) {
-                defaultVolumeSlider.max = data.max_volume;
-            }
+        // Update default slider max to not exceed max volume
+        if (defaultVolumeSlider) {
+            defaultVolumeSlider.max = data.max_volume;
         }
-    } catch (error) {
-        console.error('Error loading volume settings:', error);
     }
 }
 
@@ -1605,17 +2108,15 @@ function updateVolumeIcon(volume) {
 
 // Start progress interpolation interval
 function startProgressInterpolation() {
-    if (progressInterpolationInterval) {
-        clearInterval(progressInterpolationInterval);
-    }
-    progressInterpolationInterval = setInterval(() => {
+    // Purely visual: fixed 1s tick, paused while hidden or deep idle (catches up on resume)
+    pollGovernor.start('progress', () => {
         if (isPlaying && trackDuration > 0) {
             const elapsed = Date.now() - lastProgressUpdate;
             trackProgress = Math.min(trackProgress + elapsed, trackDuration);
             lastProgressUpdate = Date.now();
             updateProgressDisplay();
         }
-    }, 1000);
+    }, 1000, { maxMs: 1000, pauseWhenIdle: true, immediate: false });
 }
 
 // Update progress display
@@ -1734,69 +2235,76 @@ async function updateCurrentTrack() {
     try {
         const response = await fetch('/api/current');
         const data = await response.json();
+        applyCurrentTrack(data);
+    } catch (error) {
+        console.error('Error updating current track:', error);
+    }
+}
 
-        if (data.playing !== undefined) {
-            isPlaying = data.playing;
-            updatePlayPauseButton();
-        }
-
-        if (data.shuffle !== undefined) {
-            isShuffleOn = data.shuffle;
-            updateShuffleButton();
-        }
+// Render now-playing state from an /api/current response
+function applyCurrentTrack(data) {
+    if (data.playing !== undefined) {
+        isPlaying = data.playing;
+        updatePlayPauseButton();
+    }
 
-        // Volume is now controlled via system audio, not Spotify
-        // Volume slider is synced via loadSystemVolume() on page load
-
-        if (data.track) {
-            // Track playing - show real data
-            albumArt.src = data.track.image || '/static/img/placeholder.svg';
-            albumArt.classList.remove('hidden');
-            noTrack.style.display = 'none';
-            trackName.textContent = data.track.name;
-            trackArtist.textContent = data.track.artist;
-
-            // Update progress (met validatie voor ongeldige waarden)
-            trackDuration = data.track.duration_ms || 0;
-
-            // Check if this is the same track BEFORE updating currentTrackId
-            const isSameTrack = currentTrackId === data.track.id;
-            const newProgress = data.track.progress_ms || 0;
-
-            // Only update progress from API if:
-            // 1. Track changed (need to reset even if progress is 0), OR
-            // 2. API returned valid progress (> 0)
-            // Otherwise keep locally interpolated progress (librespot bug workaround)
-            if (!isSameTrack || newProgress > 0) {
-                trackProgress = newProgress;
-                if (trackProgress < 0) trackProgress = 0;
-                if (trackDuration > 0 && trackProgress > trackDuration) trackProgress = trackDuration;
-                lastProgressUpdate = Date.now();
-            }
+    if (data.shuffle !== undefined) {
+        isShuffleOn = data.shuffle;
+        updateShuffleButton();
+    }
 
-            // Store current track ID and highlight in list (AFTER progress check)
-            currentTrackId = data.track.id;
-            highlightCurrentTrack();
+    // Volume is now controlled via system audio, not Spotify
+    // Volume slider is synced via loadSystemVolume() on page load
 
-            updateProgressDisplay();
-        } else {
-            // No track playing - show placeholders (keep elements visible)
-            albumArt.classList.add('hidden');
-            noTrack.style.display = 'block';
-            trackName.textContent = '-';
-            trackArtist.textContent = '-';
-
-            // Clear current track ID and remove highlights
-            currentTrackId = null;
-            highlightCurrentTrack();
-
-            // Reset progress to 0:00
-            trackDuration = 0;
-            trackProgress = 0;
-            updateProgressDisplay();
+    if (data.track) {
+        // Track playing - show real data
+        if (albumArt.dataset.trackId !== data.track.id) {
+            albumArt.dataset.trackId = data.track.id;
+            setArtwork(albumArt, data.track, 'nowPlaying', false);
         }
-    } catch (error) {
-        console.error('Error updating current track:', error);
+        albumArt.classList.remove('hidden');
+        noTrack.style.display = 'none';
+        trackName.textContent = data.track.name;
+        trackArtist.textContent = data.track.artist;
+
+        // Update progress (met validatie voor ongeldige waarden)
+        trackDuration = data.track.duration_ms || 0;
+
+        // Check if this is the same track BEFORE updating currentTrackId
+        const isSameTrack = currentTrackId === data.track.id;
+        const newProgress = data.track.progress_ms || 0;
+
+        // Only update progress from API if:
+        // 1. Track changed (need to reset even if progress is 0), OR
+        // 2. API returned valid progress (> 0)
+        // Otherwise keep locally interpolated progress (librespot bug workaround)
+        if (!isSameTrack || newProgress > 0) {
+            trackProgress = newProgress;
+            if (trackProgress < 0) trackProgress = 0;
+            if (trackDuration > 0 && trackProgress > trackDuration) trackProgress = trackDuration;
+            lastProgressUpdate = Date.now();
+        }
+
+        // Store current track ID and highlight in list (AFTER progress check)
+        currentTrackId = data.track.id;
+        highlightCurrentTrack();
+
+        updateProgressDisplay();
+    } else {
+        // No track playing - show placeholders (keep elements visible)
+        albumArt.classList.add('hidden');
+        noTrack.style.display = 'block';
+        trackName.textContent = '-';
+        trackArtist.textContent = '-';
+
+        // Clear current track ID and remove highlights
+        currentTrackId = null;
+        highlightCurrentTrack();
+
+        // Reset progress to 0:00
+        trackDuration = 0;
+        trackProgress = 0;
+        updateProgressDisplay();
     }
 }
 
@@ -1810,6 +2318,9 @@ function highlightCurrentTrack() {
     // If no track is playing, we're done
     if (!currentTrackId) return;
 
+    // Rows of the virtual track list pick up the playing state when (re)rendered;
+    // this loop covers the ones currently on screen and the album view
+
     // Find and highlight the matching track
     document.querySelectorAll('.album-track-item[data-track-id], .track-item[data-track-id], .top-track-item[data-track-id]').forEach(el => {
         if (el.getAttribute('data-track-id') === currentTrackId) {
@@ -1846,7 +2357,8 @@ function hideSettingsModal() {
 }
 
 // Refresh content (playlists or artists based on current view)
-function refreshPlaylists() {
+async function refreshPlaylists() {
+    await clearLibraryResponseCache();
     if (currentViewMode === 'playlists') {
         clearPlaylistCache();
         loadPlaylists();
@@ -1934,50 +2446,34 @@ async function loadNetworkStatus() {
 
 // Start device polling (every 3 seconds)
 function startDevicePolling() {
-    stopDevicePolling(); // Clear any existing interval
-    devicePollingInterval = setInterval(loadDevices, 3000);
+    pollGovernor.start('devices', loadDevices, 3000, { pauseWhenHidden: true, immediate: false });
 }
 
 // Stop device polling
 function stopDevicePolling() {
-    if (devicePollingInterval) {
-        clearInterval(devicePollingInterval);
-        devicePollingInterval = null;
-    }
+    pollGovernor.stop('devices');
 }
 
 // Load Spotify devices (API + local mDNS)
 async function loadDevices() {
     try {
-        // Fetch both Spotify API devices and local mDNS devices in parallel
-        const [apiResponse, localResponse] = await Promise.all([
-            fetch('/api/devices'),
-            fetch('/api/spotify-connect/local')
-        ]);
-
-        const apiData = await apiResponse.json();
-        const localData = await localResponse.json();
+        // One call: the backend registry merges Spotify API devices and local mDNS devices
+        const response = await fetch('/api/devices/all');
+        const data = await response.json();
 
         const devicesList = document.getElementById('devices-list');
         devicesList.innerHTML = '';
 
-        const apiDevices = apiData.devices || [];
-        const localDevices = localData.devices || [];
+        const allDevices = data.devices || [];
+        const apiDevices = allDevices.filter(d => d.source === 'spotify');
 
         // Check if local devices should be shown (toggle setting)
+        // Local devices already known to Spotify are merged into their API entry by the backend
         const showLocalDevices = localStorage.getItem('showLocalDevices') !== 'false';
-
-        // Filter local devices: only show if NOT already in API devices (match on name)
-        const apiDeviceNames = apiDevices.map(d => d.name.toLowerCase());
-        const filteredLocalDevices = showLocalDevices ? localDevices.filter(localDevice => {
-            const localName = (localDevice.remote_name || localDevice.name).toLowerCase();
-            return !apiDeviceNames.some(apiName =>
-                apiName.includes(localName) || localName.includes(apiName)
-            );
-        }) : [];
+        const localDevices = showLocalDevices ? allDevices.filter(d => d.source === 'local') : [];
 
         // Check if we have any devices to show
-        if (apiDevices.length === 0 && filteredLocalDevices.length === 0) {
+        if (apiDevices.length === 0 && localDevices.length === 0) {
             devicesList.innerHTML = `<div class="empty-state">${t('empty.noDevices')}</div>`;
             return;
         }
@@ -1988,8 +2484,8 @@ async function loadDevices() {
             devicesList.appendChild(deviceDiv);
         });
 
-        // Render filtered local devices (if any)
-        if (filteredLocalDevices.length > 0) {
+        // Render local devices (if any)
+        if (localDevices.length > 0) {
             // Add separator if there are also API devices
             if (apiDevices.length > 0) {
                 const separator = document.createElement('div');
@@ -1998,7 +2494,7 @@ async function loadDevices() {
                 devicesList.appendChild(separator);
             }
 
-            filteredLocalDevices.forEach(device => {
+            localDevices.forEach(device => {
                 const deviceDiv = createLocalDeviceElement(device);
                 devicesList.appendChild(deviceDiv);
             });
@@ -2069,7 +2565,7 @@ async function selectLocalDevice(device) {
         const response = await fetch('/api/transfer-playback-local', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ device_id: deviceId })
+            body: JSON.stringify({ device_id: deviceId, device_name: displayName })
         });
 
         const data = await response.json();
@@ -2098,15 +2594,13 @@ async function activateLocalDevice(device) {
 
     try {
         // Try ZeroConf activation (backend handles device matching and transfer)
-        const response = await fetch('/api/devices/local/activate', {
+        const { ok, data } = await runJob('/api/devices/local/activate', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ ip, port, device_name: displayName })
+            body: JSON.stringify({ ip, port, device_name: displayName, device_id: deviceId })
         });
 
-        const data = await response.json();
-
-        if (response.ok && data.success) {
+        if (ok && data.success) {
             // Backend handles activation, device matching, and transfer
             if (data.spotify_device_id) {
                 // Transfer was successful
@@ -2306,7 +2800,8 @@ async function selectAudioDevice(deviceId) {
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ device_id: deviceId })
+            // Short fade-in on the new speaker so switching doesn't start with a blast
+            body: JSON.stringify({ device_id: deviceId, ramp_ms: AUDIO_SWITCH_RAMP_MS })
         });
 
         if (response.ok) {
@@ -2423,10 +2918,9 @@ async function confirmReboot() {
     }
 }
 
-// Poll current track every 5 seconds
-function startCurrentTrackPolling() {
-    updateCurrentTrack();
-    setInterval(updateCurrentTrack, 5000);
+// Poll current track every 5 seconds (stretched by the poll governor when idle)
+function startCurrentTrackPolling(skipInitialUpdate = false) {
+    pollGovernor.start('track', updateCurrentTrack, 5000, { immediate: !skipInitialUpdate });
 }
 
 // Utility: Escape HTML to prevent XSS
@@ -2860,20 +3354,18 @@ async function pairBluetoothDevice(address, pin = null) {
         const body = { address };
         if (pin) body.pin = pin;
 
-        const response = await fetch('/api/bluetooth/pair', {
+        const { ok, status, data } = await runJob('/api/bluetooth/pair', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify(body)
         });
 
-        const data = await response.json();
-
-        if (response.ok && data.success) {
+        if (ok && data.success) {
             showToast(t('bt.paired'), 'info');
             // Auto-connect after pairing
             bluetoothState.pairingDevice = null;
             await connectBluetoothDevice(address);
-        } else if (response.status === 202 && data.needs_pin) {
+        } else if (status === 202 && data.needs_pin) {
             // Show PIN modal
             bluetoothState.pairingDevice = null;
             bluetoothState.pendingPinDevice = address;
@@ -3110,15 +3602,11 @@ function confirmForget() {
 
 // Bluetooth Polling
 function startBluetoothPolling(interval = 3000) {
-    stopBluetoothPolling();
-    bluetoothPollingInterval = setInterval(loadBluetoothDevices, interval);
+    pollGovernor.start('bluetooth', loadBluetoothDevices, interval, { pauseWhenHidden: true, immediate: false });
 }
 
 function stopBluetoothPolling() {
-    if (bluetoothPollingInterval) {
-        clearInterval(bluetoothPollingInterval);
-        bluetoothPollingInterval = null;
-    }
+    pollGovernor.stop('bluetooth');
 }
 
 // Setup Bluetooth event listeners
@@ -3623,15 +4111,14 @@ async function saveDeviceEdit() {
     const bodyKey = deviceEditType === 'hostname' ? 'hostname' : 'player_name';
 
     try {
-        const response = await fetch(endpoint, {
+        // Player name changes restart librespot and come back as a job
+        const { ok, data } = await runJob(endpoint, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ [bodyKey]: input, pin: pin })
         });
 
-        const data = await response.json();
-
-        if (response.ok) {
+        if (ok) {
             showToast(t('settings.saved'), 'info');
             loadDeviceInfo();
             closeDeviceEditModal();
@@ -3882,24 +4369,23 @@ async function performUpdate() {
     setUpdateProgress(10);
 
     try {
-        const response = await fetch('/api/system/update', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ version: pendingUpdateVersion })
-        });
-
-        // Parse JSON in try-catch om parse errors op te vangen
-        let data;
+        // Update draait als job; voortgang komt via de event stream
+        let result;
         try {
-            data = await response.json();
+            result = await runJob('/api/system/update', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ version: pendingUpdateVersion })
+            }, (job) => setUpdateProgress(Math.max(10, Math.round(job.progress * 0.5))));
         } catch (parseError) {
-            // JSON parsing failed - update waarschijnlijk gestart, redirect naar loader
-            console.log('Response parsing failed, redirecting to loader...');
+            // Job status niet leesbaar - update waarschijnlijk gestart, redirect naar loader
+            console.log('Update status unavailable, redirecting to loader...');
             window.location.href = '/static/loader.html';
             return;
         }
+        const data = result.data;
 
-        if (!response.ok || data.error) {
+        if (!result.ok || data.error) {
             showUpdateError(data.error || t('update.failed'));
             return;
         }
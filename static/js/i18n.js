@@ -488,8 +488,14 @@ const translations = {
     }
 };
 
-// Current language (default: English)
-let currentLanguage = localStorage.getItem('language') || 'en';
+// Current language: local choice, then the session language embedded by the server, then English
+let currentLanguage = localStorage.getItem('language') || (() => {
+    try {
+        return JSON.parse(document.getElementById('initial-state')?.textContent || '{}').language;
+    } catch (e) {
+        return null;
+    }
+})() || 'en';
 
 /**
  * Get translation for a key
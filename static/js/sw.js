@@ -0,0 +1,142 @@
+// ============================================
+// SERVICE WORKER
+// Offline app shell + stale-while-revalidate library cache, so the kiosk
+// UI is interactive before Flask or Spotify answer after a boot
+// ============================================
+
+// Replaced by Flask when serving /sw.js (hash of the app shell files)
+const SHELL_VERSION = '__APP_SHELL_VERSION__';
+
+const SHELL_CACHE = `app-shell-${SHELL_VERSION}`;
+const API_CACHE = 'library-api';
+const ARTWORK_CACHE = 'artwork';
+
+const SHELL_URL = '/';
+// Replaced by Flask as well: fingerprinted CSS/JS URLs plus the placeholder image
+const SHELL_ASSETS = JSON.parse('__APP_SHELL_ASSETS__');
+
+// Library endpoints served stale-while-revalidate
+const LIBRARY_ROUTES = [
+    /^\/api\/playlists$/,
+    /^\/api\/artists$/,
+    /^\/api\/playlist\/[^/]+$/,
+    /^\/api\/artist\/[^/]+\/(top-tracks|albums)$/,
+    /^\/api\/album\/[^/]+\/tracks$/
+];
+
+const MAX_API_ENTRIES = 60;       // recent track lists + library
+const MAX_ARTWORK_ENTRIES = 500;
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then(cache => cache.addAll(SHELL_ASSETS.map(url => new Request(url, { cache: 'reload' }))))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    // Drop app shells from previous versions
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(
+                keys.filter(key => key.startsWith('app-shell-') && key !== SHELL_CACHE)
+                    .map(key => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (request.mode === 'navigate' && url.pathname === SHELL_URL) {
+        event.respondWith(serveAppShell(event));
+    } else if (SHELL_ASSETS.includes(url.pathname)) {
+        event.respondWith(cacheFirst(request, SHELL_CACHE));
+    } else if (url.pathname.startsWith('/api/image/')) {
+        event.respondWith(cacheFirst(request, ARTWORK_CACHE, MAX_ARTWORK_ENTRIES));
+    } else if (LIBRARY_ROUTES.some(route => route.test(url.pathname))) {
+        event.respondWith(staleWhileRevalidate(event, API_CACHE, MAX_API_ENTRIES));
+    }
+});
+
+// Keep a cache from growing without bound (keys are in insertion order)
+async function trimCache(cacheName, maxEntries) {
+    const cache = await caches.open(cacheName);
+    const keys = await cache.keys();
+    for (let i = 0; i < keys.length - maxEntries; i++) {
+        await cache.delete(keys[i]);
+    }
+}
+
+// The index is only cached when Flask marks it as the real player page
+// (not the setup or login page), and dropped as soon as it stops being one
+async function serveAppShell(event) {
+    const cache = await caches.open(SHELL_CACHE);
+    const cached = await cache.match(SHELL_URL);
+
+    const network = fetch(event.request)
+        .then(async (response) => {
+            if (response.ok && response.headers.get('X-App-Shell')) {
+                await cache.put(SHELL_URL, response.clone());
+            } else {
+                await cache.delete(SHELL_URL);
+            }
+            return response;
+        });
+
+    if (cached) {
+        event.waitUntil(network.catch(() => {}));
+        return cached;
+    }
+    return network;
+}
+
+async function cacheFirst(request, cacheName, maxEntries = null) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request);
+    if (cached) return cached;
+
+    const response = await fetch(request);
+    if (response.ok) {
+        await cache.put(request, response.clone());
+        if (maxEntries) trimCache(cacheName, maxEntries);
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(event, cacheName, maxEntries) {
+    const request = event.request;
+    const cache = await caches.open(cacheName);
+
+    const network = fetch(request)
+        .then(async (response) => {
+            if (response.ok) {
+                await cache.delete(request);  // re-insert so trimming keeps recent lists
+                await cache.put(request, response.clone());
+                await trimCache(cacheName, maxEntries);
+            }
+            return response;
+        });
+
+    // Explicit refresh (fetch with cache: 'reload') always goes to the network
+    const forceRefresh = request.cache === 'reload' || request.cache === 'no-cache';
+    const cached = forceRefresh ? null : await cache.match(request);
+    if (cached) {
+        event.waitUntil(network.catch(() => {}));
+        return cached;
+    }
+
+    try {
+        return await network;
+    } catch (error) {
+        const fallback = await cache.match(request);
+        if (fallback) return fallback;
+        throw error;
+    }
+}